@@ -0,0 +1,232 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+"""Streaming, time-bucketed aggregation and LTTB downsampling of reading series.
+
+Series are pulled a page at a time with paged_query.iterEvents and reduced
+as they arrive, so only the current page and the per-bucket state are ever
+held, never the raw series.
+"""
+
+import array
+import math
+
+from data_client.controller import paged_query
+from data_client.lazy_import import OptionalModule
+
+_numpy = OptionalModule("numpy")
+
+
+class TimeBucket(object):
+    """min/max/mean/count/last of the values whose origin falls in [start, start + width)."""
+
+    __slots__ = ("start", "count", "min", "max", "sum", "last", "lastOrigin")
+
+    def __init__(self, start):
+        self.start = start
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+        self.last = None
+        self.lastOrigin = None
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def merge(self, count, low, high, total, last, lastOrigin):
+        self.count += count
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+        self.sum += total
+        if self.lastOrigin is None or lastOrigin >= self.lastOrigin:
+            self.last = last
+            self.lastOrigin = lastOrigin
+
+    def __repr__(self):
+        return "TimeBucket(start=%d, count=%d, min=%r, max=%r, mean=%r, last=%r)" % (
+            self.start, self.count, self.min, self.max, self.mean, self.last)
+
+
+class BucketAggregator(object):
+    """Folds (origin, value) batches into TimeBuckets of width milliseconds.
+
+    Buckets are aligned to offset. With NumPy installed a batch is reduced
+    with one sort and ufunc.reduceat per statistic; without it, point by
+    point. NaN values (readings that are not numeric) are ignored.
+    """
+
+    def __init__(self, width, offset=0):
+        self.width = width
+        self.offset = offset
+        self.buckets = {}
+
+    def add(self, origins, values):
+        numpy = _numpy()
+        if numpy is not None and len(origins) > 1:
+            self._addVectorized(numpy, origins, values)
+            return
+        for origin, value in zip(origins, values):
+            if value != value:
+                continue
+            key = (origin - self.offset) // self.width
+            self._bucket(key).merge(1, value, value, value, value, origin)
+
+    def result(self):
+        """The non-empty buckets, oldest first."""
+        return [self.buckets[key] for key in sorted(self.buckets)]
+
+    def _bucket(self, key):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TimeBucket(self.offset + key * self.width)
+        return bucket
+
+    def _addVectorized(self, numpy, origins, values):
+        origin = numpy.asarray(origins, dtype=numpy.int64)
+        value = numpy.asarray(values, dtype=numpy.float64)
+        numeric = ~numpy.isnan(value)
+        origin, value = origin[numeric], value[numeric]
+        if not len(value):
+            return
+        keys = (origin - self.offset) // self.width
+        order = numpy.lexsort((origin, keys))
+        keys, origin, value = keys[order], origin[order], value[order]
+        unique, starts, counts = numpy.unique(keys, return_index=True, return_counts=True)
+        ends = starts + counts - 1
+        stats = zip(unique.tolist(), counts.tolist(),
+                    numpy.minimum.reduceat(value, starts).tolist(),
+                    numpy.maximum.reduceat(value, starts).tolist(),
+                    numpy.add.reduceat(value, starts).tolist(),
+                    value[ends].tolist(), origin[ends].tolist())
+        for key, count, low, high, total, last, lastOrigin in stats:
+            self._bucket(key).merge(count, low, high, total, last, lastOrigin)
+
+
+class LttbDownsampler(object):
+    """Streaming Largest-Triangle-Three-Buckets over a known time range.
+
+    [start, end] is split into threshold - 2 equal buckets; the first and
+    last points are always kept and one point is chosen from every other
+    non-empty bucket. A bucket is settled once a point two buckets later
+    arrives, so only about three buckets of points are held at a time.
+    Points should arrive roughly in time order; one landing in an already
+    settled bucket is dropped.
+    """
+
+    def __init__(self, threshold, start, end):
+        if threshold < 3:
+            raise ValueError("threshold must be at least 3")
+        self.threshold = threshold
+        self.start = start
+        self.width = max(1.0, float(end - start) / (threshold - 2))
+        self.points = []
+        self._open = {}
+        self._settled = -1
+        self._last = None
+
+    def add(self, origins, values):
+        for x, y in zip(origins, values):
+            if y != y:
+                continue
+            if not self.points:
+                self.points.append((x, y))
+                continue
+            if self._last is not None:
+                self._place(self._last)
+            self._last = (x, y)
+
+    def result(self):
+        """Settles the remaining buckets and returns the chosen (origin, value) points."""
+        while self._open:
+            key = min(self._open)
+            following = [k for k in self._open if k > key]
+            nextPoint = self._mean(self._open[min(following)]) if following else self._last
+            self._settle(key, nextPoint)
+        if self._last is not None:
+            self.points.append(self._last)
+            self._last = None
+        return self.points
+
+    def _place(self, point):
+        key = min(self.threshold - 3, max(0, int((point[0] - self.start) // self.width)))
+        if key <= self._settled:
+            return
+        self._open.setdefault(key, []).append(point)
+        while max(self._open) - min(self._open) >= 2:
+            key = min(self._open)
+            nextKey = min(k for k in self._open if k > key)
+            self._settle(key, self._mean(self._open[nextKey]))
+
+    def _settle(self, key, nextPoint):
+        candidates = self._open.pop(key)
+        ax, ay = self.points[-1]
+        cx, cy = nextPoint
+        self.points.append(max(candidates, key=lambda p: abs(
+            (ax - cx) * (p[1] - ay) - (ax - p[0]) * (cy - ay))))
+        self._settled = key
+
+    @staticmethod
+    def _mean(points):
+        return (sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points))
+
+
+def iterSeries(eventClient, deviceId, valueDescriptor, start, end, pageSize=500):
+    """Yields one (origins, values) pair of arrays per page of events in [start, end].
+
+    Only readings of deviceId named valueDescriptor are kept; this is
+    EventClient.readingsForDeviceAndValueDescriptor over a time range, which
+    core data has no endpoint for. A reading's origin falls back to its
+    created time, and values that are not numbers become NaN.
+    """
+    origins, values = array.array("q"), array.array("d")
+    for event in paged_query.iterEvents(eventClient, start, end, pageSize):
+        if event.device != deviceId:
+            continue
+        for reading in event.readings or ():
+            if reading.name != valueDescriptor:
+                continue
+            origins.append(reading.origin or reading.created or 0)
+            try:
+                values.append(float(reading.value))
+            except (TypeError, ValueError):
+                values.append(math.nan)
+        if len(origins) >= pageSize:
+            yield origins, values
+            origins, values = array.array("q"), array.array("d")
+    if origins:
+        yield origins, values
+
+
+def aggregate(eventClient, deviceId, valueDescriptor, start, end, width, pageSize=500):
+    """TimeBuckets of width milliseconds, aligned to start, for one device's readings."""
+    aggregator = BucketAggregator(width, start)
+    for origins, values in iterSeries(eventClient, deviceId, valueDescriptor, start, end,
+                                      pageSize):
+        aggregator.add(origins, values)
+    return aggregator.result()
+
+
+def downsample(eventClient, deviceId, valueDescriptor, start, end, threshold, pageSize=500):
+    """At most threshold (origin, value) points tracing one device's readings, for charts."""
+    sampler = LttbDownsampler(threshold, start, end)
+    for origins, values in iterSeries(eventClient, deviceId, valueDescriptor, start, end,
+                                      pageSize):
+        sampler.add(origins, values)
+    return sampler.result()
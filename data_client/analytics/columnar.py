@@ -0,0 +1,131 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import array
+import copy
+
+from data_client.lazy_import import OptionalModule
+from data_client.lazy_import import moduleGetattr
+
+_numpy = OptionalModule("numpy")
+__getattr__ = moduleGetattr(__name__, {"numpy": _numpy})
+
+_NAN = float("nan")
+
+
+class ReadingColumns(object):
+    """Readings as parallel NumPy arrays.
+
+    origin is int64 milliseconds and value float64 (NaN where the reading is
+    not numeric). device and name are dictionary encoded: deviceCodes holds
+    int32 indexes into the devices array, nameCodes into names.
+    """
+
+    def __init__(self, origin, value, deviceCodes, devices, nameCodes, names):
+        self.origin = origin
+        self.value = value
+        self.deviceCodes = deviceCodes
+        self.devices = devices
+        self.nameCodes = nameCodes
+        self.names = names
+
+    def device(self):
+        """Materializes the device column as strings."""
+        return self.devices[self.deviceCodes]
+
+    def name(self):
+        """Materializes the name column as strings."""
+        return self.names[self.nameCodes]
+
+    def __len__(self):
+        return len(self.origin)
+
+
+class ReadingColumnBuilder(object):
+    """JSON object hook that appends readings to typed columns as they parse.
+
+    Use addPairs as the object_pairs_hook; reading objects never get built.
+    Objects carrying a "readings" key are events and are skipped, since their
+    readings were already appended when the parser reached them.
+    """
+
+    def __init__(self):
+        self.origin = array.array("q")
+        self.value = array.array("d")
+        self.deviceCodes = array.array("i")
+        self.nameCodes = array.array("i")
+        self.devices = {}
+        self.names = {}
+
+    def addPairs(self, pairs):
+        origin, value, device, name = 0, None, None, None
+        for key, item in pairs:
+            if key == "origin":
+                origin = item
+            elif key == "value":
+                value = item
+            elif key == "device":
+                device = item
+            elif key == "name":
+                name = item
+            elif key == "readings":
+                return None
+        self.origin.append(origin or 0)
+        try:
+            self.value.append(float(value))
+        except (TypeError, ValueError):
+            self.value.append(_NAN)
+        self.deviceCodes.append(self.devices.setdefault(device, len(self.devices)))
+        self.nameCodes.append(self.names.setdefault(name, len(self.names)))
+        return None
+
+    def build(self):
+        numpy = _numpy()
+        if numpy is None:
+            raise ImportError("numpy is required for columnar reading results")
+        return ReadingColumns(
+            numpy.frombuffer(self.origin, dtype=numpy.int64),
+            numpy.frombuffer(self.value, dtype=numpy.float64),
+            numpy.frombuffer(self.deviceCodes, dtype=numpy.int32),
+            numpy.array(list(self.devices), dtype=object),
+            numpy.frombuffer(self.nameCodes, dtype=numpy.int32),
+            numpy.array(list(self.names), dtype=object))
+
+
+class ColumnarView(object):
+    """Runs a client's reading queries with results decoded into ReadingColumns.
+
+    Wraps a ReadingClientImpl or EventClientImpl; any of their reading queries
+    can be called on the view, for example
+    ColumnarView(eventClient).readingsForDeviceAndValueDescriptor(d, vd, 1000).
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        method = getattr(type(self.client), name)
+
+        def query(*args):
+            builder = ReadingColumnBuilder()
+            view = copy.copy(self.client)
+            view.objectPairsHook = builder.addPairs
+            method(view, *args)
+            return builder.build()
+
+        return query
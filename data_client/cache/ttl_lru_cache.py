@@ -0,0 +1,115 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import collections
+import threading
+import time
+
+
+class CacheStats(object):
+
+    def __init__(self, hits, misses, evictions, size):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.size = size
+
+    def hitRatio(self):
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def __repr__(self):
+        return "CacheStats(hits=%d, misses=%d, evictions=%d, size=%d)" % (
+            self.hits, self.misses, self.evictions, self.size)
+
+
+class TtlLruCache(object):
+    """Thread-safe map bounded by maxSize (LRU eviction) and ttl seconds.
+
+    clear() and invalidate() start a new generation. A value loaded under an
+    older generation is not stored, so a load racing a write cannot put the
+    value from before the write back.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxSize=1024, ttl=300.0, clock=time.monotonic):
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._generation = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is not self._MISSING:
+                value, expires = entry
+                if expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return default
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def put(self, key, value, generation=None):
+        """Stores value, unless generation is given and the cache was cleared since."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxSize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def getOrLoad(self, key, loader):
+        with self._lock:
+            generation = self._generation
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = loader()
+            self.put(key, value, generation)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
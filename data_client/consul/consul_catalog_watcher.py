@@ -0,0 +1,135 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import logging
+import threading
+from urllib.parse import quote
+
+from data_client.transport.http_session_pool import HttpSessionPool
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ServiceInstance(object):
+
+    def __init__(self, serviceId, host, port, scheme="http"):
+        self.serviceId = serviceId
+        self.host = host
+        self.port = port
+        self.uri = "%s://%s:%d" % (scheme, host, port)
+
+    def __eq__(self, other):
+        return isinstance(other, ServiceInstance) and self.uri == other.uri
+
+    def __hash__(self):
+        return hash(self.uri)
+
+    def __repr__(self):
+        return "ServiceInstance(%s, %s)" % (self.serviceId, self.uri)
+
+
+class ConsulCatalogWatcher(object):
+    """Keeps the healthy instances of Consul services cached in memory.
+
+    A background thread per service long-polls /v1/health/service/{name}
+    with Consul blocking queries, so getInstances() only reads a snapshot
+    and never touches the network. Instances with any non-passing check are
+    dropped; when Consul is unreachable the last known instances are kept.
+    A response without an X-Consul-Index (a proxy may strip it) cannot
+    block, so the service is then re-read every retryInterval seconds.
+    """
+
+    def __init__(self, consulUrl, wait=55, retryInterval=5.0, pool=None):
+        self.consulUrl = consulUrl.rstrip("/")
+        self.wait = wait
+        self.retryInterval = retryInterval
+        self.pool = pool or HttpSessionPool(maxPoolSize=4, timeout=wait + 10)
+        self._instances = {}
+        self._threads = {}
+        self._ready = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def getInstances(self, serviceName):
+        with self._lock:
+            ready = self._ready.get(serviceName)
+            owner = ready is None
+            if owner:
+                ready = self._ready[serviceName] = threading.Event()
+        if owner:
+            self._watch(serviceName, ready)
+        else:
+            ready.wait()
+        with self._lock:
+            return list(self._instances.get(serviceName, ()))
+
+    def stop(self):
+        self._stopped.set()
+
+    def _watch(self, serviceName, ready):
+        # resolve once up front so the first caller does not get an empty list;
+        # this runs outside self._lock so other services are not held up by it
+        try:
+            index = self._refresh(serviceName, 0, False) or 0
+        finally:
+            ready.set()
+        thread = threading.Thread(target=self._poll, args=(serviceName, index),
+                                  name="consul-watch-" + serviceName, daemon=True)
+        with self._lock:
+            self._threads[serviceName] = thread
+        thread.start()
+
+    def _poll(self, serviceName, index):
+        index = index or 0
+        while not self._stopped.is_set():
+            newIndex = self._refresh(serviceName, index, True)
+            if newIndex is None:
+                # Consul is down or not up yet; keep the last known instances
+                self._stopped.wait(self.retryInterval)
+                continue
+            if not newIndex:
+                # without X-Consul-Index every query returns at once; poll instead of spinning
+                self._stopped.wait(self.retryInterval)
+            # Consul may reset the index; start over rather than block forever
+            index = newIndex if newIndex >= index else 0
+
+    def _refresh(self, serviceName, index, blocking):
+        url = "%s/v1/health/service/%s?passing=true" % (self.consulUrl,
+                                                          quote(serviceName, safe=""))
+        if blocking and index:
+            url += "&index=%d&wait=%ds" % (index, self.wait)
+        try:
+            response = self.pool.request("GET", url)
+            if response.status != 200:
+                raise IOError("consul answered HTTP %d" % response.status)
+            instances = [self._toInstance(entry) for entry in response.entity()
+                         if self._isHealthy(entry)]
+        except Exception as e:
+            LOGGER.warning("consul lookup for %s failed: %s", serviceName, e)
+            return None
+        with self._lock:
+            self._instances[serviceName] = instances
+        return int(response.getHeader("x-consul-index", 0))
+
+    def _isHealthy(self, entry):
+        return all(check.get("Status") == "passing" for check in entry.get("Checks", ()))
+
+    def _toInstance(self, entry):
+        service = entry["Service"]
+        host = service.get("Address") or entry["Node"]["Address"]
+        return ServiceInstance(service["ID"], host, service["Port"])
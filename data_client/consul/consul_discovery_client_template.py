@@ -17,52 +17,291 @@
 # *******************************************************************************
 
 import abc
-import consul
+import threading
+import time
+from urllib.parse import urlparse
 from domain.config import config_reader
+from data_client.instrumentation import metrics
+from data_client.transport import http_session_pool
+from data_client.transport import json_codec
+
+# Discovery, asyncio, resilience, hedging, compression and caching modules are imported
+# where they are first needed, so a client that only pings core data does not load them.
+
+
+class _Setting(object):
+    """Class attribute read from the configuration on first use, not at import.
+
+    Assigning the attribute on an instance still overrides it.
+    """
+
+    def __init__(self, key, default):
+        self.key = key
+        self.default = default
+        self._value = None
+        self._loaded = False
+
+    def __get__(self, instance, owner):
+        if not self._loaded:
+            self._value = config_reader.read_property(self.key, self.default)
+            self._loaded = True
+        return self._value
 
 
 class ConsulDiscoveryClientTemplate(object):
 
     __metaclass__ = abc.ABCMeta
     APP_ID = "edgex-core-data"
-    IS_CACHE_DISCOVERY_RESULT = config_reader.read_property(
-        "client.is-cache-discovery-result", False)
-    rootUrl = ""
+    IS_CACHE_DISCOVERY_RESULT = _Setting("client.is-cache-discovery-result", False)
+    CONSUL_URL = _Setting("client.consul.url", "")
+    LOAD_BALANCER = _Setting("client.load-balancer", "round-robin")
+    JSON_CODEC = _Setting("client.json-codec", "auto")
+    discoveryClient = None
+    loadBalancer = None
+    discoveryLock = threading.Lock()
+    sessionPool = None
+    asyncSessionSettings = None
+    resilience = None
+    healthMonitor = None
+    hedger = None
+    responseCache = None
+    rootUrl = None
     path = ""
-    
+
     def __init__(self):
-        self.rootUrl = self.retrieveUriFromDiscoveryClient()
+        # discovery is only consulted, and pools only built, on the first request
         self.path = self.extractPath()
 
     def setIsCacheDiscoveryResult(self, flag):
         self.IS_CACHE_DISCOVERY_RESULT = flag
 
-    def retrieveUriFromDiscoveryClient(self):
-        String result = ""
-        if (discoveryClient is None):
-            return result
+    def initDiscoveryClient(self):
+        # the balancer is set last, so once it exists there is nothing left to do
+        if not self.CONSUL_URL or ConsulDiscoveryClientTemplate.loadBalancer is not None:
+            return
+        from data_client.consul import load_balancer
+        from data_client.consul.consul_catalog_watcher import ConsulCatalogWatcher
+        with ConsulDiscoveryClientTemplate.discoveryLock:
+            if ConsulDiscoveryClientTemplate.discoveryClient is None:
+                ConsulDiscoveryClientTemplate.discoveryClient = ConsulCatalogWatcher(
+                    self.CONSUL_URL)
+            if ConsulDiscoveryClientTemplate.loadBalancer is None:
+                ConsulDiscoveryClientTemplate.loadBalancer = load_balancer.create(
+                    self.LOAD_BALANCER)
+
+    def retrieveInstanceFromDiscoveryClient(self):
+        if self.discoveryClient is None:
+            return None
+        inst = metrics.active()
+        if inst is None:
+            return self.loadBalancer.choose(self.discoveryClient.getInstances(self.APP_ID))
+        startedAt = time.perf_counter()
+        instance = self.loadBalancer.choose(self.discoveryClient.getInstances(self.APP_ID))
+        inst.recordDiscoveryLookup(time.perf_counter() - startedAt)
+        return instance
 
-        discover_list = discoveryClient.getInstances(APP_ID)
-        if discover_list:
-            uri = discover_list[0].uri
-            if uri is not None:
-                result = uri.toString()
-        return result
+    def retrieveUriFromDiscoveryClient(self):
+        instance = self.retrieveInstanceFromDiscoveryClient()
+        if instance is None:
+            return ""
+        return str(instance.uri)
 
     @abc.abstractmethod
     def extractPath(self):
         return
 
     def getRootUrl(self):
-        if self.rootUrl and not self.IS_CACHE_DISCOVERY_RESULT:
+        if self.rootUrl is None:
+            self.initDiscoveryClient()
+            self.rootUrl = self.retrieveUriFromDiscoveryClient()
+        elif self.rootUrl and not self.IS_CACHE_DISCOVERY_RESULT:
             retrievedUri = self.retrieveUriFromDiscoveryClient()
             if retrievedUri:
                 self.rootUrl = retrievedUri
         return self.rootUrl
 
-    def getPath():
-        if not path:
-            path = self.extractPath()
-        return path
+    def getPath(self):
+        if not self.path:
+            self.path = self.extractPath()
+        return self.path
+
+    def getSessionPool(self):
+        if ConsulDiscoveryClientTemplate.sessionPool is None:
+            ConsulDiscoveryClientTemplate.sessionPool = http_session_pool.getSharedPool(
+                maxPoolSize=config_reader.read_property("client.pool.max-size", 20),
+                maxConnectionsPerHost=config_reader.read_property(
+                    "client.pool.max-per-host", 10),
+                idleTimeout=config_reader.read_property("client.pool.idle-timeout", 30.0),
+                timeout=config_reader.read_property("client.timeout", 10.0),
+                codec=json_codec.create(self.JSON_CODEC),
+                responseCache=self.createResponseCache(),
+                resilience=self.getResilience(),
+                compression=self.createCompression(),
+                singleFlight=config_reader.read_property("client.single-flight.enabled", False))
+            self.startHealthMonitor()
+        return ConsulDiscoveryClientTemplate.sessionPool
+
+    def getCodec(self):
+        """The JSON codec request bodies are encoded with."""
+        return self.getSessionPool().codec
+
+    def getAsyncSessionPool(self):
+        # asyncio connections are bound to their event loop, so each running loop
+        # gets its own pool; the cache, breakers and codec are shared between them
+        from data_client.transport import async_http_session_pool
+        with ConsulDiscoveryClientTemplate.discoveryLock:
+            if ConsulDiscoveryClientTemplate.asyncSessionSettings is None:
+                ConsulDiscoveryClientTemplate.asyncSessionSettings = dict(
+                    maxPoolSize=config_reader.read_property("client.pool.max-size", 20),
+                    maxConnectionsPerHost=config_reader.read_property(
+                        "client.pool.max-per-host", 10),
+                    idleTimeout=config_reader.read_property("client.pool.idle-timeout", 30.0),
+                    timeout=config_reader.read_property("client.timeout", 10.0),
+                    codec=json_codec.create(self.JSON_CODEC),
+                    responseCache=self.createResponseCache(),
+                    compression=self.createCompression(),
+                    singleFlight=config_reader.read_property(
+                        "client.single-flight.enabled", False))
+        return async_http_session_pool.getLoopPool(
+            resilience=self.getResilience(), **ConsulDiscoveryClientTemplate.asyncSessionSettings)
+
+    def createResponseCache(self):
+        maxBytes = config_reader.read_property("client.response-cache.max-bytes", 0)
+        if not maxBytes:
+            return None
+        from data_client.transport import response_cache
+        # one cache for the sync and async pools, so a write through either invalidates both
+        if ConsulDiscoveryClientTemplate.responseCache is None:
+            # core data sends no validators, so only paths given a max age are ever stored
+            ConsulDiscoveryClientTemplate.responseCache = response_cache.ResponseCache(
+                maxBytes, config_reader.read_property("client.response-cache.directory", None),
+                policies=response_cache.parsePolicies(
+                    config_reader.read_property("client.response-cache.policies", "")),
+                defaultPolicy=response_cache.CachePolicy(maxAge=config_reader.read_property(
+                    "client.response-cache.max-age", 0.0)),
+                maxDiskBytes=config_reader.read_property(
+                    "client.response-cache.max-disk-bytes", 64 * 1024 * 1024))
+        return ConsulDiscoveryClientTemplate.responseCache
+
+    def createCompression(self):
+        if not config_reader.read_property("client.compression.enabled", True):
+            return None
+        from data_client.transport import compression
+        return compression.Compression(config_reader.read_property(
+            "client.compression.request-threshold", 0))
+
+    def getResilience(self):
+        # one set of breakers for the sync and async pools, which reach the same instances
+        from data_client.transport import resilience
+        with ConsulDiscoveryClientTemplate.discoveryLock:
+            if ConsulDiscoveryClientTemplate.resilience is None and \
+                    config_reader.read_property("client.resilience.enabled", True):
+                ConsulDiscoveryClientTemplate.resilience = resilience.Resilience(
+                    resilience.RetryPolicy(
+                        maxAttempts=config_reader.read_property("client.retry.max-attempts", 3),
+                        baseDelay=config_reader.read_property("client.retry.base-delay", 0.05),
+                        maxDelay=config_reader.read_property("client.retry.max-delay", 2.0)),
+                    resilience.RetryBudget(
+                        ratio=config_reader.read_property("client.retry.budget-ratio", 0.2)),
+                    failureThreshold=config_reader.read_property(
+                        "client.circuit-breaker.failure-threshold", 5),
+                    resetTimeout=config_reader.read_property(
+                        "client.circuit-breaker.reset-timeout", 30.0))
+        return ConsulDiscoveryClientTemplate.resilience
+
+    def startHealthMonitor(self):
+        interval = config_reader.read_property("client.health-check.interval", 5.0)
+        pingUrl = config_reader.read_property("core.db.ping.url", "")
+        if self.resilience is None or not interval or not pingUrl:
+            return
+        # imported here: the ping client is itself built on this template
+        from data_client.controller.ping_core_data_client_impl import PingCoreDataClientImpl
+        from data_client.transport import resilience
+        monitor = resilience.HealthMonitor(PingCoreDataClientImpl(pingUrl), self.resilience,
+                                           interval=interval,
+                                           targets=self.instancePingTargets(pingUrl))
+        with ConsulDiscoveryClientTemplate.discoveryLock:
+            if ConsulDiscoveryClientTemplate.healthMonitor is not None:
+                return
+            ConsulDiscoveryClientTemplate.healthMonitor = monitor
+        monitor.start()
+
+    def instancePingTargets(self, pingUrl):
+        """Returns a callable listing a ping target per discovered instance, or None.
+
+        Breakers are kept per instance, so with discovery each instance has
+        to be pinged on its own for the health monitor to drive the right one.
+        """
+        self.initDiscoveryClient()
+        if self.discoveryClient is None or self.IS_CACHE_DISCOVERY_RESULT:
+            return None
+        path = urlparse(pingUrl).path
+        discoveryClient = self.discoveryClient
+
+        def targets():
+            return [self.getSessionPool().target(instance.uri + path)
+                    for instance in discoveryClient.getInstances(self.APP_ID)]
+        return targets
+
+    def getTarget(self, url, objectPairsHook=None):
+        return self.balancedTarget(self.getSessionPool(), url, objectPairsHook)
+
+    def getAsyncTarget(self, url, objectPairsHook=None):
+        return self.balancedTarget(self.getAsyncSessionPool(), url, objectPairsHook)
+
+    def getHedger(self):
+        if not config_reader.read_property("client.hedging.enabled", False):
+            return None
+        from data_client.transport import hedging
+        from data_client.transport import resilience
+        with ConsulDiscoveryClientTemplate.discoveryLock:
+            if ConsulDiscoveryClientTemplate.hedger is None:
+                ConsulDiscoveryClientTemplate.hedger = hedging.Hedger(
+                    percentile=config_reader.read_property("client.hedging.percentile", 0.95),
+                    minDelay=config_reader.read_property("client.hedging.min-delay", 0.005),
+                    budget=resilience.RetryBudget(
+                        ratio=config_reader.read_property("client.hedging.budget-ratio", 0.05),
+                        minPerSecond=1.0, capacity=10.0))
+        return ConsulDiscoveryClientTemplate.hedger
+
+    def hedged(self, url, objectPairsHook, request):
+        """Returns request(target), re-sent to a second instance if the first is slow."""
+        hedger = self.getHedger()
+        if hedger is None:
+            return request(self.getTarget(url, objectPairsHook))
+        targets = self.hedgeTargets(self.getSessionPool(), url, objectPairsHook)
+        return hedger.call(url, [lambda target=target: request(target) for target in targets])
+
+    async def hedgedAsync(self, url, objectPairsHook, request):
+        hedger = self.getHedger()
+        if hedger is None:
+            return await request(self.getAsyncTarget(url, objectPairsHook))
+        targets = self.hedgeTargets(self.getAsyncSessionPool(), url, objectPairsHook)
+        return await hedger.callAsync(url, [lambda target=target: request(target)
+                                            for target in targets])
+
+    def hedgeTargets(self, pool, url, objectPairsHook=None):
+        """Targets on two different discovered instances, or a single target."""
+        self.initDiscoveryClient()
+        if self.discoveryClient is None or self.IS_CACHE_DISCOVERY_RESULT:
+            return [self.balancedTarget(pool, url, objectPairsHook)]
+        chosen = self.loadBalancer.choosePair(self.discoveryClient.getInstances(self.APP_ID))
+        if not chosen:
+            return [pool.target(self.resolveUrl(url), objectPairsHook=objectPairsHook)]
+        return [pool.target(instance.uri + self.getPath(), self.loadBalancer.tracker(instance),
+                            objectPairsHook) for instance in chosen]
+
+    def balancedTarget(self, pool, url, objectPairsHook=None):
+        self.initDiscoveryClient()
+        if self.discoveryClient is not None and not self.IS_CACHE_DISCOVERY_RESULT:
+            instance = self.retrieveInstanceFromDiscoveryClient()
+            if instance is not None:
+                return pool.target(instance.uri + self.getPath(),
+                                   self.loadBalancer.tracker(instance), objectPairsHook)
+        return pool.target(self.resolveUrl(url), objectPairsHook=objectPairsHook)
 
-}
+    def resolveUrl(self, url):
+        rootUrl = self.getRootUrl()
+        if not rootUrl:
+            return url
+        return rootUrl + self.getPath()
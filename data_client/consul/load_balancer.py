@@ -0,0 +1,217 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import abc
+import itertools
+import threading
+import time
+
+
+class _InstanceStats(object):
+
+    def __init__(self):
+        self.outstanding = 0
+        self.latency = 0.0
+        self.failures = 0
+        self.ejectedUntil = 0.0
+
+
+class InstanceTracker(object):
+    """Reports the outcome of requests sent to one instance back to its balancer."""
+
+    def __init__(self, balancer, instance):
+        self.balancer = balancer
+        self.instance = instance
+
+    def started(self):
+        self.balancer.onStart(self.instance)
+        return time.monotonic()
+
+    def finished(self, startedAt, failed):
+        self.balancer.onComplete(self.instance, time.monotonic() - startedAt, failed)
+
+    def abandoned(self):
+        """The request was cancelled: it no longer counts, but says nothing of the instance."""
+        self.balancer.onAbandon(self.instance)
+
+
+class LoadBalancer(object):
+    """Picks a core data instance per request and ejects failing ones.
+
+    An instance that fails maxFailures requests in a row (connection errors
+    or 5xx answers) is left out of rotation for ejectionTime seconds. When
+    every instance is ejected, all of them are considered again rather than
+    failing the request outright.
+    """
+
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, maxFailures=3, ejectionTime=30.0, clock=time.monotonic):
+        self.maxFailures = maxFailures
+        self.ejectionTime = ejectionTime
+        self._clock = clock
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def choose(self, instances):
+        if not instances:
+            return None
+        now = self._clock()
+        with self._lock:
+            available = [i for i in instances if self._statsFor(i).ejectedUntil <= now]
+            return self.select(available or instances)
+
+    def choosePair(self, instances):
+        """Picks a primary and, when there is one, a different instance to hedge onto.
+
+        The balancer advances once per pair, so primaries spread across
+        instances exactly as they would with choose().
+        """
+        if not instances:
+            return []
+        now = self._clock()
+        with self._lock:
+            available = [i for i in instances if self._statsFor(i).ejectedUntil <= now]
+            candidates = available if len(available) > 1 else instances
+            primary = self.select(available or instances)
+            others = [i for i in candidates if i != primary]
+            if not others:
+                return [primary]
+            # start after the primary so ties go to the next instance in rotation
+            at = candidates.index(primary) + 1 if primary in candidates else 0
+            rotated = [i for i in candidates[at:] + candidates[:at] if i != primary]
+            return [primary, self.selectAlternate(rotated)]
+
+    def tracker(self, instance):
+        return InstanceTracker(self, instance)
+
+    def onStart(self, instance):
+        with self._lock:
+            self._statsFor(instance).outstanding += 1
+
+    def onComplete(self, instance, latency, failed):
+        with self._lock:
+            stats = self._statsFor(instance)
+            stats.outstanding -= 1
+            self.recordLatency(stats, latency)
+            if not failed:
+                stats.failures = 0
+                return
+            stats.failures += 1
+            if stats.failures >= self.maxFailures:
+                stats.ejectedUntil = self._clock() + self.ejectionTime
+                stats.failures = 0
+
+    def onAbandon(self, instance):
+        with self._lock:
+            self._statsFor(instance).outstanding -= 1
+
+    def isEjected(self, instance):
+        with self._lock:
+            return self._statsFor(instance).ejectedUntil > self._clock()
+
+    @abc.abstractmethod
+    def select(self, instances):
+        """Picks one of a non-empty list of instances; called with the lock held."""
+
+    def selectAlternate(self, instances):
+        """Picks the hedge target from instances other than the primary.
+
+        Called with the lock held and must not advance the rotation.
+        """
+        return instances[0]
+
+    def recordLatency(self, stats, latency):
+        pass
+
+    def _statsFor(self, instance):
+        stats = self._stats.get(instance)
+        if stats is None:
+            stats = self._stats[instance] = _InstanceStats()
+        return stats
+
+
+class RoundRobinLoadBalancer(LoadBalancer):
+
+    def __init__(self, **kwargs):
+        super(RoundRobinLoadBalancer, self).__init__(**kwargs)
+        self._counter = itertools.count()
+
+    def select(self, instances):
+        return instances[next(self._counter) % len(instances)]
+
+
+class LeastOutstandingLoadBalancer(RoundRobinLoadBalancer):
+    """Prefers the instance with the fewest requests in flight."""
+
+    def select(self, instances):
+        offset = next(self._counter)
+        rotated = instances[offset % len(instances):] + instances[:offset % len(instances)]
+        return min(rotated, key=self._outstanding)
+
+    def selectAlternate(self, instances):
+        return min(instances, key=self._outstanding)
+
+    def _outstanding(self, instance):
+        return self._statsFor(instance).outstanding
+
+
+class EwmaLoadBalancer(RoundRobinLoadBalancer):
+    """Prefers the instance with the lowest EWMA latency weighted by load.
+
+    An instance's score is its exponentially weighted moving average latency
+    times one plus its outstanding requests, so a fast but busy instance
+    yields to an idle one. Instances with no samples yet score zero and get
+    tried first.
+    """
+
+    def __init__(self, decay=0.3, **kwargs):
+        super(EwmaLoadBalancer, self).__init__(**kwargs)
+        self.decay = decay
+
+    def select(self, instances):
+        offset = next(self._counter)
+        rotated = instances[offset % len(instances):] + instances[:offset % len(instances)]
+        return min(rotated, key=self._score)
+
+    def selectAlternate(self, instances):
+        return min(instances, key=self._score)
+
+    def recordLatency(self, stats, latency):
+        if stats.latency:
+            stats.latency += self.decay * (latency - stats.latency)
+        else:
+            stats.latency = latency
+
+    def _score(self, instance):
+        stats = self._statsFor(instance)
+        return stats.latency * (stats.outstanding + 1)
+
+
+STRATEGIES = {
+    "round-robin": RoundRobinLoadBalancer,
+    "least-outstanding": LeastOutstandingLoadBalancer,
+    "ewma": EwmaLoadBalancer,
+}
+
+
+def create(strategy, **kwargs):
+    try:
+        return STRATEGIES[strategy](**kwargs)
+    except KeyError:
+        raise ValueError("unknown load balancing strategy: %s" % strategy)
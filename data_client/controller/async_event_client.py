@@ -0,0 +1,69 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import abc
+
+
+class AsyncEventClient(object):
+    """asyncio variant of EventClient; every method is a coroutine."""
+
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    async def event(self, id):
+        """GET /{id}"""
+
+    @abc.abstractmethod
+    async def events(self, start=None, end=None, limit=None):
+        """GET / or, with a time range, GET /{start}/{end}/{limit}"""
+
+    @abc.abstractmethod
+    async def eventsForDevice(self, deviceId, limit):
+        """GET /device/{deviceId}/{limit}"""
+
+    @abc.abstractmethod
+    async def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        """GET /device/{deviceId}/valuedescriptor/{valuedescriptor}/{limit}"""
+
+    @abc.abstractmethod
+    async def add(self, event):
+        """POST / with the event as JSON; returns the new id."""
+
+    @abc.abstractmethod
+    async def markedPushed(self, id):
+        """PUT /id/{id}"""
+
+    @abc.abstractmethod
+    async def update(self, event):
+        """PUT / with the event as JSON."""
+
+    @abc.abstractmethod
+    async def delete(self, id):
+        """DELETE /id/{id}"""
+
+    @abc.abstractmethod
+    async def deleteByDevice(self, deviceId):
+        """DELETE /device/{deviceId}"""
+
+    @abc.abstractmethod
+    async def scrubPushedEvents(self):
+        """DELETE /scrub"""
+
+    @abc.abstractmethod
+    async def scrubOldEvents(self, age):
+        """DELETE /removeold/age/{age}"""
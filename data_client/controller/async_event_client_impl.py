@@ -0,0 +1,82 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+from urllib.parse import urlparse
+
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.controller.async_event_client import AsyncEventClient
+from data_client.domain import core
+from data_client.instrumentation.metrics import instrumented
+from domain.config import config_reader
+from exception.controller import DataValidationException
+
+
+@instrumented
+class AsyncEventClientImpl(ConsulDiscoveryClientTemplate, AsyncEventClient):
+
+    objectPairsHook = staticmethod(core.eventOrReadingFromPairs)
+
+    def __init__(self, url=None):
+        self.url = url or config_reader.read_property("core.db.event.url", "")
+        super(AsyncEventClientImpl, self).__init__()
+
+    async def event(self, id):
+        return await self.hedgedAsync(self.url, self.objectPairsHook,
+                                      lambda target: target.get(id))
+
+    async def events(self, start=None, end=None, limit=None):
+        if start is None:
+            return await self._getClient().get()
+        return await self._getClient().get(start, end, limit)
+
+    async def eventsForDevice(self, deviceId, limit):
+        return await self._getClient().get("device", deviceId, limit)
+
+    async def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        return await self._getClient().get("device", deviceId, "valuedescriptor",
+                                           valuedescriptor, limit)
+
+    async def add(self, event):
+        return await self._getClient().post(event)
+
+    async def markedPushed(self, id):
+        return await self._getClient().put(None, "id", id)
+
+    async def update(self, event):
+        return await self._getClient().put(event)
+
+    async def delete(self, id):
+        return await self._getClient().delete("id", id)
+
+    async def deleteByDevice(self, deviceId):
+        return await self._getClient().delete("device", deviceId)
+
+    async def scrubPushedEvents(self):
+        return await self._getClient().delete("scrub")
+
+    async def scrubOldEvents(self, age):
+        return await self._getClient().delete("removeold", "age", age)
+
+    def _getClient(self):
+        return self.getAsyncTarget(self.url, self.objectPairsHook)
+
+    def extractPath(self):
+        urlObject = urlparse(self.url)
+        if not urlObject.scheme or not urlObject.netloc:
+            raise DataValidationException("the URL is malformed, core.db.event.url: " + self.url)
+        return urlObject.path
@@ -0,0 +1,65 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import abc
+
+
+class AsyncReadingClient(object):
+    """asyncio variant of ReadingClient; every method is a coroutine."""
+
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    async def reading(self, id):
+        """GET /{id}"""
+
+    @abc.abstractmethod
+    async def readings(self, deviceId=None, limit=None):
+        """GET / or, for one device, GET /device/{deviceId}/{limit}"""
+
+    @abc.abstractmethod
+    async def readingsByName(self, name, limit):
+        """GET /name/{name}/{limit}"""
+
+    @abc.abstractmethod
+    async def readingsByNameAndDevice(self, name, device, limit):
+        """GET /name/{name}/device/{device}/{limit}"""
+
+    @abc.abstractmethod
+    async def readingsByUoMLabel(self, uomLabel, limit):
+        """GET /uomlabel/{uomLabel}/{limit}"""
+
+    @abc.abstractmethod
+    async def readingsByLabel(self, label, limit):
+        """GET /label/{label}/{limit}"""
+
+    @abc.abstractmethod
+    async def readingsByType(self, type, limit):
+        """GET /type/{type}/{limit}"""
+
+    @abc.abstractmethod
+    async def add(self, reading):
+        """POST / with the reading as JSON; returns the new id."""
+
+    @abc.abstractmethod
+    async def update(self, reading):
+        """PUT / with the reading as JSON."""
+
+    @abc.abstractmethod
+    async def delete(self, id):
+        """DELETE /id/{id}"""
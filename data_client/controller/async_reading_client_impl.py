@@ -0,0 +1,79 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+from urllib.parse import urlparse
+
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.controller.async_reading_client import AsyncReadingClient
+from data_client.domain.core import Reading
+from data_client.instrumentation.metrics import instrumented
+from domain.config import config_reader
+from exception.controller import DataValidationException
+
+
+@instrumented
+class AsyncReadingClientImpl(ConsulDiscoveryClientTemplate, AsyncReadingClient):
+
+    objectPairsHook = staticmethod(Reading.fromPairs)
+
+    def __init__(self, url=None):
+        self.url = url or config_reader.read_property("core.db.reading.url", "")
+        super(AsyncReadingClientImpl, self).__init__()
+
+    async def reading(self, id):
+        return await self.hedgedAsync(self.url, self.objectPairsHook,
+                                      lambda target: target.get(id))
+
+    async def readings(self, deviceId=None, limit=None):
+        if deviceId is None:
+            return await self._getClient().get()
+        return await self._getClient().get("device", deviceId, limit)
+
+    async def readingsByName(self, name, limit):
+        return await self._getClient().get("name", name, limit)
+
+    async def readingsByNameAndDevice(self, name, device, limit):
+        return await self._getClient().get("name", name, "device", device, limit)
+
+    async def readingsByUoMLabel(self, uomLabel, limit):
+        return await self._getClient().get("uomlabel", uomLabel, limit)
+
+    async def readingsByLabel(self, label, limit):
+        return await self._getClient().get("label", label, limit)
+
+    async def readingsByType(self, type, limit):
+        return await self._getClient().get("type", type, limit)
+
+    async def add(self, reading):
+        return await self._getClient().post(reading)
+
+    async def update(self, reading):
+        return await self._getClient().put(reading)
+
+    async def delete(self, id):
+        return await self._getClient().delete("id", id)
+
+    def _getClient(self):
+        return self.getAsyncTarget(self.url, self.objectPairsHook)
+
+    def extractPath(self):
+        urlObject = urlparse(self.url)
+        if not urlObject.scheme or not urlObject.netloc:
+            raise DataValidationException(
+                "the URL is malformed, core.db.reading.url: " + self.url)
+        return urlObject.path
@@ -0,0 +1,69 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import abc
+
+
+class AsyncValueDescriptorClient(object):
+    """asyncio variant of ValueDescriptorClient; every method is a coroutine."""
+
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    async def valueDescriptor(self, id):
+        """GET /{id}"""
+
+    @abc.abstractmethod
+    async def valueDescriptors(self):
+        """GET /"""
+
+    @abc.abstractmethod
+    async def valueDescriptorByName(self, name):
+        """GET /name/{name}"""
+
+    @abc.abstractmethod
+    async def valueDescriptorByUOMLabel(self, uomLabel):
+        """GET /uomlabel/{uomLabel}"""
+
+    @abc.abstractmethod
+    async def valueDescriptorByLabel(self, label):
+        """GET /label/{label}"""
+
+    @abc.abstractmethod
+    async def valueDescriptorsForDeviceByName(self, name):
+        """GET /devicename/{name}"""
+
+    @abc.abstractmethod
+    async def valueDescriptorsForDeviceById(self, id):
+        """GET /deviceid/{id}"""
+
+    @abc.abstractmethod
+    async def add(self, valueDescriptor):
+        """POST / with the value descriptor as JSON; returns the new id."""
+
+    @abc.abstractmethod
+    async def update(self, valueDescriptor):
+        """PUT / with the value descriptor as JSON."""
+
+    @abc.abstractmethod
+    async def delete(self, id):
+        """DELETE /id/{id}"""
+
+    @abc.abstractmethod
+    async def deleteByName(self, name):
+        """DELETE /name/{name}"""
@@ -0,0 +1,79 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+from urllib.parse import urlparse
+
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.controller.async_value_descriptor_client import AsyncValueDescriptorClient
+from data_client.domain.common import ValueDescriptor
+from data_client.instrumentation.metrics import instrumented
+from domain.config import config_reader
+from exception.controller import DataValidationException
+
+
+@instrumented
+class AsyncValueDescriptorClientImpl(ConsulDiscoveryClientTemplate, AsyncValueDescriptorClient):
+
+    objectPairsHook = staticmethod(ValueDescriptor.fromPairs)
+
+    def __init__(self, url=None):
+        self.url = url or config_reader.read_property("core.db.valuedescriptor.url", "")
+        super(AsyncValueDescriptorClientImpl, self).__init__()
+
+    async def valueDescriptor(self, id):
+        return await self._getClient().get(id)
+
+    async def valueDescriptors(self):
+        return await self._getClient().get()
+
+    async def valueDescriptorByName(self, name):
+        return await self._getClient().get("name", name)
+
+    async def valueDescriptorByUOMLabel(self, uomLabel):
+        return await self._getClient().get("uomlabel", uomLabel)
+
+    async def valueDescriptorByLabel(self, label):
+        return await self._getClient().get("label", label)
+
+    async def valueDescriptorsForDeviceByName(self, name):
+        return await self._getClient().get("devicename", name)
+
+    async def valueDescriptorsForDeviceById(self, id):
+        return await self._getClient().get("deviceid", id)
+
+    async def add(self, valueDescriptor):
+        return await self._getClient().post(valueDescriptor)
+
+    async def update(self, valueDescriptor):
+        return await self._getClient().put(valueDescriptor)
+
+    async def delete(self, id):
+        return await self._getClient().delete("id", id)
+
+    async def deleteByName(self, name):
+        return await self._getClient().delete("name", name)
+
+    def _getClient(self):
+        return self.getAsyncTarget(self.url, self.objectPairsHook)
+
+    def extractPath(self):
+        urlObject = urlparse(self.url)
+        if not urlObject.scheme or not urlObject.netloc:
+            raise DataValidationException(
+                "the URL is malformed, core.db.valuedescriptor.url: " + self.url)
+        return urlObject.path
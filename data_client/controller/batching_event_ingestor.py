@@ -0,0 +1,141 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+from data_client.transport import json_codec
+
+
+class IngestorClosedException(Exception):
+    """Raised when submitting to an ingestor that has been closed."""
+
+
+class IngestorFullException(Exception):
+    """Raised when the buffer stays full for longer than the submit timeout."""
+
+
+class BatchingEventIngestor(object):
+    """Coalesces EventClient.add calls into concurrently sent batches.
+
+    Events are buffered until maxBatchSize events or maxBatchBytes of JSON are
+    waiting, or the oldest has waited maxBatchAge seconds. Core data adds one
+    event per request, so the events of a batch are then posted side by side
+    by concurrency worker threads sharing the client's pooled connections.
+    Each event is encoded once when it is submitted, with codec or else the
+    client's own (its getCodec()), and the client reuses those bytes.
+    submit() returns a Future resolving to the new event id and blocks once
+    maxPending events are buffered or in flight.
+    """
+
+    def __init__(self, client, maxBatchSize=100, maxBatchBytes=1048576, maxBatchAge=0.05,
+                 maxPending=10000, concurrency=8, codec=None):
+        self.client = client
+        getCodec = getattr(client, "getCodec", None)
+        self.codec = codec or (getCodec() if getCodec is not None else json_codec.create())
+        self.maxBatchSize = maxBatchSize
+        self.maxBatchBytes = maxBatchBytes
+        self.maxBatchAge = maxBatchAge
+        self.maxPending = maxPending
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._condition = threading.Condition()
+        self._buffer = []
+        self._bufferBytes = 0
+        self._oldest = None
+        self._pending = 0
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flushOnAge, name="event-ingestor",
+                                         daemon=True)
+        self._flusher.start()
+
+    def submit(self, event, timeout=None):
+        body = self.codec.encode(event)
+        future = Future()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending >= self.maxPending and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise IngestorFullException("%d events pending" % self._pending)
+                self._condition.wait(remaining)
+            if self._closed:
+                raise IngestorClosedException("ingestor is closed")
+            if not self._buffer:
+                self._oldest = time.monotonic()
+                self._condition.notify_all()
+            self._buffer.append((event, body, future))
+            self._bufferBytes += len(body)
+            self._pending += 1
+            if (len(self._buffer) >= self.maxBatchSize
+                    or self._bufferBytes >= self.maxBatchBytes):
+                self._dispatchLocked()
+        return future
+
+    def flush(self):
+        """Sends whatever is buffered and waits until every pending event is done."""
+        with self._condition:
+            self._dispatchLocked()
+            while self._pending:
+                self._condition.wait()
+
+    def pendingCount(self):
+        with self._condition:
+            return self._pending
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._flusher.join()
+        self._executor.shutdown()
+
+    def _dispatchLocked(self):
+        batch = self._buffer
+        if not batch:
+            return
+        self._buffer = []
+        self._bufferBytes = 0
+        self._oldest = None
+        for event, body, future in batch:
+            self._executor.submit(self._send, event, body, future)
+
+    def _send(self, event, body, future):
+        try:
+            with json_codec.preEncoded(event, body):
+                future.set_result(self.client.add(event))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify_all()
+
+    def _flushOnAge(self):
+        with self._condition:
+            while not self._closed:
+                if self._oldest is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._oldest + self.maxBatchAge - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                else:
+                    self._dispatchLocked()
@@ -0,0 +1,100 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+from data_client.cache.ttl_lru_cache import TtlLruCache
+from data_client.controller.value_descriptor_client import ValueDescriptorClient
+
+
+class CachingValueDescriptorClient(ValueDescriptorClient):
+    """Read-through cache in front of another ValueDescriptorClient.
+
+    Lookups by id, by name and the full listing are cached with a TTL and an
+    LRU bound. Any add, update, delete or deleteByName made through this
+    client clears the cache, since a change to one descriptor can alter every
+    cached listing. Label and device queries are passed straight through.
+    """
+
+    def __init__(self, delegate, maxSize=1024, ttl=300.0):
+        self.delegate = delegate
+        self.cache = TtlLruCache(maxSize, ttl)
+
+    def valueDescriptor(self, id):
+        return self.cache.getOrLoad(("id", id), lambda: self.delegate.valueDescriptor(id))
+
+    def valueDescriptors(self):
+        generation = self.cache.generation()
+        cached = self.cache.get(("all",))
+        if cached is None:
+            cached = self.delegate.valueDescriptors()
+            self.cache.put(("all",), cached, generation)
+            for valueDescriptor in cached:
+                self._remember(valueDescriptor, generation)
+        return cached
+
+    def valueDescriptorByName(self, name):
+        return self.cache.getOrLoad(("name", name),
+                                    lambda: self.delegate.valueDescriptorByName(name))
+
+    def valueDescriptorByUOMLabel(self, uomLabel):
+        return self.delegate.valueDescriptorByUOMLabel(uomLabel)
+
+    def valueDescriptorByLabel(self, label):
+        return self.delegate.valueDescriptorByLabel(label)
+
+    def valueDescriptorsForDeviceByName(self, name):
+        return self.delegate.valueDescriptorsForDeviceByName(name)
+
+    def valueDescriptorsForDeviceById(self, id):
+        return self.delegate.valueDescriptorsForDeviceById(id)
+
+    def add(self, valueDescriptor):
+        try:
+            return self.delegate.add(valueDescriptor)
+        finally:
+            self.cache.clear()
+
+    def update(self, valueDescriptor):
+        try:
+            return self.delegate.update(valueDescriptor)
+        finally:
+            self.cache.clear()
+
+    def delete(self, id):
+        try:
+            return self.delegate.delete(id)
+        finally:
+            self.cache.clear()
+
+    def deleteByName(self, name):
+        try:
+            return self.delegate.deleteByName(name)
+        finally:
+            self.cache.clear()
+
+    def stats(self):
+        return self.cache.stats()
+
+    def _remember(self, valueDescriptor, generation):
+        if isinstance(valueDescriptor, dict):
+            id, name = valueDescriptor.get("id"), valueDescriptor.get("name")
+        else:
+            id, name = valueDescriptor.id, valueDescriptor.name
+        if id:
+            self.cache.put(("id", id), valueDescriptor, generation)
+        if name:
+            self.cache.put(("name", name), valueDescriptor, generation)
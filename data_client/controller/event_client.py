@@ -16,70 +16,54 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+import abc
 
-import java.util.List
 
-import javax.ws.rs.Consumes
-import javax.ws.rs.DELETE
-import javax.ws.rs.GET
-import javax.ws.rs.POST
-import javax.ws.rs.PUT
-import javax.ws.rs.Path
-import javax.ws.rs.PathParam
+class EventClient(object):
+    """Client for the core data /event endpoints."""
 
-from domain.core import Event
-from domain.core import Reading
+    __metaclass__ = abc.ABCMeta
 
-public interface EventClient {
+    @abc.abstractmethod
+    def event(self, id):
+        """GET /{id}"""
 
-    @GET
-    @Path("/{id}")
-    Event event(@PathParam("id") String id)
+    @abc.abstractmethod
+    def events(self, start=None, end=None, limit=None):
+        """GET / or, with a time range, GET /{start}/{end}/{limit}"""
 
-    @GET
-    List<Event> events()
+    @abc.abstractmethod
+    def eventsForDevice(self, deviceId, limit):
+        """GET /device/{deviceId}/{limit}"""
 
-    @GET
-    @Path("/{start}/{end}/{limit}")
-    List<Event> events(@PathParam("start") long start, @PathParam("end") long end,
-            @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        """GET /device/{deviceId}/valuedescriptor/{valuedescriptor}/{limit}"""
 
-    @GET
-    @Path("/device/{deviceId:.+}/{limit}")
-    List<Event> eventsForDevice(@PathParam("deviceId") String deviceId,
-            @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def add(self, event):
+        """POST / with the event as JSON; returns the new id."""
 
-    @GET
-    @Path("/device/{deviceId:.+}/valuedescriptor/{valuedescriptor:.+}/{limit}")
-    List<Reading> readingsForDeviceAndValueDescriptor(@PathParam("deviceId") String deviceId,
-            @PathParam("valuedescriptor") String valuedescriptor, @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def markedPushed(self, id):
+        """PUT /id/{id}"""
 
-    @POST
-    @Consumes("application/json")
-    String add(Event event)
+    @abc.abstractmethod
+    def update(self, event):
+        """PUT / with the event as JSON."""
 
-    @PUT
-    @Path("/id/{id}")
-    boolean markedPushed(@PathParam("id") String id)
+    @abc.abstractmethod
+    def delete(self, id):
+        """DELETE /id/{id}"""
 
-    @PUT
-    @Consumes("application/json")
-    boolean update(Event event)
+    @abc.abstractmethod
+    def deleteByDevice(self, deviceId):
+        """DELETE /device/{deviceId}"""
 
-    @DELETE
-    @Path("/id/{id}")
-    boolean delete(@PathParam("id") String id)
+    @abc.abstractmethod
+    def scrubPushedEvents(self):
+        """DELETE /scrub"""
 
-    @DELETE
-    @Path("/device/{deviceId:.+}")
-    int deleteByDevice(@PathParam("deviceId") String deviceId)
-
-    @DELETE
-    @Path("/scrub")
-    long scrubPushedEvents()
-
-    @DELETE
-    @Path("/removeold/age/{age}")
-    long scrubOldEvents(@PathParam("age") long age)
-
-}
+    @abc.abstractmethod
+    def scrubOldEvents(self, age):
+        """DELETE /removeold/age/{age}"""
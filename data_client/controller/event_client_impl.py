@@ -16,95 +16,66 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+from urllib.parse import urlparse
 
-import java.net.MalformedURLException
-import java.net.URL
-import java.util.List
-
-from controller import EventClient
-from core.client import ConsulDiscoveryClientTemplate
-from domain.core import Event
-from domain.core import Reading
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.controller.event_client import EventClient
+from data_client.domain import core
+from data_client.instrumentation.metrics import instrumented
+from domain.config import config_reader
 from exception.controller import DataValidationException
-import org.jboss.resteasy.client.jaxrs.ResteasyClient
-import org.jboss.resteasy.client.jaxrs.ResteasyClientBuilder
-import org.jboss.resteasy.client.jaxrs.ResteasyWebTarget
-import org.springframework.beans.factory.annotation.Value
-import org.springframework.stereotype.Component
-
-@Component
-class EventClientImpl extends ConsulDiscoveryClientTemplate implements EventClient {
-
-    @Value("${core.db.event.url}")
-    String url
-
-    @Override
-    public Event event(String id):
-        return getClient().event(id)
-
-    @Override
-    public List<Event> events():
-        return getClient().events()
-
-    @Override
-    public List<Event> events(long start, long end, int limit):
-        return getClient().events(start, end, limit)
-
-    @Override
-    public List<Event> eventsForDevice(String deviceId, int limit):
-        return getClient().eventsForDevice(deviceId, limit)
-
-    @Override
-    public List<Reading> readingsForDeviceAndValueDescriptor(String deviceId, String valuedescriptor,
-            int limit):
-        return getClient().readingsForDeviceAndValueDescriptor(deviceId, valuedescriptor, limit)
-
-    @Override
-    public String add(Event event):
-        return getClient().add(event)
-
-    @Override
-    public boolean markedPushed(String id):
-        return getClient().markedPushed(id)
-
-    @Override
-    public boolean update(Event event):
-        return getClient().update(event)
-
-    @Override
-    public boolean delete(String id):
-        return getClient().delete(id)
-
-    @Override
-    public int deleteByDevice(String deviceId):
-        return getClient().deleteByDevice(deviceId)
-
-    @Override
-    public long scrubPushedEvents():
-        return getClient().scrubPushedEvents()
-
-    @Override
-    public long scrubOldEvents(long age):
-        return getClient().scrubOldEvents(age)
-
-    private EventClient getClient():
-        ResteasyClient client = new ResteasyClientBuilder().build()
-        ResteasyWebTarget target
-
-        String rootUrl = super.getRootUrl()
-        if (rootUrl is None || rootUrl.isEmpty()):
-            target = client.target(url)
-            target = client.target(rootUrl + super.getPath())
-
-        return target.proxy(EventClient.class)
-
-    @Override
-    protected String extractPath():
-        String result = ""
-        try {
-            URL urlObject = new URL(url)
-            result = urlObject.getPath()
-            throw new DataValidationException("the URL is malformed, core.db.event.url: " + url)
-        return result
-
-}
+
+
+@instrumented
+class EventClientImpl(ConsulDiscoveryClientTemplate, EventClient):
+
+    objectPairsHook = staticmethod(core.eventOrReadingFromPairs)
+
+    def __init__(self, url=None):
+        self.url = url or config_reader.read_property("core.db.event.url", "")
+        super(EventClientImpl, self).__init__()
+
+    def event(self, id):
+        return self.hedged(self.url, self.objectPairsHook, lambda target: target.get(id))
+
+    def events(self, start=None, end=None, limit=None):
+        if start is None:
+            return self._getClient().get()
+        return self._getClient().get(start, end, limit)
+
+    def eventsForDevice(self, deviceId, limit):
+        return self._getClient().get("device", deviceId, limit)
+
+    def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        return self._getClient().get("device", deviceId, "valuedescriptor", valuedescriptor,
+                                     limit)
+
+    def add(self, event):
+        return self._getClient().post(event)
+
+    def markedPushed(self, id):
+        return self._getClient().put(None, "id", id)
+
+    def update(self, event):
+        return self._getClient().put(event)
+
+    def delete(self, id):
+        return self._getClient().delete("id", id)
+
+    def deleteByDevice(self, deviceId):
+        return self._getClient().delete("device", deviceId)
+
+    def scrubPushedEvents(self):
+        return self._getClient().delete("scrub")
+
+    def scrubOldEvents(self, age):
+        return self._getClient().delete("removeold", "age", age)
+
+    def _getClient(self):
+        return self.getTarget(self.url, self.objectPairsHook)
+
+    def extractPath(self):
+        urlObject = urlparse(self.url)
+        if not urlObject.scheme or not urlObject.netloc:
+            raise DataValidationException("the URL is malformed, core.db.event.url: " + self.url)
+        return urlObject.path
@@ -0,0 +1,109 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import contextvars
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+_NO_KEY = object()
+
+
+class FanOutResult(object):
+    """Outcome of the query for one key: either a value or the error it raised."""
+
+    def __init__(self, key, value=None, error=None):
+        self.key = key
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return "FanOutResult(%r, ok)" % (self.key,)
+        return "FanOutResult(%r, error=%r)" % (self.key, self.error)
+
+
+def fanOut(query, keys, concurrency=16):
+    """Runs query(key) for every key on concurrency threads, yielding as each finishes.
+
+    Results come back in completion order as FanOutResult objects; a failing
+    key is reported in its result and does not stop the others. Only
+    concurrency queries are submitted at a time, so long key lists do not
+    queue up work that a caller who stops iterating early would not need.
+    """
+    keys = iter(keys)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        running = {}
+        try:
+            for key in keys:
+                running[_submit(executor, query, key)] = key
+                if len(running) >= concurrency:
+                    break
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    error = future.exception()
+                    yield FanOutResult(key, None if error else future.result(), error)
+                    nextKey = next(keys, _NO_KEY)
+                    if nextKey is not _NO_KEY:
+                        running[_submit(executor, query, nextKey)] = nextKey
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def _submit(executor, query, key):
+    # workers run in a copy of the caller's context so resilience.deadline() reaches them
+    return executor.submit(contextvars.copy_context().run, query, key)
+
+
+async def fanOutAsync(query, keys, concurrency=64):
+    """asyncio counterpart of fanOut for coroutine queries such as AsyncReadingClient's."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key):
+        async with semaphore:
+            try:
+                return FanOutResult(key, await query(key))
+            except Exception as e:
+                return FanOutResult(key, error=e)
+
+    tasks = [asyncio.ensure_future(run(key)) for key in keys]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def readingsForDevices(client, deviceIds, limit, concurrency=16):
+    """Fans ReadingClient.readings(deviceId, limit) out over many devices."""
+    return fanOut(lambda deviceId: client.readings(deviceId, limit), deviceIds, concurrency)
+
+
+def eventsForDevices(client, deviceIds, limit, concurrency=16):
+    """Fans EventClient.eventsForDevice(deviceId, limit) out over many devices."""
+    return fanOut(lambda deviceId: client.eventsForDevice(deviceId, limit), deviceIds,
+                  concurrency)
@@ -0,0 +1,113 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _field(item, name):
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def iterTimeRange(fetchPage, start, end, pageSize=500, timeField="created", prefetch=True):
+    """Yields every record in [start, end] by walking fetchPage(start, end, limit).
+
+    fetchPage must return the earliest `limit` records of the window, which is
+    what core data's /{start}/{end}/{limit} endpoints do. The next page starts
+    at the last timestamp seen, skipping ids already yielded at that instant,
+    so records sharing a timestamp across a page boundary are neither lost
+    nor repeated. When a whole page shares one timestamp the page size is
+    doubled until the records at that instant fit. Records without timeField
+    cannot be placed in the range and are skipped. With prefetch on, the
+    next page is requested while the caller works through the current one;
+    at most two pages are in memory.
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        limit = pageSize
+        pending = _submit(executor, fetchPage, start, end, limit)
+        seen = set()
+        while pending is not None:
+            page = _result(pending)
+            full = len(page) >= limit
+            page = _timed(page, timeField)
+            pending = None
+            fresh = [item for item in page if _field(item, "id") not in seen]
+            if full:
+                if not page:
+                    raise ValueError("a page of %d records has no %s to continue from"
+                                     % (limit, timeField))
+                last = _field(page[-1], timeField)
+                if last == start and not fresh:
+                    # every record returned is at start and already yielded
+                    limit *= 2
+                    LOGGER.debug("more than %d records at %s; reading %d at a time",
+                                 limit // 2, last, limit)
+                elif last != start:
+                    seen = set()
+                    start, limit = last, pageSize
+                seen.update(_field(item, "id") for item in page
+                            if _field(item, timeField) == start)
+                if start <= end:
+                    pending = _submit(executor, fetchPage, start, end, limit)
+            for item in fresh:
+                yield item
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed(page, timeField):
+    """Sorts a page by timeField, leaving out the records that have none."""
+    timed = [item for item in page if _field(item, timeField) is not None]
+    if len(timed) < len(page):
+        LOGGER.warning("skipped %d records without %s", len(page) - len(timed), timeField)
+    return sorted(timed, key=lambda item: _field(item, timeField))
+
+
+def iterEvents(client, start, end, pageSize=500, prefetch=True):
+    """Streams EventClient.events(start, end, limit) page by page."""
+    return iterTimeRange(client.events, start, end, pageSize, "created", prefetch)
+
+
+def iterReadings(client, start, end, pageSize=500, prefetch=True):
+    """Streams the readings of every event in the range, page by page.
+
+    ReadingClient has no time range query, so readings are taken from the
+    events that carry them.
+    """
+    for event in iterEvents(client, start, end, pageSize, prefetch):
+        for reading in _field(event, "readings") or ():
+            yield reading
+
+
+def _submit(executor, fetchPage, start, end, limit):
+    if executor is None:
+        return (fetchPage, start, end, limit)
+    return executor.submit(fetchPage, start, end, limit)
+
+
+def _result(pending):
+    if isinstance(pending, tuple):
+        fetchPage, start, end, limit = pending
+        return fetchPage(start, end, limit)
+    return pending.result()
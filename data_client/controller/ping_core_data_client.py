@@ -16,12 +16,14 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+import abc
 
-import javax.ws.rs.GET
 
-public interface PingCoreDataClient {
+class PingCoreDataClient(object):
+    """Client for the core data /ping endpoint."""
 
-    @GET
-    String ping()
+    __metaclass__ = abc.ABCMeta
 
-}
+    @abc.abstractmethod
+    def ping(self):
+        """GET /"""
@@ -16,48 +16,30 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+from urllib.parse import urlparse
 
-import java.net.MalformedURLException
-import java.net.URL
-
-from controller import PingCoreDataClient
-from core.client import ConsulDiscoveryClientTemplate
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.controller.ping_core_data_client import PingCoreDataClient
+from data_client.instrumentation.metrics import instrumented
+from domain.config import config_reader
 from exception.controller import DataValidationException
-import org.jboss.resteasy.client.jaxrs.ResteasyClient
-import org.jboss.resteasy.client.jaxrs.ResteasyClientBuilder
-import org.jboss.resteasy.client.jaxrs.ResteasyWebTarget
-import org.springframework.beans.factory.annotation.Value
-import org.springframework.stereotype.Component
-
-@Component
-class PingCoreDataClientImpl extends ConsulDiscoveryClientTemplate
-        implements PingCoreDataClient {
-
-    @Value("${core.db.ping.url}")
-    String url
-
-    @Override
-    public String ping():
-        return getClient().ping()
-
-    private PingCoreDataClient getClient():
-        ResteasyClient client = new ResteasyClientBuilder().build()
-        ResteasyWebTarget target
-
-        String rootUrl = super.getRootUrl()
-        if (rootUrl is None || rootUrl.isEmpty()):
-            target = client.target(url)
-            target = client.target(rootUrl + super.getPath())
-
-        return target.proxy(PingCoreDataClient.class)
-
-    @Override
-    protected String extractPath():
-        String result = ""
-        try {
-            URL urlObject = new URL(url)
-            result = urlObject.getPath()
-            throw new DataValidationException("the URL is malformed, core.db.ping.url: " + url)
-        return result
-
-}
+
+
+@instrumented
+class PingCoreDataClientImpl(ConsulDiscoveryClientTemplate, PingCoreDataClient):
+
+    def __init__(self, url=None):
+        self.url = url or config_reader.read_property("core.db.ping.url", "")
+        super(PingCoreDataClientImpl, self).__init__()
+
+    def ping(self):
+        return self._getClient().get()
+
+    def _getClient(self):
+        return self.getTarget(self.url)
+
+    def extractPath(self):
+        urlObject = urlparse(self.url)
+        if not urlObject.scheme or not urlObject.netloc:
+            raise DataValidationException("the URL is malformed, core.db.ping.url: " + self.url)
+        return urlObject.path
@@ -0,0 +1,143 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import logging
+import queue
+import threading
+import time
+
+from data_client.transport.http_session_pool import NotFoundException
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AcknowledgementResult(object):
+
+    def __init__(self, acknowledged, failed):
+        self.acknowledged = acknowledged
+        self.failed = failed
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def __repr__(self):
+        return "AcknowledgementResult(%d acknowledged, %d failed)" % (
+            self.acknowledged, len(self.failed))
+
+
+class PushedAcknowledger(object):
+    """Issues EventClient.markedPushed for queued ids with a bounded in-flight window.
+
+    acknowledge() only queues the id. window worker threads send the PUTs
+    over the shared keep-alive connections, so at most window requests are
+    outstanding. An id whose PUT errors is retried up to maxRetries times
+    with exponential backoff from retryDelay; unknown ids (404) and PUTs
+    answered with false are not retried. flush() waits for every id queued
+    so far and reports what was acknowledged and what failed since the
+    previous flush.
+
+    The transport already retries each PUT, so every retry here also spends
+    a token from retryBudget, by default the client's resilience budget;
+    once it is empty the id is reported as failed.
+    """
+
+    def __init__(self, client, window=32, maxRetries=3, retryDelay=0.1, retryBudget=None):
+        self.client = client
+        self.maxRetries = maxRetries
+        self.retryDelay = retryDelay
+        self.retryBudget = retryBudget
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._outstanding = 0
+        self._acknowledged = 0
+        self._failed = []
+        self._workers = [threading.Thread(target=self._work, name="pushed-ack-%d" % i,
+                                          daemon=True) for i in range(window)]
+        for worker in self._workers:
+            worker.start()
+
+    def acknowledge(self, id):
+        with self._condition:
+            self._outstanding += 1
+        self._queue.put(id)
+
+    def acknowledgeAll(self, ids):
+        for id in ids:
+            self.acknowledge(id)
+
+    def flush(self, timeout=None):
+        """Waits until nothing is outstanding; returns results since the last flush.
+
+        Raises TimeoutError if ids are still outstanding after timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("%d acknowledgements outstanding" % self._outstanding)
+                self._condition.wait(remaining)
+            result = AcknowledgementResult(self._acknowledged, self._failed)
+            self._acknowledged = 0
+            self._failed = []
+            return result
+
+    def close(self):
+        result = self.flush()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        return result
+
+    def _work(self):
+        while True:
+            id = self._queue.get()
+            if id is None:
+                return
+            acknowledged = self._send(id)
+            with self._condition:
+                self._outstanding -= 1
+                if acknowledged:
+                    self._acknowledged += 1
+                else:
+                    self._failed.append(id)
+                self._condition.notify_all()
+
+    def _send(self, id):
+        delay = self.retryDelay
+        for attempt in range(self.maxRetries + 1):
+            try:
+                return bool(self.client.markedPushed(id))
+            except NotFoundException:
+                return False
+            except Exception as e:
+                LOGGER.debug("markedPushed(%s) attempt %d failed: %s", id, attempt + 1, e)
+                if attempt >= self.maxRetries or not self._withdrawRetry():
+                    return False
+                time.sleep(delay)
+                delay *= 2
+        return False
+
+    def _withdrawRetry(self):
+        budget = self.retryBudget
+        if budget is None:
+            # the template's resilience is created with the client's first request
+            budget = getattr(getattr(self.client, "resilience", None), "retryBudget", None)
+        return budget is None or budget.withdraw()
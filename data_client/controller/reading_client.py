@@ -16,64 +16,50 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+import abc
 
-import java.util.List
 
-import javax.ws.rs.Consumes
-import javax.ws.rs.DELETE
-import javax.ws.rs.GET
-import javax.ws.rs.POST
-import javax.ws.rs.PUT
-import javax.ws.rs.Path
-import javax.ws.rs.PathParam
+class ReadingClient(object):
+    """Client for the core data /reading endpoints."""
 
-from domain.core import Reading
+    __metaclass__ = abc.ABCMeta
 
-public interface ReadingClient {
+    @abc.abstractmethod
+    def reading(self, id):
+        """GET /{id}"""
 
-    @GET
-    @Path("/{id}")
-    Reading reading(@PathParam("id") String id)
+    @abc.abstractmethod
+    def readings(self, deviceId=None, limit=None):
+        """GET / or, for one device, GET /device/{deviceId}/{limit}"""
 
-    @GET
-    List<Reading> readings()
+    @abc.abstractmethod
+    def readingsByName(self, name, limit):
+        """GET /name/{name}/{limit}"""
 
-    @GET
-    @Path("/device/{deviceId}/{limit}")
-    List<Reading> readings(@PathParam("deviceId") String deviceId, @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def readingsByNameAndDevice(self, name, device, limit):
+        """GET /name/{name}/device/{device}/{limit}"""
 
-    @GET
-    @Path("/name/{name:.+}/{limit}")
-    List<Reading> readingsByName(@PathParam("name") String name, @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def readingsByUoMLabel(self, uomLabel, limit):
+        """GET /uomlabel/{uomLabel}/{limit}"""
 
-    @GET
-    @Path("/name/{name:.+}/device/{device}/{limit}")
-    List<Reading> readingsByNameAndDevice(@PathParam("name") String name,
-            @PathParam("device") String device, @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def readingsByLabel(self, label, limit):
+        """GET /label/{label}/{limit}"""
 
-    @GET
-    @Path("/uomlabel/{uomLabel:.+}/{limit}")
-    List<Reading> readingsByUoMLabel(@PathParam("uomLabel") String uomLabel,
-            @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def readingsByType(self, type, limit):
+        """GET /type/{type}/{limit}"""
 
-    @GET
-    @Path("/label/{label:.+}/{limit}")
-    List<Reading> readingsByLabel(@PathParam("label") String label, @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def add(self, reading):
+        """POST / with the reading as JSON; returns the new id."""
 
-    @GET
-    @Path("/type/{type:.+}/{limit}")
-    List<Reading> readingsByType(@PathParam("type") String type, @PathParam("limit") int limit)
+    @abc.abstractmethod
+    def update(self, reading):
+        """PUT / with the reading as JSON."""
 
-    @POST
-    @Consumes("application/json")
-    String add(Reading reading)
-
-    @PUT
-    @Consumes("application/json")
-    boolean update(Reading reading)
-
-    @DELETE
-    @Path("/id/{id}")
-    boolean delete(@PathParam("id") String id)
-
-}
+    @abc.abstractmethod
+    def delete(self, id):
+        """DELETE /id/{id}"""
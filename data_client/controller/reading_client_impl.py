@@ -16,89 +16,63 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+from urllib.parse import urlparse
 
-import java.net.MalformedURLException
-import java.net.URL
-import java.util.List
-
-from controller import ReadingClient
-from core.client import ConsulDiscoveryClientTemplate
-from domain.core import Reading
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.controller.reading_client import ReadingClient
+from data_client.domain.core import Reading
+from data_client.instrumentation.metrics import instrumented
+from domain.config import config_reader
 from exception.controller import DataValidationException
-import org.jboss.resteasy.client.jaxrs.ResteasyClient
-import org.jboss.resteasy.client.jaxrs.ResteasyClientBuilder
-import org.jboss.resteasy.client.jaxrs.ResteasyWebTarget
-import org.springframework.beans.factory.annotation.Value
-import org.springframework.stereotype.Component
-
-@Component
-class ReadingClientImpl extends ConsulDiscoveryClientTemplate implements ReadingClient {
-
-    @Value("${core.db.reading.url}")
-    String url
-
-    @Override
-    public Reading reading(String id):
-        return getClient().reading(id)
-
-    @Override
-    public List<Reading> readings():
-        return getClient().readings()
-
-    @Override
-    public List<Reading> readings(String deviceId, int limit):
-        return getClient().readings(deviceId, limit)
-
-    @Override
-    public List<Reading> readingsByName(String name, int limit):
-        return getClient().readingsByName(name, limit)
-
-    @Override
-    public List<Reading> readingsByNameAndDevice(String name, String device, int limit):
-        return getClient().readingsByNameAndDevice(name, device, limit)
-
-    @Override
-    public List<Reading> readingsByUoMLabel(String uomLabel, int limit):
-        return getClient().readingsByUoMLabel(uomLabel, limit)
-
-    @Override
-    public List<Reading> readingsByLabel(String label, int limit):
-        return getClient().readingsByLabel(label, limit)
-
-    @Override
-    public List<Reading> readingsByType(String type, int limit):
-        return getClient().readingsByType(type, limit)
-
-    @Override
-    public String add(Reading reading):
-        return getClient().add(reading)
-
-    @Override
-    public boolean update(Reading reading):
-        return getClient().update(reading)
-
-    @Override
-    public boolean delete(String id):
-        return getClient().delete(id)
-
-    private ReadingClient getClient():
-        ResteasyClient client = new ResteasyClientBuilder().build()
-        ResteasyWebTarget target
-
-        String rootUrl = super.getRootUrl()
-        if (rootUrl is None || rootUrl.isEmpty()):
-            target = client.target(url)
-            target = client.target(rootUrl + super.getPath())
-
-        return target.proxy(ReadingClient.class)
-
-    @Override
-    protected String extractPath():
-        String result = ""
-        try {
-            URL urlObject = new URL(url)
-            result = urlObject.getPath()
-            throw new DataValidationException("the URL is malformed, core.db.reading.url: " + url)
-        return result
-
-}
+
+
+@instrumented
+class ReadingClientImpl(ConsulDiscoveryClientTemplate, ReadingClient):
+
+    objectPairsHook = staticmethod(Reading.fromPairs)
+
+    def __init__(self, url=None):
+        self.url = url or config_reader.read_property("core.db.reading.url", "")
+        super(ReadingClientImpl, self).__init__()
+
+    def reading(self, id):
+        return self.hedged(self.url, self.objectPairsHook, lambda target: target.get(id))
+
+    def readings(self, deviceId=None, limit=None):
+        if deviceId is None:
+            return self._getClient().get()
+        return self._getClient().get("device", deviceId, limit)
+
+    def readingsByName(self, name, limit):
+        return self._getClient().get("name", name, limit)
+
+    def readingsByNameAndDevice(self, name, device, limit):
+        return self._getClient().get("name", name, "device", device, limit)
+
+    def readingsByUoMLabel(self, uomLabel, limit):
+        return self._getClient().get("uomlabel", uomLabel, limit)
+
+    def readingsByLabel(self, label, limit):
+        return self._getClient().get("label", label, limit)
+
+    def readingsByType(self, type, limit):
+        return self._getClient().get("type", type, limit)
+
+    def add(self, reading):
+        return self._getClient().post(reading)
+
+    def update(self, reading):
+        return self._getClient().put(reading)
+
+    def delete(self, id):
+        return self._getClient().delete("id", id)
+
+    def _getClient(self):
+        return self.getTarget(self.url, self.objectPairsHook)
+
+    def extractPath(self):
+        urlObject = urlparse(self.url)
+        if not urlObject.scheme or not urlObject.netloc:
+            raise DataValidationException(
+                "the URL is malformed, core.db.reading.url: " + self.url)
+        return urlObject.path
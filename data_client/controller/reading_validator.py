@@ -0,0 +1,353 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import logging
+import math
+import threading
+import time
+
+from data_client.controller.event_client import EventClient
+from data_client.controller.reading_client import ReadingClient
+from data_client.transport.http_session_pool import NotFoundException
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _field(obj, name):
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _parseInteger(value):
+    if isinstance(value, bool) or isinstance(value, float):
+        raise ValueError(value)
+    return int(value) if isinstance(value, int) else int(str(value).strip())
+
+
+def _parseFloat(value):
+    if isinstance(value, bool):
+        raise ValueError(value)
+    parsed = float(value)
+    if not math.isfinite(parsed):
+        raise ValueError(value)
+    return parsed
+
+
+def _parseBoolean(value):
+    if isinstance(value, bool) or str(value).lower() in ("true", "false"):
+        return value
+    raise ValueError(value)
+
+
+def _parseJson(value):
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+# keyed by the first letter of the descriptor type, so "I", "INT64" and "Integer" agree
+_PARSERS = {"I": _parseInteger, "F": _parseFloat, "B": _parseBoolean, "J": _parseJson}
+_TYPE_NAMES = {"I": "integer", "F": "float", "B": "boolean", "J": "JSON"}
+
+
+def _bound(value):
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _accept(value):
+    return None
+
+
+def compileCheck(valueDescriptor, unit=None):
+    """Turns a value descriptor into a function from a reading value to a problem.
+
+    The function returns None for a valid value, else a message. Values are
+    parsed by the descriptor's type and numeric values are held to its min
+    and max; descriptors of an unknown or string type accept any value.
+    With unit, a descriptor whose uomLabel differs rejects every value.
+    """
+    uomLabel = _field(valueDescriptor, "uomLabel")
+    if unit is not None and unit != uomLabel:
+        message = "unit %r expected, value descriptor has %r" % (unit, uomLabel)
+        return lambda value: message
+    typeCode = str(_field(valueDescriptor, "type") or "S")[:1].upper()
+    parse = _PARSERS.get(typeCode)
+    if parse is None:
+        return _accept
+    typeName = _TYPE_NAMES[typeCode]
+    numeric = typeCode in ("I", "F")
+    low = _bound(_field(valueDescriptor, "min")) if numeric else None
+    high = _bound(_field(valueDescriptor, "max")) if numeric else None
+
+    def check(value):
+        try:
+            parsed = parse(value)
+        except (TypeError, ValueError):
+            return "%r is not a valid %s" % (value, typeName)
+        if low is not None and parsed < low:
+            return "%r is below the minimum %r" % (value, low)
+        if high is not None and parsed > high:
+            return "%r is above the maximum %r" % (value, high)
+        return None
+    return check
+
+
+def _signature(valueDescriptor):
+    return tuple(_field(valueDescriptor, name)
+                 for name in ("type", "min", "max", "uomLabel", "modified"))
+
+
+class Violation(object):
+    """A reading that failed validation; event is None outside of events."""
+
+    __slots__ = ("event", "reading", "name", "message")
+
+    def __init__(self, event, reading, name, message):
+        self.event = event
+        self.reading = reading
+        self.name = name
+        self.message = message
+
+    def __str__(self):
+        where = "reading %d" % self.reading
+        if self.event is not None:
+            where = "event %d %s" % (self.event, where)
+        return "%s (%s): %s" % (where, self.name, self.message)
+
+    __repr__ = __str__
+
+
+class ReadingValidationException(ValueError):
+    """Raised instead of sending readings that core data would reject."""
+
+    def __init__(self, violations):
+        super(ReadingValidationException, self).__init__(
+            "%d invalid reading(s): %s" % (len(violations),
+                                           "; ".join(str(v) for v in violations[:5])))
+        self.violations = violations
+
+
+class ReadingValidator(object):
+    """Checks readings against value descriptors before they are sent.
+
+    Every descriptor from valueDescriptorClient.valueDescriptors() is
+    compiled once into a check (see compileCheck). At most every
+    refreshInterval seconds the listing is fetched again and only descriptors
+    that were added or changed are recompiled; names missing from it are
+    looked up by name, and remembered as unknown until the next refresh.
+    units maps reading names to the uomLabel their producer reports in.
+    Put a CachingValueDescriptorClient in front to share descriptors with
+    other callers.
+    """
+
+    def __init__(self, valueDescriptorClient, units=None, refreshInterval=60.0,
+                 clock=time.monotonic):
+        self.client = valueDescriptorClient
+        self.units = dict(units or {})
+        self.refreshInterval = refreshInterval
+        self.clock = clock
+        self.compiled = 0
+        self._checks = {}
+        self._signatures = {}
+        self._unknown = set()
+        self._refreshedAt = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        descriptors = self.client.valueDescriptors() or []
+        with self._lock:
+            seen = set()
+            for valueDescriptor in descriptors:
+                name = _field(valueDescriptor, "name")
+                if name:
+                    seen.add(name)
+                    self._compileLocked(name, valueDescriptor)
+            for name in set(self._checks) - seen:
+                del self._checks[name]
+                del self._signatures[name]
+            self._unknown.clear()
+            self._refreshedAt = self.clock()
+
+    def checkFor(self, name):
+        """Returns the compiled check for a reading name, or None if it is unknown."""
+        check = self._checks.get(name)
+        if check is not None or name in self._unknown:
+            return check
+        try:
+            valueDescriptor = self.client.valueDescriptorByName(name)
+        except NotFoundException:
+            valueDescriptor = None
+        with self._lock:
+            if valueDescriptor is None:
+                self._unknown.add(name)
+                return None
+            return self._compileLocked(name, valueDescriptor)
+
+    def validateReadings(self, readings, event=None):
+        """Returns the Violations among readings, checking the refresh first."""
+        self._refreshIfDue()
+        violations = []
+        checks = self._checks
+        for index, reading in enumerate(readings):
+            name = _field(reading, "name")
+            check = checks.get(name) or (self.checkFor(name) if name else None)
+            if check is None:
+                message = "no value descriptor named %r" % name if name else "reading has no name"
+            else:
+                message = check(_field(reading, "value"))
+            if message is not None:
+                violations.append(Violation(event, index, name, message))
+        return violations
+
+    def validateEvents(self, events):
+        """Returns the Violations across a list of events, in order."""
+        violations = []
+        for index, event in enumerate(events):
+            violations.extend(self.validateReadings(_field(event, "readings") or (), index))
+        return violations
+
+    def partition(self, events):
+        """Splits events into those that pass and the Violations of those that do not."""
+        violations = self.validateEvents(events)
+        rejected = set(v.event for v in violations)
+        return [e for i, e in enumerate(events) if i not in rejected], violations
+
+    def checkEvent(self, event):
+        violations = self.validateEvents([event])
+        if violations:
+            raise ReadingValidationException(violations)
+
+    def checkReading(self, reading):
+        violations = self.validateReadings([reading])
+        if violations:
+            raise ReadingValidationException(violations)
+
+    def _refreshIfDue(self):
+        if self._refreshedAt is not None and (
+                self.refreshInterval is None
+                or self.clock() - self._refreshedAt < self.refreshInterval):
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            if self._refreshedAt is None:
+                raise
+            # keep checking against what was compiled last time
+            LOGGER.warning("value descriptor refresh failed: %s", e)
+            self._refreshedAt = self.clock()
+
+    def _compileLocked(self, name, valueDescriptor):
+        signature = _signature(valueDescriptor)
+        if self._signatures.get(name) != signature:
+            self._checks[name] = compileCheck(valueDescriptor, self.units.get(name))
+            self._signatures[name] = signature
+            self.compiled += 1
+        return self._checks[name]
+
+
+class ValidatingEventClient(EventClient):
+    """EventClient that validates events before add and update send them.
+
+    Invalid events raise ReadingValidationException without a request
+    being made; every other call is passed straight to the delegate.
+    """
+
+    def __init__(self, delegate, validator):
+        self.delegate = delegate
+        self.validator = validator
+
+    def events(self, start=None, end=None, limit=None):
+        return self.delegate.events(start, end, limit)
+
+    def event(self, id):
+        return self.delegate.event(id)
+
+    def eventsForDevice(self, deviceId, limit):
+        return self.delegate.eventsForDevice(deviceId, limit)
+
+    def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        return self.delegate.readingsForDeviceAndValueDescriptor(deviceId, valuedescriptor,
+                                                                 limit)
+
+    def add(self, event):
+        self.validator.checkEvent(event)
+        return self.delegate.add(event)
+
+    def markedPushed(self, id):
+        return self.delegate.markedPushed(id)
+
+    def update(self, event):
+        self.validator.checkEvent(event)
+        return self.delegate.update(event)
+
+    def delete(self, id):
+        return self.delegate.delete(id)
+
+    def deleteByDevice(self, deviceId):
+        return self.delegate.deleteByDevice(deviceId)
+
+    def scrubPushedEvents(self):
+        return self.delegate.scrubPushedEvents()
+
+    def scrubOldEvents(self, age):
+        return self.delegate.scrubOldEvents(age)
+
+
+class ValidatingReadingClient(ReadingClient):
+    """ReadingClient that validates readings before add and update send them."""
+
+    def __init__(self, delegate, validator):
+        self.delegate = delegate
+        self.validator = validator
+
+    def reading(self, id):
+        return self.delegate.reading(id)
+
+    def readings(self, deviceId=None, limit=None):
+        return self.delegate.readings(deviceId, limit)
+
+    def readingsByName(self, name, limit):
+        return self.delegate.readingsByName(name, limit)
+
+    def readingsByNameAndDevice(self, name, device, limit):
+        return self.delegate.readingsByNameAndDevice(name, device, limit)
+
+    def readingsByUoMLabel(self, uomLabel, limit):
+        return self.delegate.readingsByUoMLabel(uomLabel, limit)
+
+    def readingsByLabel(self, label, limit):
+        return self.delegate.readingsByLabel(label, limit)
+
+    def readingsByType(self, type, limit):
+        return self.delegate.readingsByType(type, limit)
+
+    def add(self, reading):
+        self.validator.checkReading(reading)
+        return self.delegate.add(reading)
+
+    def update(self, reading):
+        self.validator.checkReading(reading)
+        return self.delegate.update(reading)
+
+    def delete(self, id):
+        return self.delegate.delete(id)
@@ -0,0 +1,149 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import logging
+import os
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60 * 1000
+
+
+class RetentionPolicy(object):
+    """What to remove: events older than maxAge ms, plus whole devices.
+
+    Old events are scrubbed in slices of sliceAge ms, starting at the oldest
+    event core data holds, so each scrubOldEvents call only removes one
+    slice's worth however far back the data goes.
+    """
+
+    def __init__(self, maxAge, sliceAge=DAY, devices=(), scrubPushed=False):
+        self.maxAge = maxAge
+        self.sliceAge = sliceAge
+        self.devices = list(devices)
+        self.scrubPushed = scrubPushed
+
+
+class RetentionProgress(object):
+
+    def __init__(self, completedSteps, totalSteps, deleted, step=None):
+        self.completedSteps = completedSteps
+        self.totalSteps = totalSteps
+        self.deleted = deleted
+        self.step = step
+
+    @property
+    def done(self):
+        return self.completedSteps >= self.totalSteps
+
+    def __repr__(self):
+        return "RetentionProgress(%d/%d steps, %d deleted)" % (
+            self.completedSteps, self.totalSteps, self.deleted)
+
+
+class RetentionManager(object):
+    """Carries out a RetentionPolicy as a series of small, throttled deletes.
+
+    The policy becomes a plan of scrubOldEvents calls with absolute cutoffs,
+    sliced from the oldest event the client's events() returns, one
+    deleteByDevice per device and optionally scrubPushedEvents. Steps run
+    at no more than opsPerSecond, onProgress is called after each one, and
+    when stateFile is given the plan and the steps done so far are saved
+    after every step so an interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, client, policy, stateFile=None, opsPerSecond=1.0, onProgress=None,
+                 clock=time.time):
+        self.client = client
+        self.policy = policy
+        self.stateFile = stateFile
+        self.opsPerSecond = opsPerSecond
+        self.onProgress = onProgress
+        self._clock = clock
+        self._stopped = threading.Event()
+
+    def plan(self):
+        now = int(self._clock() * 1000)
+        final = now - self.policy.maxAge
+        steps = []
+        # core data returns the earliest events of a range first
+        oldest = self.client.events(0, final, 1)
+        if oldest:
+            cutoff = (oldest[0].created or 0) + self.policy.sliceAge
+            while cutoff < final:
+                steps.append({"op": "scrubOldEvents", "cutoff": cutoff})
+                cutoff += self.policy.sliceAge
+        steps.append({"op": "scrubOldEvents", "cutoff": final})
+        steps.extend({"op": "deleteByDevice", "device": d} for d in self.policy.devices)
+        if self.policy.scrubPushed:
+            steps.append({"op": "scrubPushedEvents"})
+        return steps
+
+    def run(self):
+        """Runs (or resumes) the plan; returns the final RetentionProgress."""
+        self._stopped.clear()
+        state = self._loadState() or {"steps": self.plan(), "completed": 0, "deleted": 0}
+        steps = state["steps"]
+        interval = 1.0 / self.opsPerSecond if self.opsPerSecond else 0.0
+        while state["completed"] < len(steps) and not self._stopped.is_set():
+            step = steps[state["completed"]]
+            startedAt = time.monotonic()
+            state["deleted"] += self._execute(step) or 0
+            state["completed"] += 1
+            self._saveState(state)
+            progress = RetentionProgress(state["completed"], len(steps), state["deleted"], step)
+            LOGGER.debug("retention %s after %s", progress, step)
+            if self.onProgress is not None:
+                self.onProgress(progress)
+            pause = interval - (time.monotonic() - startedAt)
+            if pause > 0 and state["completed"] < len(steps):
+                self._stopped.wait(pause)
+        if state["completed"] >= len(steps):
+            self._clearState()
+        return RetentionProgress(state["completed"], len(steps), state["deleted"])
+
+    def stop(self):
+        """Asks a running run() to return after the step in progress."""
+        self._stopped.set()
+
+    def _execute(self, step):
+        if step["op"] == "scrubOldEvents":
+            return self.client.scrubOldEvents(max(int(self._clock() * 1000) - step["cutoff"], 0))
+        if step["op"] == "deleteByDevice":
+            return self.client.deleteByDevice(step["device"])
+        return self.client.scrubPushedEvents()
+
+    def _loadState(self):
+        if not self.stateFile or not os.path.exists(self.stateFile):
+            return None
+        with open(self.stateFile) as stored:
+            return json.load(stored)
+
+    def _saveState(self, state):
+        if not self.stateFile:
+            return
+        with open(self.stateFile + ".tmp", "w") as out:
+            json.dump(state, out)
+        os.replace(self.stateFile + ".tmp", self.stateFile)
+
+    def _clearState(self):
+        if self.stateFile and os.path.exists(self.stateFile):
+            os.remove(self.stateFile)
@@ -16,62 +16,54 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+import abc
 
-import java.util.List
 
-import javax.ws.rs.Consumes
-import javax.ws.rs.DELETE
-import javax.ws.rs.GET
-import javax.ws.rs.POST
-import javax.ws.rs.PUT
-import javax.ws.rs.Path
-import javax.ws.rs.PathParam
+class ValueDescriptorClient(object):
+    """Client for the core data /valuedescriptor endpoints."""
 
-from domain.common import ValueDescriptor
+    __metaclass__ = abc.ABCMeta
 
-public interface ValueDescriptorClient {
+    @abc.abstractmethod
+    def valueDescriptor(self, id):
+        """GET /{id}"""
 
-    @GET
-    @Path("/{id}")
-    ValueDescriptor valueDescriptor(@PathParam("id") String id)
+    @abc.abstractmethod
+    def valueDescriptors(self):
+        """GET /"""
 
-    @GET
-    List<ValueDescriptor> valueDescriptors()
+    @abc.abstractmethod
+    def valueDescriptorByName(self, name):
+        """GET /name/{name}"""
 
-    @GET
-    @Path("/name/{name:.+}")
-    ValueDescriptor valueDescriptorByName(@PathParam("name") String name)
+    @abc.abstractmethod
+    def valueDescriptorByUOMLabel(self, uomLabel):
+        """GET /uomlabel/{uomLabel}"""
 
-    @GET
-    @Path("/uomlabel/{uomLabel:.+}")
-    List<ValueDescriptor> valueDescriptorByUOMLabel(@PathParam("uomLabel") String uomLabel)
+    @abc.abstractmethod
+    def valueDescriptorByLabel(self, label):
+        """GET /label/{label}"""
 
-    @GET
-    @Path("/label/{label:.+}")
-    List<ValueDescriptor> valueDescriptorByLabel(@PathParam("label") String label)
+    @abc.abstractmethod
+    def valueDescriptorsForDeviceByName(self, name):
+        """GET /devicename/{name}"""
 
-    @GET
-    @Path("/devicename/{name:.+}")
-    List<ValueDescriptor> valueDescriptorsForDeviceByName(@PathParam("name") String name)
+    @abc.abstractmethod
+    def valueDescriptorsForDeviceById(self, id):
+        """GET /deviceid/{id}"""
 
-    @GET
-    @Path("/deviceid/{id}")
-    List<ValueDescriptor> valueDescriptorsForDeviceById(@PathParam("id") String id)
+    @abc.abstractmethod
+    def add(self, valueDescriptor):
+        """POST / with the value descriptor as JSON; returns the new id."""
 
-    @POST
-    @Consumes("application/json")
-    String add(ValueDescriptor valueDescriptor)
+    @abc.abstractmethod
+    def update(self, valueDescriptor):
+        """PUT / with the value descriptor as JSON."""
 
-    @PUT
-    @Consumes("application/json")
-    boolean update(ValueDescriptor valueDescriptor)
+    @abc.abstractmethod
+    def delete(self, id):
+        """DELETE /id/{id}"""
 
-    @DELETE
-    @Path("/id/{id}")
-    boolean delete(@PathParam("id") String id)
-
-    @DELETE
-    @Path("/name/{name:.+}")
-    boolean deleteByName(@PathParam("name") String name)
-
-}
+    @abc.abstractmethod
+    def deleteByName(self, name):
+        """DELETE /name/{name}"""
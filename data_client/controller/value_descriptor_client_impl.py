@@ -16,91 +16,64 @@
 # @version: 1.0.0
 # *******************************************************************************
 
+from urllib.parse import urlparse
 
-import java.net.MalformedURLException
-import java.net.URL
-import java.util.List
-
-from controller import ValueDescriptorClient
-from core.client import ConsulDiscoveryClientTemplate
-from domain.common import ValueDescriptor
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.controller.value_descriptor_client import ValueDescriptorClient
+from data_client.domain.common import ValueDescriptor
+from data_client.instrumentation.metrics import instrumented
+from domain.config import config_reader
 from exception.controller import DataValidationException
-import org.jboss.resteasy.client.jaxrs.ResteasyClient
-import org.jboss.resteasy.client.jaxrs.ResteasyClientBuilder
-import org.jboss.resteasy.client.jaxrs.ResteasyWebTarget
-import org.springframework.beans.factory.annotation.Value
-import org.springframework.stereotype.Component
-
-@Component
-class ValueDescriptorClientImpl extends ConsulDiscoveryClientTemplate
-        implements ValueDescriptorClient {
-
-    @Value("${core.db.valuedescriptor.url}")
-    String url
-
-    @Override
-    public ValueDescriptor valueDescriptor(String id):
-        return getClient().valueDescriptor(id)
-
-    @Override
-    public List<ValueDescriptor> valueDescriptors():
-        return getClient().valueDescriptors()
-
-    @Override
-    public ValueDescriptor valueDescriptorByName(String name):
-        return getClient().valueDescriptorByName(name)
-
-    @Override
-    public List<ValueDescriptor> valueDescriptorByUOMLabel(String uomLabel):
-        return getClient().valueDescriptorByUOMLabel(uomLabel)
-
-    @Override
-    public List<ValueDescriptor> valueDescriptorByLabel(String label):
-        return getClient().valueDescriptorByLabel(label)
-
-    @Override
-    public List<ValueDescriptor> valueDescriptorsForDeviceByName(String name):
-        return getClient().valueDescriptorsForDeviceByName(name)
-
-    @Override
-    public List<ValueDescriptor> valueDescriptorsForDeviceById(String id):
-        return getClient().valueDescriptorsForDeviceById(id)
-
-    @Override
-    public String add(ValueDescriptor valueDescriptor):
-        return getClient().add(valueDescriptor)
-
-    @Override
-    public boolean update(ValueDescriptor valueDescriptor):
-        return getClient().update(valueDescriptor)
-
-    @Override
-    public boolean delete(String id):
-        return getClient().delete(id)
-
-    @Override
-    public boolean deleteByName(String name):
-        return getClient().deleteByName(name)
-
-    private ValueDescriptorClient getClient():
-        ResteasyClient client = new ResteasyClientBuilder().build()
-        ResteasyWebTarget target
-
-        String rootUrl = super.getRootUrl()
-        if (rootUrl is None || rootUrl.isEmpty()):
-            target = client.target(url)
-            target = client.target(rootUrl + super.getPath())
-
-        return target.proxy(ValueDescriptorClient.class)
-
-    @Override
-    protected String extractPath():
-        String result = ""
-        try {
-            URL urlObject = new URL(url)
-            result = urlObject.getPath()
-            throw new DataValidationException(
-                    "the URL is malformed, core.db.valuedescriptor.url: " + url)
-        return result
-
-}
+
+
+@instrumented
+class ValueDescriptorClientImpl(ConsulDiscoveryClientTemplate, ValueDescriptorClient):
+
+    objectPairsHook = staticmethod(ValueDescriptor.fromPairs)
+
+    def __init__(self, url=None):
+        self.url = url or config_reader.read_property("core.db.valuedescriptor.url", "")
+        super(ValueDescriptorClientImpl, self).__init__()
+
+    def valueDescriptor(self, id):
+        return self._getClient().get(id)
+
+    def valueDescriptors(self):
+        return self._getClient().get()
+
+    def valueDescriptorByName(self, name):
+        return self._getClient().get("name", name)
+
+    def valueDescriptorByUOMLabel(self, uomLabel):
+        return self._getClient().get("uomlabel", uomLabel)
+
+    def valueDescriptorByLabel(self, label):
+        return self._getClient().get("label", label)
+
+    def valueDescriptorsForDeviceByName(self, name):
+        return self._getClient().get("devicename", name)
+
+    def valueDescriptorsForDeviceById(self, id):
+        return self._getClient().get("deviceid", id)
+
+    def add(self, valueDescriptor):
+        return self._getClient().post(valueDescriptor)
+
+    def update(self, valueDescriptor):
+        return self._getClient().put(valueDescriptor)
+
+    def delete(self, id):
+        return self._getClient().delete("id", id)
+
+    def deleteByName(self, name):
+        return self._getClient().delete("name", name)
+
+    def _getClient(self):
+        return self.getTarget(self.url, self.objectPairsHook)
+
+    def extractPath(self):
+        urlObject = urlparse(self.url)
+        if not urlObject.scheme or not urlObject.netloc:
+            raise DataValidationException(
+                "the URL is malformed, core.db.valuedescriptor.url: " + self.url)
+        return urlObject.path
@@ -0,0 +1,96 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import operator
+
+
+def _asDict(obj):
+    toDict = getattr(obj, "toDict", None)
+    if toDict is None:
+        raise TypeError("%s is not JSON serializable" % type(obj).__name__)
+    return toDict()
+
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_asDict).encode
+
+
+class BaseObject(object):
+    """Slotted base for core data domain objects.
+
+    Subclasses list their JSON fields in __slots__ and their defaults in
+    DEFAULTS. Objects are built straight from the (key, value) pairs the JSON
+    parser produces, without a per-object dict. toJson() reads every field
+    with one attrgetter call and lets the C encoder write the result.
+    """
+
+    __slots__ = ("id", "created", "modified", "origin")
+    DEFAULTS = {"created": 0, "modified": 0, "origin": 0}
+    FIELDS = __slots__
+
+    def __init_subclass__(cls, **kwargs):
+        super(BaseObject, cls).__init_subclass__(**kwargs)
+        fields = ()
+        for klass in reversed(cls.__mro__):
+            fields += tuple(klass.__dict__.get("__slots__", ()))
+        cls.FIELDS = fields
+        cls._FIELD_SET = frozenset(fields)
+        cls._DEFAULT_ITEMS = tuple((name, cls.DEFAULTS.get(name)) for name in fields)
+        cls._VALUES = operator.attrgetter(*fields) if len(fields) > 1 else \
+            (lambda obj, name=fields[0]: (getattr(obj, name),))
+
+    def __init__(self, **fields):
+        for name, default in self._DEFAULT_ITEMS:
+            setattr(self, name, fields.pop(name, default))
+        if fields:
+            raise TypeError("unknown fields for %s: %s" % (type(self).__name__,
+                                                          ", ".join(sorted(fields))))
+
+    @classmethod
+    def fromPairs(cls, pairs):
+        """Builds an instance from JSON (key, value) pairs, ignoring unknown keys."""
+        obj = cls.__new__(cls)
+        for name, default in cls._DEFAULT_ITEMS:
+            setattr(obj, name, default)
+        fieldSet = cls._FIELD_SET
+        for key, value in pairs:
+            if key in fieldSet:
+                setattr(obj, key, value)
+        return obj
+
+    def toDict(self):
+        """The fields that are not None, in FIELDS order; nested objects are kept as is."""
+        return {name: value for name, value in zip(self.FIELDS, self._VALUES(self))
+                if value is not None}
+
+    def toJson(self):
+        return _encode(self)
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, ", ".join(
+            "%s=%r" % (name, getattr(self, name)) for name in self.FIELDS
+            if getattr(self, name) is not None))
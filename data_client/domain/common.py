@@ -0,0 +1,32 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+
+from data_client.domain.base_object import BaseObject
+
+
+class ValueDescriptor(BaseObject):
+
+    __slots__ = ("name", "description", "min", "max", "defaultValue", "type", "uomLabel",
+                 "formatting", "labels")
+
+
+def decodeValueDescriptors(data):
+    """Decodes a value descriptor or a list of them from JSON text or bytes."""
+    return json.loads(data, object_pairs_hook=ValueDescriptor.fromPairs)
@@ -0,0 +1,72 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+
+from data_client.domain.base_object import BaseObject
+
+
+class Reading(BaseObject):
+
+    __slots__ = ("pushed", "device", "name", "value")
+    DEFAULTS = dict(BaseObject.DEFAULTS, pushed=0)
+
+
+class Event(BaseObject):
+
+    __slots__ = ("pushed", "device", "readings")
+    DEFAULTS = dict(BaseObject.DEFAULTS, pushed=0)
+
+    def __init__(self, **fields):
+        super(Event, self).__init__(**fields)
+        if self.readings is None:
+            self.readings = []
+
+    def addReading(self, reading):
+        self.readings.append(reading)
+
+
+def eventOrReadingFromPairs(pairs):
+    """JSON object hook telling events (they carry readings) from readings.
+
+    Objects that are neither, such as error bodies, are left as plain dicts.
+    """
+    keys = {key for key, _ in pairs}
+    if "readings" in keys:
+        event = Event.fromPairs(pairs)
+        if event.readings is None:
+            event.readings = []
+        else:
+            # anything inside readings is a reading, even without name and value
+            event.readings = [reading if isinstance(reading, Reading)
+                              else Reading.fromPairs(reading.items())
+                              for reading in event.readings]
+        return event
+    if "name" in keys and "value" in keys:
+        return Reading.fromPairs(pairs)
+    return dict(pairs)
+
+
+def decodeEvents(data):
+    """Decodes an event, a list of events or readings from JSON text or bytes."""
+    return json.loads(data, object_pairs_hook=eventOrReadingFromPairs)
+
+
+def decodeReadings(data):
+    """Decodes a reading or a list of readings from JSON text or bytes."""
+    return json.loads(data, object_pairs_hook=Reading.fromPairs)
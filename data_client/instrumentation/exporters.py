@@ -0,0 +1,124 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+_HELP = {
+    "call_seconds": ("histogram", "Latency of core data client calls."),
+    "call_errors_total": ("counter", "Core data client calls that raised."),
+    "request_bytes_total": ("counter", "Request body bytes sent to core data."),
+    "response_bytes_total": ("counter", "Response body bytes received from core data."),
+    "compressed_bytes_total": ("counter", "Compressed body bytes sent or received."),
+    "compression_saved_bytes_total": ("counter", "Body bytes saved by compression."),
+    "retries_total": ("counter", "Requests retried or hedged by the transport."),
+    "pool_wait_seconds": ("histogram", "Time spent waiting for a pooled connection."),
+    "discovery_lookup_seconds": ("histogram", "Time spent resolving core data via discovery."),
+}
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                          for k, v in pairs) + "}"
+
+
+def _bound(value):
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+class PrometheusExporter(object):
+    """Renders a MetricsRegistry in the Prometheus text exposition format."""
+
+    def __init__(self, registry, prefix="core_data_client_"):
+        self.registry = registry
+        self.prefix = prefix
+
+    def render(self):
+        histograms, counters = self.registry.snapshot()
+        lines = []
+        for name in sorted(set(n for n, _ in histograms) | set(n for n, _ in counters)):
+            metric = self.prefix + name
+            kind, description = _HELP.get(name, ("untyped", name))
+            lines.append("# HELP %s %s" % (metric, description))
+            lines.append("# TYPE %s %s" % (metric, kind))
+            for (n, labels), histogram in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for bound, count in histogram.cumulative():
+                    lines.append("%s_bucket%s %d" % (metric, _labels(labels + (("le", _bound(
+                        bound)),)), count))
+                lines.append("%s_sum%s %r" % (metric, _labels(labels), histogram.sum))
+                lines.append("%s_count%s %d" % (metric, _labels(labels), histogram.count))
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append("%s%s %s" % (metric, _labels(labels), value))
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host="0.0.0.0", port=9464):
+        """Serves render() at /metrics on a daemon thread; returns the server."""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="prometheus-exporter",
+                         daemon=True).start()
+        return server
+
+
+class _OpenTelemetrySpan(object):
+
+    def __init__(self, span):
+        self.span = span
+
+    def finish(self, error):
+        if error is not None:
+            self.span.record_exception(error)
+            self.span.set_attribute("error", True)
+        self.span.end()
+
+
+class OpenTelemetrySpanHook(object):
+    """Span hook for an OpenTelemetry tracer (opentelemetry.trace.get_tracer(...)).
+
+    Only the tracer's start_span and the span's set_attribute,
+    record_exception and end are used, so any object with that API works.
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def start(self, name, attributes):
+        return _OpenTelemetrySpan(self.tracer.start_span(name, attributes=attributes))
@@ -0,0 +1,195 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import bisect
+import functools
+import threading
+import time
+import types
+
+# inspect.CO_COROUTINE; inspect itself is slow to import and every client impl imports this
+_CO_COROUTINE = 0x80
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+
+class Histogram(object):
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Yields (upper bound, cumulative count) pairs ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry(object):
+    """Thread-safe histograms and counters keyed by name and label values."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, labels=()):
+        key = (name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, labels=()):
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.histograms), dict(self.counters)
+
+
+class Instrumentation(object):
+    """Collects client metrics and forwards call spans to span hooks.
+
+    Recorded: per-method call latency and errors, request and response
+    bytes, bytes saved by compression, retries, time spent waiting for a
+    pooled connection and time spent resolving the core data URL through
+    discovery. A span hook is any object with start(name, attributes)
+    returning a span that has finish(error); see
+    exporters.OpenTelemetrySpanHook.
+    """
+
+    def __init__(self, registry=None, spanHooks=()):
+        self.registry = registry or MetricsRegistry()
+        self.spanHooks = list(spanHooks)
+
+    def startCall(self, operation):
+        return [hook.start(operation, {"core_data.operation": operation})
+                for hook in self.spanHooks]
+
+    def finishCall(self, operation, seconds, error, spans):
+        labels = (("method", operation),)
+        self.registry.observe("call_seconds", seconds, labels)
+        if error is not None:
+            self.registry.increment("call_errors_total", 1,
+                                    labels + (("error", type(error).__name__),))
+        for span in spans:
+            span.finish(error)
+
+    def recordBytes(self, sent, received):
+        self.registry.increment("request_bytes_total", sent)
+        self.registry.increment("response_bytes_total", received)
+
+    def recordCompression(self, direction, wireBytes, rawBytes):
+        labels = (("direction", direction),)
+        self.registry.increment("compressed_bytes_total", wireBytes, labels)
+        self.registry.increment("compression_saved_bytes_total", rawBytes - wireBytes, labels)
+
+    def recordRetry(self, reason):
+        self.registry.increment("retries_total", 1, (("reason", reason),))
+
+    def recordPoolWait(self, seconds):
+        self.registry.observe("pool_wait_seconds", seconds)
+
+    def recordDiscoveryLookup(self, seconds):
+        self.registry.observe("discovery_lookup_seconds", seconds)
+
+
+_active = None
+
+
+def enable(instrumentation=None):
+    """Turns instrumentation on process-wide and returns the active instance."""
+    global _active
+    _active = instrumentation or Instrumentation()
+    return _active
+
+
+def disable():
+    global _active
+    _active = None
+
+
+def active():
+    """Returns the active Instrumentation, or None when it is off."""
+    return _active
+
+
+def instrumented(cls):
+    """Class decorator timing the client interface methods a class implements.
+
+    Methods declared abstract on a base class (the EventClient,
+    ReadingClient, ... interfaces) are wrapped. While instrumentation is off
+    a call costs one extra function frame and a global lookup.
+    """
+    for name, method in list(vars(cls).items()):
+        if not isinstance(method, types.FunctionType) or not any(
+                getattr(getattr(base, name, None), "__isabstractmethod__", False)
+                for base in cls.__mro__[1:]):
+            continue
+        setattr(cls, name, _wrap(method, "%s.%s" % (cls.__name__, name)))
+    return cls
+
+
+def _wrap(method, operation):
+    if method.__code__.co_flags & _CO_COROUTINE:
+        @functools.wraps(method)
+        async def timedCoroutine(*args, **kwargs):
+            inst = _active
+            if inst is None:
+                return await method(*args, **kwargs)
+            spans = inst.startCall(operation)
+            startedAt = time.perf_counter()
+            try:
+                result = await method(*args, **kwargs)
+            except BaseException as e:
+                inst.finishCall(operation, time.perf_counter() - startedAt, e, spans)
+                raise
+            inst.finishCall(operation, time.perf_counter() - startedAt, None, spans)
+            return result
+        return timedCoroutine
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        inst = _active
+        if inst is None:
+            return method(*args, **kwargs)
+        spans = inst.startCall(operation)
+        startedAt = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException as e:
+            inst.finishCall(operation, time.perf_counter() - startedAt, e, spans)
+            raise
+        inst.finishCall(operation, time.perf_counter() - startedAt, None, spans)
+        return result
+    return timed
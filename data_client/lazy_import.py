@@ -0,0 +1,60 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import importlib
+import threading
+
+_MISSING = object()
+
+
+class OptionalModule(object):
+    """An optional dependency that is imported on first use, not with its caller.
+
+    Calling the instance returns the module, or None when it is not
+    installed; the import is attempted once.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._module = _MISSING
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        module = self._module
+        if module is _MISSING:
+            with self._lock:
+                if self._module is _MISSING:
+                    try:
+                        self._module = importlib.import_module(self.name)
+                    except ImportError:
+                        self._module = None
+                module = self._module
+        return module
+
+
+def moduleGetattr(moduleName, optionalModules):
+    """Builds a module __getattr__ that resolves optional modules by attribute name.
+
+    Keeps `module.numpy is None` style checks working while the import
+    itself is deferred.
+    """
+    def __getattr__(name):
+        if name in optionalModules:
+            return optionalModules[name]()
+        raise AttributeError("module %r has no attribute %r" % (moduleName, name))
+    return __getattr__
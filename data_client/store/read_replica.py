@@ -0,0 +1,329 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import logging
+import sqlite3
+import threading
+import time
+
+from data_client.controller import paged_query
+from data_client.controller.event_client import EventClient
+from data_client.controller.reading_client import ReadingClient
+from data_client.domain.core import Event
+from data_client.domain.core import Reading
+
+LOGGER = logging.getLogger(__name__)
+
+_EVENT_COLUMNS = ("id", "device", "created", "modified", "origin", "pushed")
+_READING_COLUMNS = ("id", "event", "device", "name", "value", "created", "modified", "origin",
+                    "pushed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY, device TEXT, created INTEGER, modified INTEGER, origin INTEGER,
+    pushed INTEGER);
+CREATE TABLE IF NOT EXISTS readings (
+    id TEXT PRIMARY KEY, event TEXT, device TEXT, name TEXT, value TEXT, created INTEGER,
+    modified INTEGER, origin INTEGER, pushed INTEGER);
+CREATE TABLE IF NOT EXISTS replica_state (key TEXT PRIMARY KEY, value INTEGER);
+CREATE INDEX IF NOT EXISTS events_by_created ON events (created);
+CREATE INDEX IF NOT EXISTS readings_by_event ON readings (event);
+CREATE INDEX IF NOT EXISTS readings_by_name ON readings (name, created);
+CREATE INDEX IF NOT EXISTS readings_by_name_device ON readings (name, device, created);
+CREATE INDEX IF NOT EXISTS readings_by_origin ON readings (origin);
+"""
+
+
+def _sqlLimit(limit):
+    # SQLite reads a negative LIMIT as no limit
+    return -1 if limit is None else limit
+
+
+class ReadReplica(object):
+    """Local SQLite mirror of core data events and their readings.
+
+    sync() pages EventClient.events(cursor, now, pageSize) from a created-time
+    cursor kept in the database, starting overlap milliseconds early so late
+    arrivals at the boundary are not missed; rows are upserted by id, and
+    each page is committed with the cursor it reached, so a long catch-up
+    holds one page in memory and resumes where it stopped. Events created
+    before since (milliseconds) are not mirrored, and with maxAge seconds
+    older rows are pruned after every sync. Rows are not refreshed once
+    pulled, so markedPushed and deletes made elsewhere are not seen.
+
+    Core data has no time range query for readings added without an event,
+    so only those added through a ReplicaReadingClient are mirrored (see
+    addReading()).
+
+    A replica is fresh while its last successful sync started no more than
+    maxStaleness seconds ago; ReplicaReadingClient and ReplicaEventClient
+    only answer from it then.
+    """
+
+    def __init__(self, eventClient, path=":memory:", pageSize=500, maxStaleness=5.0, since=0,
+                 overlap=1000, maxAge=None, clock=time.time):
+        self.eventClient = eventClient
+        self.pageSize = pageSize
+        self.maxStaleness = maxStaleness
+        self.overlap = overlap
+        self.maxAge = maxAge
+        self.clock = clock
+        self.syncedAt = None
+        self._lock = threading.RLock()
+        self._syncLock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.since = max(since, self._state("since", since))
+        self._setState("since", self.since)
+
+    def start(self, interval=1.0):
+        """Syncs every interval seconds on a daemon thread."""
+        self._thread = threading.Thread(target=self._run, args=(interval,),
+                                        name="core-data-replica", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self._db.close()
+
+    def cursor(self):
+        return self._state("cursor", self.since)
+
+    def isFresh(self):
+        syncedAt = self.syncedAt
+        return syncedAt is not None and self.clock() - syncedAt <= self.maxStaleness
+
+    def covers(self, start):
+        """Whether rows created from start on are mirrored."""
+        return start is not None and start >= self.since
+
+    def sync(self):
+        """Pulls events created since the cursor; returns how many were stored."""
+        with self._syncLock:
+            startedAt = self.clock()
+            cursor = self.cursor()
+            start = max(self.since, cursor - self.overlap)
+            stored, page = 0, []
+            for event in paged_query.iterEvents(self.eventClient, start,
+                                                int(startedAt * 1000), self.pageSize):
+                page.append(event)
+                if len(page) >= self.pageSize:
+                    cursor = self._storePage(page, cursor)
+                    stored, page = stored + len(page), []
+            self._storePage(page, cursor, startedAt)
+            self.syncedAt = startedAt
+            return stored + len(page)
+
+    def addReading(self, reading, id):
+        """Mirrors a reading core data accepted under id without an event."""
+        created = reading.created or int(self.clock() * 1000)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO readings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (id, None, reading.device, reading.name, reading.value, created,
+                              reading.modified, reading.origin, reading.pushed))
+
+    def readingsByName(self, name, limit):
+        return self._readings("name = ?", (name,), limit)
+
+    def readingsByNameAndDevice(self, name, device, limit):
+        return self._readings("name = ? AND device = ?", (name, device), limit)
+
+    def events(self, start, end, limit):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT %s FROM events WHERE created BETWEEN ? AND ? ORDER BY created, rowid "
+                "LIMIT ?" % ", ".join(_EVENT_COLUMNS), (start, end, _sqlLimit(limit))).fetchall()
+            events = [Event(**dict(zip(_EVENT_COLUMNS, row))) for row in rows]
+            byId = dict((event.id, event) for event in events)
+            for chunk in range(0, len(events), 500):
+                ids = [event.id for event in events[chunk:chunk + 500]]
+                for row in self._db.execute(
+                        "SELECT %s FROM readings WHERE event IN (%s) ORDER BY rowid" % (
+                            ", ".join(_READING_COLUMNS), ", ".join("?" * len(ids))), ids):
+                    byId[row[1]].addReading(Reading.fromPairs(zip(_READING_COLUMNS, row)))
+        return events
+
+    def _readings(self, where, args, limit):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT %s FROM readings WHERE %s ORDER BY created, rowid LIMIT ?" % (
+                    ", ".join(_READING_COLUMNS), where), args + (_sqlLimit(limit),)).fetchall()
+        return [Reading.fromPairs(zip(_READING_COLUMNS, row)) for row in rows]
+
+    def _storePage(self, events, cursor, syncStartedAt=None):
+        """Upserts events and moves the cursor in one transaction; returns the new cursor.
+
+        The last page of a sync passes syncStartedAt, so old rows are pruned.
+        """
+        rows, readings = [], []
+        for event in events:
+            rows.append(tuple(getattr(event, name) for name in _EVENT_COLUMNS))
+            for reading in event.readings or ():
+                readings.append((reading.id, event.id, reading.device, reading.name,
+                                 reading.value, reading.created, reading.modified,
+                                 reading.origin, reading.pushed))
+            cursor = max(cursor, event.created or 0)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?)",
+                                     rows)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO readings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    readings)
+                self._setState("cursor", cursor)
+                if syncStartedAt is not None and self.maxAge is not None:
+                    self._pruneLocked(int((syncStartedAt - self.maxAge) * 1000))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return cursor
+
+    def _pruneLocked(self, cutoff):
+        if cutoff <= self.since:
+            return
+        self._db.execute("DELETE FROM readings WHERE created < ?", (cutoff,))
+        self._db.execute("DELETE FROM events WHERE created < ?", (cutoff,))
+        self.since = cutoff
+        self._setState("since", cutoff)
+
+    def _state(self, key, default):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM replica_state WHERE key = ?",
+                                   (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def _setState(self, key, value):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO replica_state VALUES (?, ?)", (key, value))
+
+    def _run(self, interval):
+        while not self._stopped.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                LOGGER.warning("read replica sync failed: %s", e)
+            self._stopped.wait(interval)
+
+
+class ReplicaReadingClient(ReadingClient):
+    """ReadingClient answering name and name-and-device queries from a fresh replica.
+
+    When the replica is stale the query goes to core data instead. Readings
+    added through add() are mirrored as well, since syncing only sees the
+    ones carried by events; every other call is passed straight to the
+    delegate.
+    """
+
+    def __init__(self, delegate, replica):
+        self.delegate = delegate
+        self.replica = replica
+
+    def readingsByName(self, name, limit):
+        if self.replica.isFresh():
+            return self.replica.readingsByName(name, limit)
+        return self.delegate.readingsByName(name, limit)
+
+    def readingsByNameAndDevice(self, name, device, limit):
+        if self.replica.isFresh():
+            return self.replica.readingsByNameAndDevice(name, device, limit)
+        return self.delegate.readingsByNameAndDevice(name, device, limit)
+
+    def reading(self, id):
+        return self.delegate.reading(id)
+
+    def readings(self, deviceId=None, limit=None):
+        return self.delegate.readings(deviceId, limit)
+
+    def readingsByUoMLabel(self, uomLabel, limit):
+        return self.delegate.readingsByUoMLabel(uomLabel, limit)
+
+    def readingsByLabel(self, label, limit):
+        return self.delegate.readingsByLabel(label, limit)
+
+    def readingsByType(self, type, limit):
+        return self.delegate.readingsByType(type, limit)
+
+    def add(self, reading):
+        id = self.delegate.add(reading)
+        self.replica.addReading(reading, id)
+        return id
+
+    def update(self, reading):
+        return self.delegate.update(reading)
+
+    def delete(self, id):
+        return self.delegate.delete(id)
+
+
+class ReplicaEventClient(EventClient):
+    """EventClient answering events(start, end, limit) from a fresh replica.
+
+    Ranges starting before what the replica mirrors, unbounded queries and
+    every other call go to the delegate.
+    """
+
+    def __init__(self, delegate, replica):
+        self.delegate = delegate
+        self.replica = replica
+
+    def events(self, start=None, end=None, limit=None):
+        if self.replica.covers(start) and self.replica.isFresh():
+            return self.replica.events(start, end, limit)
+        return self.delegate.events(start, end, limit)
+
+    def event(self, id):
+        return self.delegate.event(id)
+
+    def eventsForDevice(self, deviceId, limit):
+        return self.delegate.eventsForDevice(deviceId, limit)
+
+    def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        return self.delegate.readingsForDeviceAndValueDescriptor(deviceId, valuedescriptor,
+                                                                 limit)
+
+    def add(self, event):
+        return self.delegate.add(event)
+
+    def markedPushed(self, id):
+        return self.delegate.markedPushed(id)
+
+    def update(self, event):
+        return self.delegate.update(event)
+
+    def delete(self, id):
+        return self.delegate.delete(id)
+
+    def deleteByDevice(self, deviceId):
+        return self.delegate.deleteByDevice(deviceId)
+
+    def scrubPushedEvents(self):
+        return self.delegate.scrubPushedEvents()
+
+    def scrubOldEvents(self, age):
+        return self.delegate.scrubOldEvents(age)
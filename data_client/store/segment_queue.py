@@ -0,0 +1,263 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+_HEADER = struct.Struct(">II")
+_SEGMENT_FORMAT = "segment-%020d.log"
+_CURSOR_FILE = "cursor"
+_QUARANTINE_DIRECTORY = "quarantine"
+
+
+class QueueFullException(Exception):
+    """Raised when an append would take the queue past its disk budget."""
+
+
+class CorruptRecordException(IOError):
+    """Raised by peek() when the record at the cursor fails its CRC check.
+
+    record holds the raw bytes up to position, where the next record is
+    expected; quarantine() moves the cursor past them.
+    """
+
+    def __init__(self, message, record, position):
+        super(CorruptRecordException, self).__init__(message)
+        self.record = record
+        self.position = position
+
+
+class SegmentQueue(object):
+    """Durable FIFO of byte records kept in append-only segment files.
+
+    Each record is a length, a CRC32 and the payload. Appends go to the newest
+    segment, which rolls over at segmentBytes; they are fsynced in batches,
+    once fsyncBatch records are waiting or fsyncInterval seconds have passed.
+    Reads map segments into memory. The consumer position lives in a cursor
+    file that only moves on commit(), so records survive a crash until they
+    have been handed off. Fully consumed segments are deleted, and appends
+    are refused once maxBytes of segments are on disk.
+    """
+
+    def __init__(self, directory, segmentBytes=16 * 1024 * 1024, maxBytes=1024 * 1024 * 1024,
+                 fsyncBatch=100, fsyncInterval=0.05):
+        self.directory = directory
+        self.segmentBytes = segmentBytes
+        self.maxBytes = maxBytes
+        self.fsyncBatch = fsyncBatch
+        self.fsyncInterval = fsyncInterval
+        self._lock = threading.Condition()
+        self._unsynced = 0
+        self._closed = False
+        self._maps = {}
+        os.makedirs(directory, exist_ok=True)
+        self._segments = sorted(int(name[8:28]) for name in os.listdir(directory)
+                                if name.startswith("segment-") and name.endswith(".log"))
+        self._cursor = self._readCursor()
+        if not self._segments:
+            self._segments.append(self._cursor[0])
+        self._writeId = self._segments[-1]
+        self._writeFd = os.open(self._segmentPath(self._writeId),
+                                os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._writeOffset = self._recover()
+        if self._cursor[0] == self._writeId and self._cursor[1] > self._writeOffset:
+            # records read before a crash were never synced; resume at the durable end
+            self._cursor = (self._writeId, self._writeOffset)
+        self._diskBytes = sum(os.path.getsize(self._segmentPath(s)) for s in self._segments)
+        self._syncer = threading.Thread(target=self._syncLoop, name="segment-queue-fsync",
+                                        daemon=True)
+        self._syncer.start()
+
+    def append(self, payload):
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._closed:
+                raise ValueError("queue is closed")
+            if self._diskBytes + len(record) > self.maxBytes:
+                raise QueueFullException("store-and-forward queue is over %d bytes" %
+                                         self.maxBytes)
+            if self._writeOffset and self._writeOffset + len(record) > self.segmentBytes:
+                self._roll()
+            os.write(self._writeFd, record)
+            self._writeOffset += len(record)
+            self._diskBytes += len(record)
+            self._unsynced += 1
+            if self._unsynced >= self.fsyncBatch:
+                self._syncLocked()
+            else:
+                self._lock.notify_all()
+
+    def peek(self, maxRecords):
+        """Returns up to maxRecords (position, payload) pairs from the cursor on."""
+        records = []
+        with self._lock:
+            segmentId, offset = self._cursor
+            while len(records) < maxRecords:
+                end = self._writeOffset if segmentId == self._writeId else None
+                view = self._map(segmentId)
+                limit = len(view) if end is None else min(end, len(view))
+                if offset + _HEADER.size > limit:
+                    if segmentId == self._writeId:
+                        break
+                    segmentId, offset = self._nextSegment(segmentId), 0
+                    continue
+                length, crc = _HEADER.unpack_from(view, offset)
+                start = offset + _HEADER.size
+                payload = bytes(view[start:start + length])
+                if zlib.crc32(payload) != crc:
+                    if records:
+                        # hand out what precedes it; the next peek reports the corruption
+                        break
+                    end = min(start + length, limit)
+                    raise CorruptRecordException(
+                        "corrupt record in %s at %d" % (self._segmentPath(segmentId), offset),
+                        bytes(view[offset:end]), (segmentId, end))
+                offset = start + length
+                records.append(((segmentId, offset), payload))
+        return records
+
+    def commit(self, position):
+        """Marks everything up to and including the record at position as consumed."""
+        with self._lock:
+            self._cursor = position
+            self._writeCursor()
+            while self._segments[0] < position[0]:
+                self._deleteSegment(self._segments.pop(0))
+
+    def quarantine(self, position, record):
+        """Copies a record that cannot be delivered out of the queue and commits past it.
+
+        position is the one peek() (or CorruptRecordException) gave for the
+        record; returns the path the bytes were written to.
+        """
+        directory = os.path.join(self.directory, _QUARANTINE_DIRECTORY)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "%020d-%020d.bin" % position)
+        with open(path, "wb") as out:
+            out.write(record)
+        self.commit(position)
+        return path
+
+    def isEmpty(self):
+        with self._lock:
+            return self._cursor == (self._writeId, self._writeOffset)
+
+    def diskBytes(self):
+        with self._lock:
+            return self._diskBytes
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._syncLocked()
+            self._lock.notify_all()
+        self._syncer.join()
+        for view in self._maps.values():
+            view.close()
+        self._maps.clear()
+        os.close(self._writeFd)
+
+    def _roll(self):
+        self._syncLocked()
+        os.close(self._writeFd)
+        self._writeId += 1
+        self._segments.append(self._writeId)
+        self._writeFd = os.open(self._segmentPath(self._writeId),
+                                os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._writeOffset = 0
+
+    def _syncLocked(self):
+        if self._unsynced:
+            os.fsync(self._writeFd)
+            self._unsynced = 0
+
+    def _syncLoop(self):
+        with self._lock:
+            while not self._closed:
+                if self._unsynced:
+                    self._lock.wait(self.fsyncInterval)
+                    self._syncLocked()
+                else:
+                    self._lock.wait()
+
+    def _map(self, segmentId):
+        view = self._maps.get(segmentId)
+        size = os.path.getsize(self._segmentPath(segmentId))
+        if view is not None and len(view) >= size:
+            return view
+        if view is not None:
+            view.close()
+        if size == 0:
+            return b""
+        with open(self._segmentPath(segmentId), "rb") as segment:
+            view = mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[segmentId] = view
+        return view
+
+    def _nextSegment(self, segmentId):
+        return self._segments[self._segments.index(segmentId) + 1]
+
+    def _deleteSegment(self, segmentId):
+        view = self._maps.pop(segmentId, None)
+        if view is not None:
+            view.close()
+        path = self._segmentPath(segmentId)
+        self._diskBytes -= os.path.getsize(path)
+        os.remove(path)
+
+    def _recover(self):
+        """Finds the end of the last intact record, dropping a torn tail."""
+        size = os.fstat(self._writeFd).st_size
+        if not size:
+            return 0
+        with open(self._segmentPath(self._writeId), "rb") as segment:
+            data = segment.read()
+        offset = 0
+        while offset + _HEADER.size <= size:
+            length, crc = _HEADER.unpack_from(data, offset)
+            end = offset + _HEADER.size + length
+            if end > size or zlib.crc32(data[offset + _HEADER.size:end]) != crc:
+                break
+            offset = end
+        if offset != size:
+            os.ftruncate(self._writeFd, offset)
+        return offset
+
+    def _readCursor(self):
+        try:
+            with open(os.path.join(self.directory, _CURSOR_FILE)) as cursor:
+                segmentId, offset = cursor.read().split()
+                return int(segmentId), int(offset)
+        except (IOError, ValueError):
+            return (self._segments[0] if self._segments else 0), 0
+
+    def _writeCursor(self):
+        path = os.path.join(self.directory, _CURSOR_FILE)
+        with open(path + ".tmp", "w") as cursor:
+            cursor.write("%d %d" % self._cursor)
+            cursor.flush()
+            os.fsync(cursor.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _segmentPath(self, segmentId):
+        return os.path.join(self.directory, _SEGMENT_FORMAT % segmentId)
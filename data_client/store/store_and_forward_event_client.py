@@ -0,0 +1,210 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import http.client
+import logging
+import threading
+import time
+
+from data_client.controller.event_client import EventClient
+from data_client.domain import core
+from data_client.store.segment_queue import CorruptRecordException
+from data_client.transport.http_session_pool import HttpError
+from data_client.transport.http_session_pool import PoolTimeoutException
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _isRetryable(error):
+    """Whether error means core data is unavailable for now, so the event is kept.
+
+    Connection failures, pool timeouts, 5xx answers (an open circuit breaker
+    included), 408 and 429 qualify; anything else is a problem with the
+    event itself.
+    """
+    if isinstance(error, HttpError):
+        return error.status >= 500 or error.status in (408, 429)
+    return isinstance(error, (OSError, http.client.HTTPException, PoolTimeoutException))
+
+
+class StoreAndForwardEventClient(EventClient):
+    """EventClient whose add() survives core data being unreachable.
+
+    When an add fails because core data cannot be reached or answers with a
+    5xx, 408 or 429, the event is appended to a durable SegmentQueue and
+    add() returns None instead of an id. While a backlog exists every new
+    event is queued behind it, so events reach core data in the order they
+    were added. A background thread pings core data, every pingInterval
+    seconds at first and backing off to maxPingInterval while it stays down,
+    and once it answers drains the backlog in batches of batchSize at no
+    more than drainRate events per second. A queued event that fails for any
+    other reason is quarantined (see SegmentQueue.quarantine) rather than
+    retried. Every other call is passed straight to the delegate.
+    """
+
+    def __init__(self, delegate, pingClient, queue, drainRate=100.0, batchSize=50,
+                 pingInterval=5.0, maxPingInterval=60.0):
+        self.delegate = delegate
+        self.pingClient = pingClient
+        self.queue = queue
+        self.drainRate = drainRate
+        self.batchSize = batchSize
+        self.pingInterval = pingInterval
+        self.maxPingInterval = maxPingInterval
+        self._nextPingInterval = pingInterval
+        self._online = queue.isEmpty()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._drainer = threading.Thread(target=self._drainLoop, name="event-store-and-forward",
+                                         daemon=True)
+        self._drainer.start()
+
+    def add(self, event):
+        with self._condition:
+            if not self._online or not self.queue.isEmpty():
+                self._enqueueLocked(event)
+                return None
+        try:
+            return self.delegate.add(event)
+        except Exception as e:
+            if not _isRetryable(e):
+                raise
+            LOGGER.warning("core data unreachable, queueing events: %s", e)
+            with self._condition:
+                self._online = False
+                self._enqueueLocked(event)
+            return None
+
+    def isOnline(self):
+        with self._condition:
+            return self._online
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._drainer.join()
+        self.queue.close()
+
+    def event(self, id):
+        return self.delegate.event(id)
+
+    def events(self, start=None, end=None, limit=None):
+        return self.delegate.events(start, end, limit)
+
+    def eventsForDevice(self, deviceId, limit):
+        return self.delegate.eventsForDevice(deviceId, limit)
+
+    def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        return self.delegate.readingsForDeviceAndValueDescriptor(deviceId, valuedescriptor,
+                                                                 limit)
+
+    def markedPushed(self, id):
+        return self.delegate.markedPushed(id)
+
+    def update(self, event):
+        return self.delegate.update(event)
+
+    def delete(self, id):
+        return self.delegate.delete(id)
+
+    def deleteByDevice(self, deviceId):
+        return self.delegate.deleteByDevice(deviceId)
+
+    def scrubPushedEvents(self):
+        return self.delegate.scrubPushedEvents()
+
+    def scrubOldEvents(self, age):
+        return self.delegate.scrubOldEvents(age)
+
+    def _enqueueLocked(self, event):
+        if not hasattr(event, "toJson"):
+            # unknown keys are dropped, as they are when core data parses the event
+            event = core.Event.fromPairs(event.items())
+        wasEmpty = self.queue.isEmpty()
+        self.queue.append(event.toJson().encode("utf-8"))
+        if wasEmpty:
+            # the drainer only sleeps indefinitely on an empty queue; waking it for
+            # every event would turn each add into a ping while core data is down
+            self._condition.notify_all()
+
+    def _drainLoop(self):
+        while True:
+            with self._condition:
+                while not self._closed and self.queue.isEmpty():
+                    self._condition.wait()
+                if self._closed:
+                    return
+                online = self._online
+            if not online and not self._ping():
+                self._sleep(self._nextPingInterval)
+                self._nextPingInterval = min(self._nextPingInterval * 2, self.maxPingInterval)
+                continue
+            self._drainBatch()
+
+    def _sleep(self, seconds):
+        """Waits seconds, or until close(); other notifications do not cut it short."""
+        deadline = time.monotonic() + seconds
+        with self._condition:
+            while not self._closed:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return
+                self._condition.wait(left)
+
+    def _ping(self):
+        try:
+            self.pingClient.ping()
+        except Exception as e:
+            LOGGER.debug("core data still unreachable: %s", e)
+            return False
+        with self._condition:
+            self._online = True
+        self._nextPingInterval = self.pingInterval
+        return True
+
+    def _drainBatch(self):
+        interval = 1.0 / self.drainRate if self.drainRate else 0.0
+        try:
+            records = self.queue.peek(self.batchSize)
+        except CorruptRecordException as e:
+            path = self.queue.quarantine(e.position, e.record)
+            LOGGER.error("skipped corrupt queued event, raw bytes kept in %s: %s", path, e)
+            return
+        sent = None
+        for position, payload in records:
+            startedAt = time.monotonic()
+            try:
+                self.delegate.add(core.decodeEvents(payload))
+            except Exception as e:
+                if _isRetryable(e):
+                    LOGGER.warning("core data failed while draining, will retry: %s", e)
+                    with self._condition:
+                        self._online = False
+                    break
+                # retrying cannot help an event core data or a wrapped client refuses
+                path = self.queue.quarantine(position, payload)
+                LOGGER.error("quarantined queued event in %s: %s", path, e)
+                sent = None
+                continue
+            sent = position
+            pause = interval - (time.monotonic() - startedAt)
+            if pause > 0:
+                time.sleep(pause)
+        if sent is not None:
+            self.queue.commit(sent)
@@ -0,0 +1,278 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+from data_client.instrumentation import metrics
+from data_client.transport import compression
+from data_client.transport import json_codec
+from data_client.transport.http_session_pool import IDEMPOTENT_METHODS
+from data_client.transport.http_session_pool import HttpResponse
+from data_client.transport.http_session_pool import RestTarget
+
+
+class _AsyncHostPool(object):
+
+    def __init__(self, maxConnections):
+        self.idle = []
+        self.slots = asyncio.Semaphore(maxConnections)
+
+
+class AsyncHttpSessionPool(object):
+    """asyncio counterpart of HttpSessionPool built on asyncio streams.
+
+    Requests never block a thread; thousands may be pending at once while at
+    most maxConnectionsPerHost of them hold a connection to a given host. A
+    pool must only be used from the event loop that first used it.
+    """
+
+    def __init__(self, maxPoolSize=20, maxConnectionsPerHost=10, idleTimeout=30.0,
+                 timeout=10.0, codec=None, responseCache=None, resilience=None,
+                 compression=None, singleFlight=False):
+        self.codec = codec or json_codec.create()
+        self.responseCache = responseCache
+        self.resilience = resilience
+        self.compression = compression
+        self.singleFlight = None
+        if singleFlight:
+            from data_client.transport.single_flight import AsyncSingleFlight
+            self.singleFlight = AsyncSingleFlight()
+        self.maxPoolSize = maxPoolSize
+        self.maxConnectionsPerHost = maxConnectionsPerHost
+        self.idleTimeout = idleTimeout
+        self.timeout = timeout
+        self._hosts = {}
+        self._idleCount = 0
+
+    def target(self, url, tracker=None, objectPairsHook=None):
+        return AsyncRestTarget(self, url, tracker, objectPairsHook)
+
+    async def request(self, method, url, body=None, headers=None):
+        if self.compression is not None:
+            body, headers = self.compression.requestHeaders(method, body, headers)
+        if self.resilience is None:
+            return await self._request(method, url, body, headers, None)
+        return await self.resilience.callAsync(
+            method, url, lambda timeout: self._request(method, url, body, headers, timeout))
+
+    async def _request(self, method, url, body, headers, timeout):
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        sendHeaders = {"Host": parts.netloc, "Connection": "keep-alive",
+                       "Accept": "application/json, text/plain",
+                       "Content-Length": str(len(body) if body else 0)}
+        if headers:
+            sendHeaders.update(headers)
+        head = "%s %s HTTP/1.1\r\n" % (method, path)
+        head += "".join("%s: %s\r\n" % item for item in sendHeaders.items()) + "\r\n"
+        payload = head.encode("latin-1") + (body or b"")
+
+        hostPool = self._hosts.get(key)
+        if hostPool is None:
+            hostPool = self._hosts[key] = _AsyncHostPool(self.maxConnectionsPerHost)
+        inst = metrics.active()
+        waitStarted = time.perf_counter() if inst is not None else None
+        async with hostPool.slots:
+            if inst is not None:
+                inst.recordPoolWait(time.perf_counter() - waitStarted)
+            return await asyncio.wait_for(self._send(key, hostPool, payload, method),
+                                          timeout or self.timeout)
+
+    def idleConnectionCount(self):
+        return self._idleCount
+
+    async def close(self):
+        for hostPool in self._hosts.values():
+            for _, writer, _ in hostPool.idle:
+                writer.close()
+            hostPool.idle = []
+        self._idleCount = 0
+
+    async def _send(self, key, hostPool, payload, method):
+        reader, writer, reused = await self._checkout(key, hostPool)
+        try:
+            writer.write(payload)
+            await writer.drain()
+            response, keepAlive = await self._readResponse(reader, method)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            # a dropped keep-alive connection is only retried when sending twice is safe;
+            # ones the server had already closed are weeded out by _checkout before writing
+            if not reused or method not in IDEMPOTENT_METHODS:
+                raise
+            inst = metrics.active()
+            if inst is not None:
+                inst.recordRetry("stale-connection")
+            reader, writer = await self._connect(key)
+            try:
+                writer.write(payload)
+                await writer.drain()
+                response, keepAlive = await self._readResponse(reader, method)
+            except BaseException:
+                writer.close()
+                raise
+        except BaseException:
+            writer.close()
+            raise
+        if keepAlive and self._idleCount < self.maxPoolSize:
+            hostPool.idle.append((reader, writer, time.monotonic()))
+            self._idleCount += 1
+        else:
+            writer.close()
+        return response
+
+    async def _checkout(self, key, hostPool):
+        now = time.monotonic()
+        while hostPool.idle:
+            reader, writer, since = hostPool.idle.pop()
+            self._idleCount -= 1
+            if now - since <= self.idleTimeout and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await self._connect(key)
+        return reader, writer, False
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        return await asyncio.open_connection(host, port, ssl=(scheme == "https") or None)
+
+    async def _readResponse(self, reader, method):
+        statusLine = await reader.readuntil(b"\r\n")
+        version, status, reason = (statusLine.decode("latin-1").rstrip("\r\n").split(" ", 2)
+                                   + [""])[:3]
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        status = int(status)
+        decoder = None
+        if self.compression is not None:
+            decoder = self.compression.decoder(headers.get("content-encoding"))
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = self._joinBody(decoder, await self._readChunked(reader, decoder), headers)
+        elif "content-length" in headers:
+            body = self._joinBody(decoder, await self._readLength(
+                reader, int(headers["content-length"]), decoder), headers)
+        else:
+            body = await reader.read()
+            if decoder is not None:
+                body = self._joinBody(decoder, [decoder.feed(body)], headers)
+            return HttpResponse(status, reason, headers, body), False
+
+        connection = headers.get("connection", "").lower()
+        keepAlive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+        return HttpResponse(status, reason, headers, body), keepAlive
+
+    async def _readChunked(self, reader, decoder):
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return chunks
+            chunk = await reader.readexactly(size)
+            chunks.append(decoder.feed(chunk) if decoder is not None else chunk)
+            await reader.readexactly(2)
+
+    async def _readLength(self, reader, length, decoder):
+        if decoder is None:
+            return [await reader.readexactly(length)]
+        chunks = []
+        while length > 0:
+            chunk = await reader.readexactly(min(length, compression.READ_SIZE))
+            chunks.append(decoder.feed(chunk))
+            length -= len(chunk)
+        return chunks
+
+    def _joinBody(self, decoder, chunks, headers):
+        if decoder is None:
+            return b"".join(chunks)
+        return self.compression.decoded(decoder, chunks, headers)
+
+
+class AsyncRestTarget(RestTarget):
+    """RestTarget whose get/post/put/delete return awaitables."""
+
+    async def invoke(self, method, segments, entity=None):
+        uri = self.uri(*segments)
+        flight = self.flight(method)
+        if flight is not None:
+            return await flight.do(
+                (uri, self.objectPairsHook), lambda: self.send(method, uri, entity))
+        return await self.send(method, uri, entity)
+
+    async def send(self, method, uri, entity=None):
+        cached, fresh = self.cached(method, uri)
+        if fresh:
+            return cached.entity(self.objectPairsHook, self.pool.codec)
+        body, headers = self.encode(entity)
+        headers = self.conditional(cached, headers)
+        startedAt = self.tracker.started() if self.tracker is not None else None
+        try:
+            response = await self.pool.request(method, uri, body, headers)
+        except Exception:
+            if self.tracker is not None:
+                self.tracker.finished(startedAt, True)
+            raise
+        except BaseException:
+            # cancelled or interrupted, which says nothing about the instance
+            if self.tracker is not None:
+                self.tracker.abandoned()
+            raise
+        if self.tracker is not None:
+            self.tracker.finished(startedAt, response.status >= 500)
+        inst = metrics.active()
+        if inst is not None:
+            inst.recordBytes(len(body) if body else 0, len(response.body))
+        return self.complete(method, uri, cached, response)
+
+
+_loop_pools = weakref.WeakKeyDictionary()
+_loop_pools_lock = threading.Lock()
+
+
+def getLoopPool(**settings):
+    """Returns the running event loop's pool, creating it with settings on first use.
+
+    Connections belong to the loop that opened them, so each loop gets its
+    own pool; pools of loops that have since closed are dropped.
+    """
+    loop = asyncio.get_running_loop()
+    with _loop_pools_lock:
+        pool = _loop_pools.get(loop)
+        if pool is None:
+            for closed in [other for other in _loop_pools if other.is_closed()]:
+                del _loop_pools[closed]
+            pool = _loop_pools[loop] = AsyncHttpSessionPool(**settings)
+        return pool
@@ -0,0 +1,139 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import gzip
+import threading
+import zlib
+
+from data_client.instrumentation import metrics
+from data_client.lazy_import import OptionalModule
+from data_client.lazy_import import moduleGetattr
+
+_zstandard = OptionalModule("zstandard")
+__getattr__ = moduleGetattr(__name__, {"zstandard": _zstandard})
+
+READ_SIZE = 65536
+
+
+class CompressionStats(object):
+    """Bytes on the wire versus uncompressed bytes, per direction."""
+
+    def __init__(self):
+        self.requestWireBytes = 0
+        self.requestRawBytes = 0
+        self.responseWireBytes = 0
+        self.responseRawBytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, direction, wireBytes, rawBytes):
+        with self._lock:
+            if direction == "request":
+                self.requestWireBytes += wireBytes
+                self.requestRawBytes += rawBytes
+            else:
+                self.responseWireBytes += wireBytes
+                self.responseRawBytes += rawBytes
+
+    def bytesSaved(self):
+        with self._lock:
+            return (self.requestRawBytes - self.requestWireBytes
+                    + self.responseRawBytes - self.responseWireBytes)
+
+
+class StreamDecoder(object):
+    """Decompresses a Content-Encoding one chunk at a time as it is read."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.wireBytes = 0
+        if encoding == "zstd":
+            self._decompressor = _zstandard().ZstdDecompressor().decompressobj()
+        elif encoding == "deflate":
+            self._decompressor = zlib.decompressobj()
+        else:
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._first = True
+
+    def feed(self, chunk):
+        self.wireBytes += len(chunk)
+        if self._first and chunk:
+            self._first = False
+            try:
+                return self._decompressor.decompress(chunk)
+            except zlib.error:
+                if self.encoding != "deflate":
+                    raise
+                # some servers send raw deflate without the zlib wrapper
+                self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decompressor.decompress(chunk)
+
+    def finish(self):
+        flush = getattr(self._decompressor, "flush", None)
+        return flush() if flush is not None else b""
+
+
+class Compression(object):
+    """Content-Encoding negotiation for a session pool.
+
+    Every request advertises the encodings this process can decode (gzip,
+    deflate and zstd when the zstandard package is installed), and compressed
+    responses are decompressed while they are read. POST and PUT bodies of at
+    least requestThreshold bytes are gzip-compressed; 0 leaves them as they
+    are, since not every core data accepts compressed requests.
+    """
+
+    def __init__(self, requestThreshold=0, level=6, encodings=None):
+        self.requestThreshold = requestThreshold
+        self.level = level
+        self.encodings = encodings or (["gzip", "deflate"] +
+                                       (["zstd"] if _zstandard() is not None else []))
+        self.acceptEncoding = ", ".join(self.encodings)
+        self.stats = CompressionStats()
+
+    def requestHeaders(self, method, body, headers):
+        """Returns the body to send and the headers to send with it."""
+        headers = dict(headers or {}, **{"Accept-Encoding": self.acceptEncoding})
+        if not body or not self.requestThreshold or len(body) < self.requestThreshold \
+                or method not in ("POST", "PUT"):
+            return body, headers
+        compressed = gzip.compress(body, self.level)
+        self._record("request", len(compressed), len(body))
+        headers["Content-Encoding"] = "gzip"
+        return compressed, headers
+
+    def decoder(self, encoding):
+        """A StreamDecoder for a response's Content-Encoding, or None if it is identity."""
+        encoding = (encoding or "").strip().lower()
+        if encoding in ("gzip", "x-gzip", "deflate") or (encoding == "zstd" and
+                                                         _zstandard() is not None):
+            return StreamDecoder(encoding)
+        return None
+
+    def decoded(self, decoder, chunks, headers):
+        """Joins the decoded chunks and drops the now stale encoding headers."""
+        body = b"".join(chunks) + decoder.finish()
+        headers.pop("content-encoding", None)
+        headers["content-length"] = str(len(body))
+        self._record("response", decoder.wireBytes, len(body))
+        return body
+
+    def _record(self, direction, wireBytes, rawBytes):
+        self.stats.record(direction, wireBytes, rawBytes)
+        inst = metrics.active()
+        if inst is not None:
+            inst.recordCompression(direction, wireBytes, rawBytes)
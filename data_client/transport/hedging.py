@@ -0,0 +1,183 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import collections
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from data_client.instrumentation import metrics
+from data_client.transport.resilience import RetryBudget
+
+
+class LatencyTracker(object):
+    """Latencies of the last window calls, with a periodically refreshed percentile.
+
+    No percentile is reported before minSamples calls have been seen.
+    """
+
+    def __init__(self, window=1000, minSamples=20, refreshEvery=50):
+        self.minSamples = minSamples
+        self.refreshEvery = refreshEvery
+        self._samples = collections.deque(maxlen=window)
+        self._percentiles = {}
+        self._sinceRefresh = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self._sinceRefresh += 1
+
+    def percentile(self, fraction):
+        with self._lock:
+            if len(self._samples) < self.minSamples:
+                return None
+            if self._sinceRefresh >= self.refreshEvery:
+                self._percentiles = {}
+                self._sinceRefresh = 0
+            if fraction not in self._percentiles:
+                ordered = sorted(self._samples)
+                self._percentiles[fraction] = ordered[min(len(ordered) - 1,
+                                                          int(fraction * len(ordered)))]
+            return self._percentiles[fraction]
+
+
+class Hedger(object):
+    """Sends a duplicate request when the first one is slower than usual.
+
+    call(key, attempts) runs attempts[0]; if it has not answered after the
+    given percentile of recent latencies for key (at least minDelay seconds)
+    and the budget has a token, attempts[1] is started as well and the first
+    successful reply wins. If every attempt fails, the first error is raised.
+    The budget (a resilience.RetryBudget) caps hedges at a fraction of calls.
+
+    Attempts only leave the caller's thread while one of the maxWorkers
+    workers is free: otherwise the primary runs in the caller's thread and
+    the hedge is shed, since one queued behind busy workers could not help.
+    """
+
+    def __init__(self, percentile=0.95, minDelay=0.005, budget=None, maxWorkers=32):
+        self.percentile = percentile
+        self.minDelay = minDelay
+        self.budget = budget or RetryBudget(ratio=0.05, minPerSecond=1.0, capacity=10.0)
+        self.hedged = 0
+        self._trackers = {}
+        self._lock = threading.Lock()
+        self._idleWorkers = threading.BoundedSemaphore(maxWorkers)
+        self._executor = ThreadPoolExecutor(max_workers=maxWorkers,
+                                            thread_name_prefix="core-data-hedge")
+
+    def trackerFor(self, key):
+        with self._lock:
+            tracker = self._trackers.get(key)
+            if tracker is None:
+                tracker = self._trackers[key] = LatencyTracker()
+            return tracker
+
+    def hedgeDelay(self, key):
+        """Seconds to wait before hedging a call for key, or None to not hedge yet."""
+        latency = self.trackerFor(key).percentile(self.percentile)
+        if latency is None:
+            return None
+        return max(self.minDelay, latency)
+
+    def call(self, key, attempts):
+        self.budget.deposit()
+        delay = self.hedgeDelay(key) if len(attempts) > 1 else None
+        if delay is None or not self._idleWorkers.acquire(blocking=False):
+            return self._timed(key, attempts[0])()
+        futures = [self._submit(self._timed(key, attempts[0]))]
+        done, _ = wait(futures, timeout=delay)
+        if not done and self._idleWorkers.acquire(blocking=False):
+            if self._takeHedge():
+                futures.append(self._submit(attempts[1]))
+            else:
+                self._idleWorkers.release()
+        errors = []
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=futures.index):
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                errors.append(future.exception())
+        raise errors[0]
+
+    async def callAsync(self, key, attempts):
+        self.budget.deposit()
+        delay = self.hedgeDelay(key) if len(attempts) > 1 else None
+        if delay is None:
+            return await self._timedAsync(key, attempts[0])
+        tasks = [asyncio.ensure_future(self._timedAsync(key, attempts[0]))]
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done and self._takeHedge():
+            tasks.append(asyncio.ensure_future(attempts[1]()))
+        errors = []
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.index):
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(task.exception())
+        finally:
+            for task in pending:
+                task.cancel()
+        raise errors[0]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def _takeHedge(self):
+        if not self.budget.withdraw():
+            return False
+        self.hedged += 1
+        inst = metrics.active()
+        if inst is not None:
+            inst.recordRetry("hedge")
+        return True
+
+    def _submit(self, attempt):
+        """Runs attempt on a worker taken from _idleWorkers, which it gives back when done."""
+        # the attempt runs in a copy of the caller's context, so deadlines still apply
+        future = self._executor.submit(contextvars.copy_context().run, attempt)
+        future.add_done_callback(lambda _: self._idleWorkers.release())
+        return future
+
+    def _timed(self, key, attempt):
+        # only the first attempt feeds the latency percentile, so hedging cannot skew it
+        def timedAttempt():
+            startedAt = time.perf_counter()
+            result = attempt()
+            self.trackerFor(key).record(time.perf_counter() - startedAt)
+            return result
+        return timedAttempt
+
+    async def _timedAsync(self, key, attempt):
+        startedAt = time.perf_counter()
+        result = await attempt()
+        self.trackerFor(key).record(time.perf_counter() - startedAt)
+        return result
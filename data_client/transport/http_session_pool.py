@@ -0,0 +1,412 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import http.client
+import json
+import select
+import threading
+import time
+from urllib.parse import quote
+from urllib.parse import urlsplit
+
+from data_client.instrumentation import metrics
+from data_client.transport import compression
+from data_client.transport import json_codec
+
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class HttpError(Exception):
+    """Raised when core data answers with a non-2xx status."""
+
+    def __init__(self, status, reason, body=b""):
+        super(HttpError, self).__init__("HTTP %d %s" % (status, reason))
+        self.status = status
+        self.reason = reason
+        self.body = body
+
+
+class NotFoundException(HttpError):
+    """Raised for a 404, mirroring javax.ws.rs.NotFoundException."""
+
+
+class PoolTimeoutException(Exception):
+    """Raised when no connection slot frees up within the pool timeout."""
+
+
+class HttpResponse(object):
+
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def getHeader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+    def entity(self, objectPairsHook=None, codec=None):
+        """Returns the decoded body: JSON when advertised as such, else text."""
+        if not self.body:
+            return None
+        contentType = self.getHeader("content-type", "")
+        if "json" in contentType:
+            if codec is not None:
+                return codec.decode(self.body, objectPairsHook)
+            return json.loads(self.body, object_pairs_hook=objectPairsHook)
+        return self.body.decode("utf-8")
+
+
+class _HostPool(object):
+    """Idle connections and the connection cap for a single scheme://host:port."""
+
+    def __init__(self, maxConnections):
+        self.idle = []
+        self.slots = threading.BoundedSemaphore(maxConnections)
+
+
+class HttpSessionPool(object):
+    """Thread-safe, keep-alive HTTP connection pool shared across clients.
+
+    Connections are kept per host and reused across requests. At most
+    maxConnectionsPerHost requests are in flight to one host, at most
+    maxPoolSize idle connections are retained in total, and idle connections
+    older than idleTimeout seconds are closed instead of being reused.
+    Bodies are encoded and decoded with codec, by default the fastest
+    installed JSON backend. GETs go through responseCache when one is set,
+    every request goes through resilience (see resilience.Resilience) when
+    one is set, and compression negotiates Content-Encoding when set. With
+    singleFlight, identical concurrent GETs share one request and one
+    decoded result (see single_flight.SingleFlight).
+    """
+
+    def __init__(self, maxPoolSize=20, maxConnectionsPerHost=10, idleTimeout=30.0,
+                 timeout=10.0, poolTimeout=None, codec=None, responseCache=None,
+                 resilience=None, compression=None, singleFlight=False):
+        self.codec = codec or json_codec.create()
+        self.responseCache = responseCache
+        self.resilience = resilience
+        self.compression = compression
+        self.singleFlight = None
+        if singleFlight:
+            from data_client.transport.single_flight import SingleFlight
+            self.singleFlight = SingleFlight()
+        self.maxPoolSize = maxPoolSize
+        self.maxConnectionsPerHost = maxConnectionsPerHost
+        self.idleTimeout = idleTimeout
+        self.timeout = timeout
+        self.poolTimeout = poolTimeout
+        self._hosts = {}
+        self._idleCount = 0
+        self._lock = threading.Lock()
+
+    def target(self, url, tracker=None, objectPairsHook=None):
+        return RestTarget(self, url, tracker, objectPairsHook)
+
+    def request(self, method, url, body=None, headers=None):
+        if self.compression is not None:
+            body, headers = self.compression.requestHeaders(method, body, headers)
+        if self.resilience is None:
+            return self._request(method, url, body, headers, None)
+        return self.resilience.call(
+            method, url, lambda timeout: self._request(method, url, body, headers, timeout))
+
+    def _request(self, method, url, body, headers, timeout):
+        parts = urlsplit(url)
+        key = (parts.scheme or "http", parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        sendHeaders = {"Connection": "keep-alive", "Accept": "application/json, text/plain"}
+        if headers:
+            sendHeaders.update(headers)
+
+        hostPool = self._hostPool(key)
+        inst = metrics.active()
+        waitStarted = time.perf_counter() if inst is not None else None
+        waitLimit = self.poolTimeout
+        if timeout is not None:
+            waitLimit = timeout if waitLimit is None else min(waitLimit, timeout)
+        if not hostPool.slots.acquire(timeout=waitLimit):
+            raise PoolTimeoutException("no connection to %s:%s available" % key[1:])
+        if inst is not None:
+            inst.recordPoolWait(time.perf_counter() - waitStarted)
+        try:
+            return self._send(key, hostPool, method, path, body, sendHeaders,
+                              timeout or self.timeout)
+        finally:
+            hostPool.slots.release()
+
+    def evictIdleConnections(self):
+        """Closes every idle connection that exceeded the idle timeout."""
+        now = time.monotonic()
+        with self._lock:
+            for hostPool in self._hosts.values():
+                self._evictLocked(hostPool, now)
+
+    def idleConnectionCount(self):
+        with self._lock:
+            return self._idleCount
+
+    def close(self):
+        with self._lock:
+            for hostPool in self._hosts.values():
+                for conn, _ in hostPool.idle:
+                    conn.close()
+                hostPool.idle = []
+            self._idleCount = 0
+
+    def _hostPool(self, key):
+        with self._lock:
+            hostPool = self._hosts.get(key)
+            if hostPool is None:
+                hostPool = _HostPool(self.maxConnectionsPerHost)
+                self._hosts[key] = hostPool
+            return hostPool
+
+    def _send(self, key, hostPool, method, path, body, headers, timeout):
+        conn, reused = self._checkout(key, hostPool)
+        try:
+            raw = _exchange(conn, method, path, body, headers, timeout)
+        except _STALE_ERRORS:
+            conn.close()
+            # a dropped keep-alive connection is only retried when sending twice is safe;
+            # ones the server had already closed are weeded out by _checkout before writing
+            if not reused or method not in IDEMPOTENT_METHODS:
+                raise
+            inst = metrics.active()
+            if inst is not None:
+                inst.recordRetry("stale-connection")
+            conn = self._connect(key)
+            try:
+                raw = _exchange(conn, method, path, body, headers, timeout)
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+        responseHeaders = dict((k.lower(), v) for k, v in raw.getheaders())
+        try:
+            payload = self._readBody(raw, responseHeaders)
+        except Exception:
+            conn.close()
+            raise
+        response = HttpResponse(raw.status, raw.reason, responseHeaders, payload)
+        if raw.will_close:
+            conn.close()
+        else:
+            self._checkin(hostPool, conn)
+        return response
+
+    def _readBody(self, raw, headers):
+        decoder = None
+        if self.compression is not None:
+            decoder = self.compression.decoder(headers.get("content-encoding"))
+        if decoder is None:
+            return raw.read()
+        chunks = []
+        chunk = raw.read(compression.READ_SIZE)
+        while chunk:
+            chunks.append(decoder.feed(chunk))
+            chunk = raw.read(compression.READ_SIZE)
+        return self.compression.decoded(decoder, chunks, headers)
+
+    def _checkout(self, key, hostPool):
+        now = time.monotonic()
+        with self._lock:
+            self._evictLocked(hostPool, now)
+            while hostPool.idle:
+                conn, _ = hostPool.idle.pop()
+                self._idleCount -= 1
+                if not _isClosedByPeer(conn):
+                    return conn, True
+                conn.close()
+        return self._connect(key), False
+
+    def _checkin(self, hostPool, conn):
+        with self._lock:
+            if self._idleCount >= self.maxPoolSize:
+                conn.close()
+                return
+            hostPool.idle.append((conn, time.monotonic()))
+            self._idleCount += 1
+
+    def _evictLocked(self, hostPool, now):
+        fresh = []
+        for conn, since in hostPool.idle:
+            if now - since > self.idleTimeout:
+                conn.close()
+                self._idleCount -= 1
+            else:
+                fresh.append((conn, since))
+        hostPool.idle = fresh
+
+    def _connect(self, key):
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+
+def _exchange(conn, method, path, body, headers, timeout):
+    _setTimeout(conn, timeout)
+    conn.request(method, path, body=body, headers=headers)
+    return conn.getresponse()
+
+
+def _isClosedByPeer(conn):
+    # an idle connection has nothing to read unless the server closed it (EOF)
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _setTimeout(conn, timeout):
+    # reused connections keep their socket, so a per-request timeout goes on both
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+
+
+class RestTarget(object):
+    """A base URL bound to a session pool; path segments are URL-quoted.
+
+    An optional tracker is told when each request starts and whether it
+    failed, which is how load balancers observe the instances they pick.
+    objectPairsHook turns decoded JSON objects into domain objects. Bodies
+    go through the pool's codec.
+    """
+
+    JSON_TYPE = "application/json"
+
+    def __init__(self, pool, url, tracker=None, objectPairsHook=None):
+        self.pool = pool
+        self.url = url.rstrip("/")
+        self.tracker = tracker
+        self.objectPairsHook = objectPairsHook
+
+    def uri(self, *segments):
+        if not segments:
+            return self.url
+        return self.url + "/" + "/".join(quote(str(s), safe="") for s in segments)
+
+    def get(self, *segments):
+        return self.invoke("GET", segments)
+
+    def post(self, entity, *segments):
+        return self.invoke("POST", segments, entity)
+
+    def put(self, entity, *segments):
+        return self.invoke("PUT", segments, entity)
+
+    def delete(self, *segments):
+        return self.invoke("DELETE", segments)
+
+    def invoke(self, method, segments, entity=None):
+        uri = self.uri(*segments)
+        flight = self.flight(method)
+        if flight is not None:
+            return flight.do((uri, self.objectPairsHook), lambda: self.send(method, uri, entity))
+        return self.send(method, uri, entity)
+
+    def flight(self, method):
+        flight = self.pool.singleFlight
+        if method != "GET" or flight is None or not flight.shareable(self.objectPairsHook):
+            return None
+        return flight
+
+    def send(self, method, uri, entity=None):
+        cached, fresh = self.cached(method, uri)
+        if fresh:
+            return cached.entity(self.objectPairsHook, self.pool.codec)
+        body, headers = self.encode(entity)
+        headers = self.conditional(cached, headers)
+        startedAt = self.tracker.started() if self.tracker is not None else None
+        try:
+            response = self.pool.request(method, uri, body, headers)
+        except Exception:
+            if self.tracker is not None:
+                self.tracker.finished(startedAt, True)
+            raise
+        except BaseException:
+            # cancelled or interrupted, which says nothing about the instance
+            if self.tracker is not None:
+                self.tracker.abandoned()
+            raise
+        if self.tracker is not None:
+            self.tracker.finished(startedAt, response.status >= 500)
+        inst = metrics.active()
+        if inst is not None:
+            inst.recordBytes(len(body) if body else 0, len(response.body))
+        return self.complete(method, uri, cached, response)
+
+    def cached(self, method, uri):
+        if method != "GET" or self.pool.responseCache is None:
+            return None, False
+        return self.pool.responseCache.lookup(uri)
+
+    def conditional(self, cached, headers):
+        if cached is None:
+            return headers
+        return self.pool.responseCache.conditionalHeaders(cached, headers)
+
+    def complete(self, method, uri, cached, response):
+        cache = self.pool.responseCache
+        if method != "GET" and cache is not None:
+            # a write may change anything listed under this target
+            cache.invalidate(self.url)
+        if cached is not None and response.status == 304:
+            return cache.revalidated(uri, cached).entity(self.objectPairsHook, self.pool.codec)
+        if method == "GET" and cache is not None and response.status == 200:
+            entry = cache.store(uri, response)
+            if entry is not None:
+                return entry.entity(self.objectPairsHook, self.pool.codec)
+        return self.decode(response)
+
+    def encode(self, entity):
+        if entity is None:
+            return None, None
+        return self.pool.codec.encode(entity), {"Content-Type": self.JSON_TYPE}
+
+    def decode(self, response):
+        if response.status == 404:
+            raise NotFoundException(response.status, response.reason, response.body)
+        if response.status >= 400:
+            raise HttpError(response.status, response.reason, response.body)
+        return response.entity(self.objectPairsHook, self.pool.codec)
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def getSharedPool(**settings):
+    """Returns the process-wide pool, creating it with settings on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = HttpSessionPool(**settings)
+        return _shared_pool
@@ -0,0 +1,219 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import abc
+import contextlib
+import contextvars
+import json
+import threading
+import time
+import types
+
+from data_client.lazy_import import OptionalModule
+from data_client.lazy_import import moduleGetattr
+
+_orjson = OptionalModule("orjson")
+__getattr__ = moduleGetattr(__name__, {"orjson": _orjson})
+
+_preEncoded = contextvars.ContextVar("json_codec_pre_encoded", default=None)
+
+
+@contextlib.contextmanager
+def preEncoded(entity, body):
+    """Within the block, every codec returns body for entity instead of encoding it again."""
+    token = _preEncoded.set((entity, body))
+    try:
+        yield
+    finally:
+        _preEncoded.reset(token)
+
+
+class CodecStats(object):
+    """Running encode/decode counts, seconds and bytes for one codec."""
+
+    def __init__(self):
+        self.encodeCount = 0
+        self.encodeSeconds = 0.0
+        self.encodeBytes = 0
+        self.decodeCount = 0
+        self.decodeSeconds = 0.0
+        self.decodeBytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, operation, seconds, size):
+        with self._lock:
+            if operation == "encode":
+                self.encodeCount += 1
+                self.encodeSeconds += seconds
+                self.encodeBytes += size
+            else:
+                self.decodeCount += 1
+                self.decodeSeconds += seconds
+                self.decodeBytes += size
+
+
+class JsonCodec(abc.ABC):
+    """Turns entities into request bodies and response bodies into entities.
+
+    Every call is timed; totals accumulate in stats and, when set, listener
+    is called as listener(operation, seconds, size) once per request body so
+    callers can report per-request timings.
+    """
+
+    name = None
+
+    def __init__(self, listener=None):
+        self.listener = listener
+        self.stats = CodecStats()
+
+    def encode(self, entity):
+        pre = _preEncoded.get()
+        if pre is not None and pre[0] is entity:
+            return pre[1]
+        startedAt = time.perf_counter()
+        body = self.dumps(entity)
+        self._record("encode", time.perf_counter() - startedAt, len(body))
+        return body
+
+    def decode(self, body, objectPairsHook=None):
+        startedAt = time.perf_counter()
+        entity = self.loads(body, objectPairsHook)
+        self._record("decode", time.perf_counter() - startedAt, len(body))
+        return entity
+
+    @abc.abstractmethod
+    def dumps(self, entity):
+        """Returns entity as UTF-8 JSON bytes."""
+
+    @abc.abstractmethod
+    def loads(self, body, objectPairsHook):
+        """Parses body, passing every object's pairs to objectPairsHook when given."""
+
+    def _record(self, operation, seconds, size):
+        self.stats.record(operation, seconds, size)
+        if self.listener is not None:
+            self.listener(operation, seconds, size)
+
+
+class StdlibJsonCodec(JsonCodec):
+
+    name = "stdlib"
+
+    def dumps(self, entity):
+        if hasattr(entity, "toJson"):
+            return entity.toJson().encode("utf-8")
+        return json.dumps(entity, separators=(",", ":"), default=_fieldsOf).encode("utf-8")
+
+    def loads(self, body, objectPairsHook):
+        # json.loads detects the encoding of bytes itself, so no decoded copy is made
+        return json.loads(body, object_pairs_hook=objectPairsHook)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson backend; parses bytes and memoryviews in place and emits bytes.
+
+    orjson has no object hook, so when one is given the parsed tree is handed
+    to it bottom-up, the same order the stdlib parser uses.
+    """
+
+    name = "orjson"
+
+    def __init__(self, listener=None):
+        super(OrjsonCodec, self).__init__(listener)
+        self._orjson = _orjson()
+
+    def dumps(self, entity):
+        return self._orjson.dumps(entity, default=_fieldsOf)
+
+    def loads(self, body, objectPairsHook):
+        entity = self._orjson.loads(body)
+        if objectPairsHook is None:
+            return entity
+        return _applyHook(entity, objectPairsHook)
+
+
+class AutoJsonCodec(JsonCodec):
+    """orjson for encoding and hook-less decoding, the stdlib parser with a hook.
+
+    With a hook orjson has to walk the parsed tree again in Python, which
+    makes it slower than the stdlib parser calling the hook as it goes.
+    """
+
+    name = "auto"
+
+    def __init__(self, listener=None):
+        super(AutoJsonCodec, self).__init__(listener)
+        self.fast = OrjsonCodec()
+        self.hooked = StdlibJsonCodec()
+
+    def backendFor(self, objectPairsHook):
+        return self.fast if objectPairsHook is None else self.hooked
+
+    def dumps(self, entity):
+        return self.fast.dumps(entity)
+
+    def loads(self, body, objectPairsHook):
+        return self.backendFor(objectPairsHook).loads(body, objectPairsHook)
+
+
+def isReusableHook(objectPairsHook):
+    """Whether one decoded result may be handed to every caller using this hook.
+
+    Hooks bound to an instance, such as a columnar builder's, have side
+    effects per call, so each caller has to run its own.
+    """
+    if isinstance(objectPairsHook, types.MethodType):
+        return isinstance(objectPairsHook.__self__, type)
+    return True
+
+
+def _fieldsOf(obj):
+    toDict = getattr(obj, "toDict", None)
+    if toDict is None:
+        raise TypeError("%s is not JSON serializable" % type(obj).__name__)
+    return toDict()
+
+
+def _applyHook(value, hook):
+    if isinstance(value, dict):
+        return hook([(key, _applyHook(item, hook)) for key, item in value.items()])
+    if isinstance(value, list):
+        return [_applyHook(item, hook) for item in value]
+    return value
+
+
+CODECS = {
+    "stdlib": StdlibJsonCodec,
+    "orjson": OrjsonCodec,
+    "auto": AutoJsonCodec,
+}
+
+
+def create(name="auto", listener=None):
+    """Creates the named codec.
+
+    "auto" uses orjson where it is faster (see AutoJsonCodec) when it is
+    installed, and the stdlib otherwise.
+    """
+    if name == "auto" and _orjson() is None:
+        name = "stdlib"
+    if name not in CODECS:
+        raise ValueError("unknown JSON codec: %s" % name)
+    if name in ("orjson", "auto") and _orjson() is None:
+        raise ImportError("the orjson codec needs the orjson package")
+    return CODECS[name](listener)
@@ -0,0 +1,405 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import contextlib
+import contextvars
+import http.client
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from data_client.instrumentation import metrics
+from data_client.transport.http_session_pool import IDEMPOTENT_METHODS
+from data_client.transport.http_session_pool import HttpError
+from data_client.transport.http_session_pool import PoolTimeoutException
+
+LOGGER = logging.getLogger(__name__)
+
+_deadline = contextvars.ContextVar("core_data_deadline", default=None)
+_probing = contextvars.ContextVar("core_data_probing", default=False)
+
+
+class CircuitOpenException(HttpError):
+    """Raised without contacting core data while an endpoint's breaker is open.
+
+    It carries status 503 so callers treat it like an unavailable core data.
+    """
+
+    def __init__(self, endpoint):
+        super(CircuitOpenException, self).__init__(503, "circuit open for %s" % endpoint)
+        self.endpoint = endpoint
+
+
+class DeadlineExceededException(Exception):
+    """Raised when the enclosing deadline() expires before a call can complete."""
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """Bounds every core data call made inside the block, retries included.
+
+    Deadlines nest: an inner block can only shorten the outer one. They
+    follow the context into coroutines and into fan-out worker threads.
+    """
+    expiresAt = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expiresAt if current is None else min(current, expiresAt))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Seconds left before the current deadline, or None without one."""
+    expiresAt = _deadline.get()
+    if expiresAt is None:
+        return None
+    return expiresAt - time.monotonic()
+
+
+class RetryPolicy(object):
+    """Exponential backoff with full jitter for idempotent requests.
+
+    Attempt n (from 1) waits a random time up to min(maxDelay,
+    baseDelay * 2 ** (n - 1)), or the server's Retry-After if that is longer.
+    Connection errors and the retryOn statuses are retried.
+    """
+
+    def __init__(self, maxAttempts=3, baseDelay=0.05, maxDelay=2.0,
+                 retryOn=(429, 502, 503, 504), rand=None):
+        self.maxAttempts = maxAttempts
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        self.retryOn = frozenset(retryOn)
+        self.random = rand or random.Random()
+
+    def delay(self, attempt, response=None):
+        delay = self.random.uniform(0, min(self.maxDelay, self.baseDelay * 2 ** (attempt - 1)))
+        retryAfter = response.getHeader("retry-after") if response is not None else None
+        if retryAfter and retryAfter.isdigit():
+            delay = max(delay, min(self.maxDelay, float(retryAfter)))
+        return delay
+
+
+class RetryBudget(object):
+    """Token bucket keeping retries to a fraction of the request rate.
+
+    Every request deposits ratio tokens and minPerSecond tokens accrue over
+    time; a retry spends one. Once the bucket is empty, failures are returned
+    to the caller instead of multiplying the load on an overloaded core data.
+    """
+
+    def __init__(self, ratio=0.2, minPerSecond=5.0, capacity=50.0, clock=time.monotonic):
+        self.ratio = ratio
+        self.minPerSecond = minPerSecond
+        self.capacity = capacity
+        self.clock = clock
+        self._balance = min(capacity, minPerSecond)
+        self._updatedAt = clock()
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._refillLocked()
+            self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            self._refillLocked()
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+    def _refillLocked(self):
+        now = self.clock()
+        self._balance = min(self.capacity,
+                            self._balance + (now - self._updatedAt) * self.minPerSecond)
+        self._updatedAt = now
+
+
+class CircuitBreaker(object):
+    """Closed, open or half-open state of one core data endpoint.
+
+    failureThreshold consecutive failures open the breaker; after
+    resetTimeout seconds one probe request is let through and its outcome
+    closes or re-opens it. A probe that ends without an outcome, such as a
+    cancelled one, is released so the next call can probe instead. trip()
+    and reset() let a health check force it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failureThreshold=5, resetTimeout=30.0, clock=time.monotonic):
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.clock = clock
+        self.failures = 0
+        self._openedAt = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def state(self):
+        with self._lock:
+            return self._stateLocked()
+
+    def allow(self):
+        with self._lock:
+            state = self._stateLocked()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def recordSuccess(self):
+        with self._lock:
+            self.failures = 0
+            self._openedAt = None
+            self._probing = False
+
+    def recordFailure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failureThreshold:
+                self._openedAt = self.clock()
+            self._probing = False
+
+    def release(self):
+        """Gives up the probe slot without recording an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def trip(self):
+        with self._lock:
+            self._openedAt = self.clock()
+            self._probing = False
+
+    def reset(self):
+        self.recordSuccess()
+
+    def _stateLocked(self):
+        if self._openedAt is None:
+            return self.CLOSED
+        if self.clock() - self._openedAt >= self.resetTimeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+
+def _endpoint(url):
+    parts = urlsplit(url)
+    return "%s://%s" % (parts.scheme or "http", parts.netloc)
+
+
+_RETRYABLE_ERRORS = (OSError, http.client.HTTPException, PoolTimeoutException,
+                     asyncio.TimeoutError, asyncio.IncompleteReadError)
+
+
+class Resilience(object):
+    """Retries, circuit breaking and deadlines around a session pool's requests.
+
+    Pools hand every request to call() (or callAsync()) as a send(timeout)
+    callable, where a timeout of None means the pool's own. One
+    CircuitBreaker is kept per scheme://host:port. Only IDEMPOTENT_METHODS
+    are retried, and only while the RetryBudget allows.
+    Each attempt's timeout is clamped to the remaining deadline().
+    reportHealth() lets a HealthMonitor open or close a breaker from ping
+    results.
+    """
+
+    def __init__(self, retryPolicy=None, retryBudget=None, failureThreshold=5,
+                 resetTimeout=30.0, clock=time.monotonic, sleep=time.sleep):
+        self.retryPolicy = retryPolicy or RetryPolicy()
+        self.retryBudget = retryBudget or RetryBudget(clock=clock)
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.clock = clock
+        self.sleep = sleep
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breakerFor(self, url):
+        endpoint = _endpoint(url)
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    self.failureThreshold, self.resetTimeout, self.clock)
+            return breaker
+
+    def reportHealth(self, url, healthy):
+        breaker = self.breakerFor(url)
+        if healthy:
+            breaker.reset()
+        elif breaker.state() == CircuitBreaker.CLOSED:
+            LOGGER.warning("core data at %s failed its health check", _endpoint(url))
+            breaker.trip()
+
+    @contextlib.contextmanager
+    def probing(self):
+        """Lets health checks made inside the block bypass open breakers."""
+        token = _probing.set(True)
+        try:
+            yield
+        finally:
+            _probing.reset(token)
+
+    def call(self, method, url, send):
+        breaker = self.breakerFor(url)
+        self.retryBudget.deposit()
+        attempt = 1
+        while True:
+            attemptTimeout = self._admit(breaker, url)
+            try:
+                response, error = send(attemptTimeout), None
+            except _RETRYABLE_ERRORS as e:
+                response, error = None, e
+            except Exception:
+                breaker.recordFailure()
+                raise
+            except BaseException:
+                # cancelled or interrupted: no outcome, but the probe slot must be freed
+                breaker.release()
+                raise
+            delay = self._afterAttempt(breaker, method, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            self.sleep(delay)
+            attempt += 1
+
+    async def callAsync(self, method, url, send):
+        breaker = self.breakerFor(url)
+        self.retryBudget.deposit()
+        attempt = 1
+        while True:
+            attemptTimeout = self._admit(breaker, url)
+            try:
+                response, error = await send(attemptTimeout), None
+            except _RETRYABLE_ERRORS as e:
+                response, error = None, e
+            except Exception:
+                breaker.recordFailure()
+                raise
+            except BaseException:
+                # cancelled or interrupted: no outcome, but the probe slot must be freed
+                breaker.release()
+                raise
+            delay = self._afterAttempt(breaker, method, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _admit(self, breaker, url):
+        """Returns the attempt's timeout: what is left of the deadline, or None."""
+        left = remaining()
+        if left is not None and left <= 0:
+            raise DeadlineExceededException("deadline expired before calling " + url)
+        if not _probing.get() and not breaker.allow():
+            raise CircuitOpenException(_endpoint(url))
+        return left
+
+    def _afterAttempt(self, breaker, method, attempt, response, error):
+        """Records the outcome; returns the backoff before a retry, or None to stop."""
+        failed = error is not None or response.status >= 500
+        if failed:
+            breaker.recordFailure()
+        else:
+            breaker.recordSuccess()
+        if error is None and response.status not in self.retryPolicy.retryOn:
+            return None
+        if method not in IDEMPOTENT_METHODS or attempt >= self.retryPolicy.maxAttempts:
+            return None
+        delay = self.retryPolicy.delay(attempt, response)
+        left = remaining()
+        if left is not None and delay >= left:
+            return None
+        if not self.retryBudget.withdraw():
+            LOGGER.debug("retry budget exhausted, not retrying %s", method)
+            return None
+        inst = metrics.active()
+        if inst is not None:
+            inst.recordRetry(type(error).__name__ if error is not None
+                             else "http-%d" % response.status)
+        return delay
+
+
+class HealthMonitor(object):
+    """Pings core data every interval seconds and reports it to a Resilience.
+
+    A failed PingCoreDataClient.ping() trips the breaker for the ping URL's
+    endpoint so callers fail fast; a successful one closes it again without
+    waiting for the reset timeout. When requests are spread over several
+    instances, targets returns a ping RestTarget per instance and each one's
+    breaker is driven by its own ping; pingClient is only used while targets
+    returns none.
+    """
+
+    def __init__(self, pingClient, resilience, url=None, interval=5.0, targets=None):
+        self.pingClient = pingClient
+        self.resilience = resilience
+        self.url = url or pingClient.url
+        self.interval = interval
+        self.targets = targets
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="core-data-health",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def check(self):
+        """Pings every target (or pingClient); returns whether all of them answered."""
+        targets = self.targets() if self.targets is not None else None
+        if not targets:
+            return self._check(self.url, self.pingClient.ping)
+        return all([self._check(target.url, target.get) for target in targets])
+
+    def _check(self, url, ping):
+        try:
+            with self.resilience.probing():
+                ping()
+            healthy = True
+        except Exception as e:
+            LOGGER.debug("core data ping to %s failed: %s", url, e)
+            healthy = False
+        self.resilience.reportHealth(url, healthy)
+        return healthy
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.check()
+            self._stopped.wait(self.interval)
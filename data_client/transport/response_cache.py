@@ -0,0 +1,286 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import collections
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from data_client.transport.http_session_pool import HttpResponse
+
+
+class CachePolicy(object):
+    """How responses for matching URLs are cached.
+
+    maxAge is how many seconds a stored response is served without asking
+    core data at all; after that it is revalidated with If-None-Match or
+    If-Modified-Since. Responses without an ETag or Last-Modified header are
+    only kept when maxAge is positive. cacheable=False turns caching off.
+    """
+
+    def __init__(self, maxAge=0.0, cacheable=True):
+        self.maxAge = maxAge
+        self.cacheable = cacheable
+
+
+def parsePolicies(spec):
+    """Turns a configured policy list into (regex, CachePolicy) pairs for ResponseCache.
+
+    spec is either a mapping of regex to max age or a string of
+    "regex=seconds" items separated by semicolons. A max age of "off" turns
+    caching off for the matching URLs. Core data sends no ETag or
+    Last-Modified, so a max age is what lets its responses be cached at all.
+    """
+    if not spec:
+        return []
+    if isinstance(spec, dict):
+        items = list(spec.items())
+    else:
+        items = [item.strip().rpartition("=")[::2] for item in spec.split(";") if item.strip()]
+    policies = []
+    for pattern, maxAge in items:
+        pattern = pattern.strip()
+        if not pattern:
+            raise ValueError("response cache policy without a URL pattern: %r" % spec)
+        if str(maxAge).strip().lower() == "off":
+            policies.append((pattern, CachePolicy(cacheable=False)))
+        else:
+            policies.append((pattern, CachePolicy(maxAge=float(maxAge))))
+    return policies
+
+
+class CacheEntry(object):
+
+    def __init__(self, response, storedAt):
+        self.response = response
+        self.storedAt = storedAt
+
+    def etag(self):
+        return self.response.getHeader("etag")
+
+    def lastModified(self):
+        return self.response.getHeader("last-modified")
+
+    def hasValidators(self):
+        return bool(self.etag() or self.lastModified())
+
+    def entity(self, objectPairsHook, codec):
+        """Decodes the body on every hit, so each caller gets objects of its own."""
+        return self.response.entity(objectPairsHook, codec)
+
+
+def _isUnder(url, prefix):
+    return url == prefix or url.startswith(prefix + "/") or url.startswith(prefix + "?")
+
+
+class ResponseCache(object):
+    """Validator-aware cache of GET responses shared by all RestTargets of a pool.
+
+    Entries are kept in memory up to maxBytes of response body, least
+    recently used first out; only the raw responses are held, and every hit
+    is decoded afresh. With a directory, every stored response is also
+    written to disk, so an entry pushed out of memory can still answer a 304;
+    the directory is likewise kept to maxDiskBytes. policies is a list of
+    (regex, CachePolicy) pairs searched against the URL in order; the first
+    match wins, otherwise defaultPolicy applies. invalidate() drops what a
+    POST, PUT or DELETE may have changed.
+    """
+
+    def __init__(self, maxBytes=16 * 1024 * 1024, directory=None, policies=(),
+                 defaultPolicy=None, clock=time.time, maxDiskBytes=64 * 1024 * 1024):
+        self.maxBytes = maxBytes
+        self.directory = directory
+        self.maxDiskBytes = maxDiskBytes
+        self.policies = [(re.compile(pattern), policy) for pattern, policy in policies]
+        self.defaultPolicy = defaultPolicy or CachePolicy()
+        self._clock = clock
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._files = collections.OrderedDict()
+        self._fileBytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._indexFiles()
+
+    def policyFor(self, url):
+        for pattern, policy in self.policies:
+            if pattern.search(url):
+                return policy
+        return self.defaultPolicy
+
+    def lookup(self, url):
+        """Returns (entry, fresh); entry is None when nothing usable is stored."""
+        policy = self.policyFor(url)
+        if not policy.cacheable:
+            return None, False
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+        if entry is None:
+            entry = self._load(url)
+        fresh = entry is not None and self._clock() - entry.storedAt < policy.maxAge
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            elif fresh:
+                self.hits += 1
+        return entry, fresh
+
+    def conditionalHeaders(self, entry, headers):
+        if entry is None or not entry.hasValidators():
+            return headers
+        headers = dict(headers or {})
+        if entry.etag():
+            headers["If-None-Match"] = entry.etag()
+        if entry.lastModified():
+            headers["If-Modified-Since"] = entry.lastModified()
+        return headers
+
+    def revalidated(self, url, entry):
+        """Records a 304 for entry, restarting its freshness lifetime."""
+        with self._lock:
+            self.revalidations += 1
+        entry.storedAt = self._clock()
+        self._remember(url, entry)
+        return entry
+
+    def store(self, url, response):
+        policy = self.policyFor(url)
+        if not policy.cacheable or response.status != 200:
+            return None
+        entry = CacheEntry(response, self._clock())
+        if not entry.hasValidators() and policy.maxAge <= 0:
+            return None
+        self._remember(url, entry)
+        if self.directory:
+            self._save(url, response)
+        return entry
+
+    def invalidate(self, prefix):
+        """Drops every response for prefix or a URL below it, in memory and on disk."""
+        with self._lock:
+            for url in [url for url in self._entries if _isUnder(url, prefix)]:
+                self._bytes -= len(self._entries.pop(url).response.body)
+            stale = [url for url in self._files if _isUnder(url, prefix)]
+            for url in stale:
+                self._fileBytes -= self._files.pop(url)
+        for url in stale:
+            self._remove(self._path(url))
+
+    def sizeInBytes(self):
+        with self._lock:
+            return self._bytes
+
+    def diskSizeInBytes(self):
+        with self._lock:
+            return self._fileBytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remember(self, url, entry):
+        with self._lock:
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._bytes -= len(previous.response.body)
+            if len(entry.response.body) > self.maxBytes:
+                return
+            self._entries[url] = entry
+            self._bytes += len(entry.response.body)
+            while self._bytes > self.maxBytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.response.body)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _indexFiles(self):
+        """Picks up the responses a previous process left, oldest first."""
+        stored = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp"):
+                self._remove(path)
+                continue
+            try:
+                with open(path, "rb") as data:
+                    url = json.loads(data.readline())["url"]
+                stored.append((os.path.getmtime(path), url, os.path.getsize(path)))
+            except (IOError, ValueError, KeyError, TypeError):
+                self._remove(path)
+        for _, url, size in sorted(stored):
+            self._files[url] = size
+            self._fileBytes += size
+
+    def _save(self, url, response):
+        head = json.dumps({"url": url, "status": response.status, "reason": response.reason,
+                           "headers": response.headers})
+        data = head.encode("utf-8") + b"\n" + response.body
+        if len(data) > self.maxDiskBytes:
+            return
+        path = self._path(url)
+        with open(path + ".tmp", "wb") as out:
+            out.write(data)
+        os.replace(path + ".tmp", path)
+        evicted = []
+        with self._lock:
+            self._fileBytes += len(data) - self._files.pop(url, 0)
+            self._files[url] = len(data)
+            while self._fileBytes > self.maxDiskBytes:
+                oldest, size = self._files.popitem(last=False)
+                self._fileBytes -= size
+                evicted.append(oldest)
+        for oldest in evicted:
+            self._remove(self._path(oldest))
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _load(self, url):
+        if not self.directory:
+            return None
+        with self._lock:
+            if url not in self._files:
+                return None
+            self._files.move_to_end(url)
+        try:
+            with open(self._path(url), "rb") as stored:
+                head = json.loads(stored.readline())
+                body = stored.read()
+            storedAt = os.path.getmtime(self._path(url))
+        except (IOError, ValueError):
+            return None
+        if head["url"] != url:
+            return None
+        entry = CacheEntry(HttpResponse(head["status"], head["reason"], head["headers"], body),
+                           storedAt)
+        self._remember(url, entry)
+        return entry
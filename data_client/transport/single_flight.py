@@ -0,0 +1,134 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import threading
+
+from data_client.transport import json_codec
+
+
+class _Call(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _resilience():
+    # imported on the waiting path only: resilience loads asyncio, which the
+    # sync clients otherwise never need
+    from data_client.transport import resilience
+    return resilience
+
+
+class SingleFlight(object):
+    """Coalesces identical concurrent calls into one.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it runs wait and receive its result, or its exception.
+    Nothing is remembered once the call returns, so this is not a cache.
+
+    Every caller receives the same result object, so the results must not be
+    mutated. A waiter gives up at its own resilience.deadline(); when the
+    call failed only because the first caller's deadline ran out, the
+    waiter makes the call again under its own.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._inFlight = {}
+        self._lock = threading.Lock()
+
+    shareable = staticmethod(json_codec.isReusableHook)
+
+    def do(self, key, function):
+        while True:
+            with self._lock:
+                call = self._inFlight.get(key)
+                leader = call is None
+                if leader:
+                    call = self._inFlight[key] = _Call()
+                    self.calls += 1
+                else:
+                    self.shared += 1
+            if leader:
+                return self._lead(key, call, function)
+            resilience = _resilience()
+            left = resilience.remaining()
+            if (left is not None and left <= 0) or not call.done.wait(left):
+                raise resilience.DeadlineExceededException(
+                    "deadline expired waiting for a shared call")
+            if isinstance(call.error, resilience.DeadlineExceededException):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def _lead(self, key, call, function):
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inFlight[key]
+            call.done.set()
+
+
+class AsyncSingleFlight(object):
+    """SingleFlight for coroutines on one event loop.
+
+    Waiters are shielded, so a cancelled waiter does not cancel the shared
+    call for the others. Deadlines apply to waiters as in SingleFlight.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._inFlight = {}
+
+    shareable = staticmethod(json_codec.isReusableHook)
+
+    async def do(self, key, coroutineFunction):
+        # imported here so that sync clients never load asyncio
+        import asyncio
+        from data_client.transport import resilience
+        while True:
+            future = self._inFlight.get(key)
+            if future is None:
+                self.calls += 1
+                future = self._inFlight[key] = asyncio.ensure_future(coroutineFunction())
+                future.add_done_callback(lambda _: self._inFlight.pop(key, None))
+                return await asyncio.shield(future)
+            self.shared += 1
+            left = resilience.remaining()
+            if left is not None and left <= 0:
+                raise resilience.DeadlineExceededException(
+                    "deadline expired waiting for a shared call")
+            # asyncio.wait neither cancels the shared call on timeout nor when this waiter is
+            done, _ = await asyncio.wait((future,), timeout=left)
+            if not done:
+                raise resilience.DeadlineExceededException(
+                    "deadline expired waiting for a shared call")
+            if not future.cancelled() and isinstance(future.exception(),
+                                                     resilience.DeadlineExceededException):
+                continue
+            return future.result()
@@ -0,0 +1,178 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+"""Load-tests every client method against an in-process fake core data.
+
+Reports throughput, p50/p99 latency and peak traced memory per method with
+`concurrency` callers. Run with
+`python -m test.benchmark.client_benchmark [calls] [concurrency] [latencyMs] [errorRate]`.
+"""
+
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from data_client.controller.async_event_client_impl import AsyncEventClientImpl
+from data_client.controller.async_reading_client_impl import AsyncReadingClientImpl
+from data_client.controller.event_client_impl import EventClientImpl
+from data_client.controller.ping_core_data_client_impl import PingCoreDataClientImpl
+from data_client.controller.reading_client_impl import ReadingClientImpl
+from data_client.controller.value_descriptor_client_impl import ValueDescriptorClientImpl
+from data_client.domain.common import ValueDescriptor
+from data_client.domain.core import Event
+from data_client.domain.core import Reading
+from test.fake_core_data import FakeCoreDataServer
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _newEvent(i):
+    return Event(device="device-%d" % (i % 10), origin=i,
+                 readings=[Reading(device="device-%d" % (i % 10), name="temperature",
+                                   value=str(i % 100))])
+
+
+def _syncCalls(server, ids):
+    events = EventClientImpl(server.url("event"))
+    readings = ReadingClientImpl(server.url("reading"))
+    descriptors = ValueDescriptorClientImpl(server.url("valuedescriptor"))
+    ping = PingCoreDataClientImpl(server.url("ping"))
+    eventIds, readingIds, descriptorId = ids
+    return [
+        ("ping", lambda i: ping.ping()),
+        ("event", lambda i: events.event(eventIds[i % len(eventIds)])),
+        ("events(range)", lambda i: events.events(0, 2 ** 62, 100)),
+        ("eventsForDevice", lambda i: events.eventsForDevice("device-%d" % (i % 10), 100)),
+        ("event.add", lambda i: events.add(_newEvent(i))),
+        ("markedPushed", lambda i: events.markedPushed(eventIds[i % len(eventIds)])),
+        ("reading", lambda i: readings.reading(readingIds[i % len(readingIds)])),
+        ("readings(device)", lambda i: readings.readings("device-%d" % (i % 10), 100)),
+        ("readingsByName", lambda i: readings.readingsByName("temperature", 100)),
+        ("readingsByNameAndDevice", lambda i: readings.readingsByNameAndDevice(
+            "temperature", "device-%d" % (i % 10), 100)),
+        ("readingsByUoMLabel", lambda i: readings.readingsByUoMLabel("C", 100)),
+        ("valueDescriptor", lambda i: descriptors.valueDescriptor(descriptorId)),
+        ("valueDescriptors", lambda i: descriptors.valueDescriptors()),
+        ("valueDescriptor.add", lambda i: descriptors.add(ValueDescriptor(
+            name="bench-%d" % i, type="I", uomLabel="count"))),
+    ]
+
+
+def _asyncCalls(server, ids):
+    events = AsyncEventClientImpl(server.url("event"))
+    readings = AsyncReadingClientImpl(server.url("reading"))
+    eventIds, readingIds, _ = ids
+    return [
+        ("async event", lambda i: events.event(eventIds[i % len(eventIds)])),
+        ("async events(range)", lambda i: events.events(0, 2 ** 62, 100)),
+        ("async reading", lambda i: readings.reading(readingIds[i % len(readingIds)])),
+        ("async readingsByName", lambda i: readings.readingsByName("temperature", 100)),
+    ]
+
+
+def _runSync(call, calls, concurrency):
+    def timed(i):
+        started = time.perf_counter()
+        try:
+            call(i)
+            return time.perf_counter() - started, False
+        except Exception:
+            return time.perf_counter() - started, True
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(timed, range(calls)))
+
+
+async def _runAsync(call, calls, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+
+    async def timed(i):
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await call(i)
+                return time.perf_counter() - started, False
+            except Exception:
+                return time.perf_counter() - started, True
+
+    return await asyncio.gather(*[timed(i) for i in range(calls)])
+
+
+def _measure(run):
+    gc.collect()
+    started = time.perf_counter()
+    samples = run()
+    elapsed = time.perf_counter() - started
+    # a second, traced pass so tracemalloc overhead does not skew the timings
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return samples, elapsed, peak
+
+
+def _report(name, samples, elapsed, peak):
+    latencies = sorted(seconds for seconds, _ in samples)
+    errors = sum(1 for _, failed in samples if failed)
+    print("%-24s %10.0f %9.2f %9.2f %7d %9.2f" % (
+        name, len(samples) / elapsed, _percentile(latencies, 0.5) * 1000,
+        _percentile(latencies, 0.99) * 1000, errors, peak / 1048576.0))
+
+
+def main(calls=2000, concurrency=16, latencyMs=0.0, errorRate=0.0):
+    server = FakeCoreDataServer(latency=latencyMs / 1000.0, errorRate=errorRate, seed=1).start()
+    try:
+        server.populate(1000, readingsPerEvent=3, devices=10)
+        ids = (list(server.events), list(server.readings), next(iter(server.valueDescriptors)))
+        print("%d calls per method, %d concurrent, %.1f ms server latency, %.0f%% errors" % (
+            calls, concurrency, latencyMs, errorRate * 100))
+        print("%-24s %10s %9s %9s %7s %9s" % ("method", "calls/s", "p50 ms", "p99 ms", "errors",
+                                              "peak MiB"))
+        for name, call in _syncCalls(server, ids):
+            _report(name, *_measure(lambda: _runSync(call, calls, concurrency)))
+
+        async def runAsync():
+            for name, call in _asyncCalls(server, ids):
+                _report(name, *await _measureAsync(call, calls, concurrency))
+
+        asyncio.run(runAsync())
+    finally:
+        server.stop()
+
+
+async def _measureAsync(call, calls, concurrency):
+    gc.collect()
+    started = time.perf_counter()
+    samples = await _runAsync(call, calls, concurrency)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    tracemalloc.start()
+    await _runAsync(call, calls, concurrency)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return samples, elapsed, peak
+
+
+if __name__ == "__main__":
+    main(*[float(arg) if "." in arg else int(arg) for arg in sys.argv[1:]])
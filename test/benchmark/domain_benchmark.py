@@ -0,0 +1,87 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+"""Compares slotted domain objects with plain dicts for a 100k reading response.
+
+Run with `python -m test.benchmark.domain_benchmark [count]`.
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from data_client.domain import core
+from data_client.domain.core import Reading
+from data_client.transport import json_codec
+
+
+def _payload(count):
+    return json.dumps([{"id": "5a1f%020d" % i, "pushed": 0, "created": 1500000000000 + i,
+                        "modified": 1500000000000 + i, "origin": 1500000000000 + i,
+                        "device": "device-%d" % (i % 50), "name": "temperature",
+                        "value": str(i % 100)} for i in range(count)]).encode("utf-8")
+
+
+def _best(function, argument, rounds=3):
+    best = None
+    for _ in range(rounds):
+        gc.collect()
+        started = time.perf_counter()
+        function(argument)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _memory(decode, payload):
+    # timed separately: tracemalloc slows allocation-heavy decoding several times over
+    gc.collect()
+    tracemalloc.start()
+    result = decode(payload)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak
+
+
+def _encoder(objects):
+    if isinstance(objects[0], dict):
+        return json.dumps
+    return json_codec.create("stdlib").dumps
+
+
+def main(count=100000):
+    payload = _payload(count)
+    print("%d readings, %.1f MiB of JSON" % (count, len(payload) / 1048576.0))
+    print("%-8s %10s %10s %12s %12s" % ("decoder", "decode s", "encode s", "retained MiB",
+                                         "peak MiB"))
+    decoders = [("dict", json.loads), ("slotted", core.decodeReadings)]
+    if json_codec.orjson is not None:
+        codec = json_codec.create("orjson")
+        decoders.append(("orjson", lambda body: codec.decode(body, Reading.fromPairs)))
+    for name, decode in decoders:
+        objects = decode(payload)
+        retained, peak = _memory(decode, payload)
+        print("%-8s %10.3f %10.3f %12.1f %12.1f" % (name, _best(decode, payload),
+                                                    _best(_encoder(objects), objects),
+                                                    retained / 1048576.0, peak / 1048576.0))
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
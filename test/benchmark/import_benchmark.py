@@ -0,0 +1,75 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+"""Measures how long importing the client modules takes in a fresh interpreter.
+
+Each module is imported `runs` times with `python -X importtime` and the
+median total is reported with the slowest modules it pulled in, plus any
+heavy optional dependency that was loaded eagerly. Run with
+`python -m test.benchmark.import_benchmark [runs]`.
+"""
+
+import re
+import statistics
+import subprocess
+import sys
+
+MODULES = (
+    "data_client.controller.ping_core_data_client_impl",
+    "data_client.controller.event_client_impl",
+    "data_client.controller.async_reading_client_impl",
+    "data_client.transport.http_session_pool",
+    "data_client.domain.core",
+)
+
+# none of these may be loaded by merely importing a client module
+HEAVY = ("asyncio", "orjson", "numpy", "zstandard", "inspect", "concurrent.futures")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _importTimes(module):
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import sys, %s; print(','.join(sorted(sys.modules)))" % module],
+        capture_output=True, text=True, check=True)
+    times = {}
+    for line in output.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times, output.stdout.strip().split(",")
+
+
+def main(runs=5):
+    print("%-52s %10s  %s" % ("module", "median ms", "slowest imports"))
+    for module in MODULES:
+        samples = [_importTimes(module) for _ in range(runs)]
+        total = statistics.median(times[module] for times, _ in samples) / 1000.0
+        times, loaded = samples[-1]
+        slowest = sorted((name for name in times if name != module), key=times.get,
+                         reverse=True)[:3]
+        print("%-52s %10.1f  %s" % (module, total, ", ".join(
+            "%s %.1f" % (name, times[name] / 1000.0) for name in slowest)))
+        eager = [name for name in HEAVY if name in loaded]
+        if eager:
+            print("%-52s %10s  loaded eagerly: %s" % ("", "", ", ".join(eager)))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,119 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import math
+import unittest
+
+from data_client.analytics import aggregation
+from data_client.analytics.aggregation import BucketAggregator
+from data_client.analytics.aggregation import LttbDownsampler
+from data_client.domain.core import Event
+from data_client.domain.core import Reading
+
+
+class _FakeEventClient(object):
+
+    def __init__(self, events):
+        self.store = events
+        self.pages = 0
+
+    def events(self, start, end, limit):
+        self.pages += 1
+        matching = [e for e in self.store if start <= e.created <= end]
+        return sorted(matching, key=lambda e: e.created)[:limit]
+
+
+def _series(count, device="d1", name="temperature"):
+    return [Event(id="e%d" % i, device=device, created=i * 1000, readings=[
+        Reading(id="r%d" % i, device=device, name=name, origin=i * 1000, value=str(i % 10)),
+        Reading(id="h%d" % i, device=device, name="humidity", origin=i * 1000, value="x")])
+            for i in range(count)]
+
+
+class AggregationTest(unittest.TestCase):
+
+    def testBucketsArePaged(self):
+        client = _FakeEventClient(_series(100) + _series(100, device="d2"))
+        buckets = aggregation.aggregate(client, "d1", "temperature", 0, 99999, 10000,
+                                        pageSize=16)
+        self.assertEqual(10, len(buckets))
+        first = buckets[0]
+        self.assertEqual((0, 10, 0.0, 9.0, 4.5, 9.0), (first.start, first.count, first.min,
+                                                       first.max, first.mean, first.last))
+        self.assertGreater(client.pages, 10)
+
+    def testNonNumericValuesAreIgnored(self):
+        aggregator = BucketAggregator(10)
+        aggregator.add([1, 2, 3], [1.0, math.nan, 5.0])
+        bucket = aggregator.result()[0]
+        self.assertEqual((2, 3.0, 5.0), (bucket.count, bucket.mean, bucket.last))
+
+    def testBatchesMergeIntoTheSameBucket(self):
+        aggregator = BucketAggregator(10, offset=5)
+        aggregator.add([5, 20], [3.0, 1.0])
+        aggregator.add([14, 6], [7.0, 2.0])
+        first, second = aggregator.result()
+        self.assertEqual((5, 3, 2.0, 7.0, 7.0), (first.start, first.count, first.min, first.max,
+                                                 first.last))
+        self.assertEqual((15, 1), (second.start, second.count))
+
+    @unittest.skipIf(aggregation._numpy() is None, "numpy is not installed")
+    def testVectorizedMatchesPointByPoint(self):
+        origins = [(i * 37) % 1000 for i in range(500)]
+        values = [float((i * 13) % 17) for i in range(500)]
+        vectorized = BucketAggregator(100)
+        vectorized.add(origins, values)
+        pointwise = BucketAggregator(100)
+        for origin, value in zip(origins, values):
+            pointwise.add([origin], [value])
+        self.assertEqual([repr(b) for b in pointwise.result()],
+                         [repr(b) for b in vectorized.result()])
+
+    def testLttbKeepsEndsAndPeaks(self):
+        origins = list(range(1000))
+        values = [100.0 if i == 500 else math.sin(i / 50.0) for i in origins]
+        sampler = LttbDownsampler(50, 0, 999)
+        for page in range(0, 1000, 64):
+            sampler.add(origins[page:page + 64], values[page:page + 64])
+        points = sampler.result()
+        self.assertLessEqual(len(points), 50)
+        self.assertEqual((0, 0.0), points[0])
+        self.assertEqual(999, points[-1][0])
+        self.assertIn((500, 100.0), points)
+        self.assertEqual(sorted(points), points)
+        self.assertEqual({}, sampler._open)
+
+    def testLttbHoldsFewBuckets(self):
+        sampler = LttbDownsampler(100, 0, 10 ** 6)
+        peak = 0
+        for x in range(0, 10 ** 6, 100):
+            sampler.add([x], [float(x % 7)])
+            peak = max(peak, len(sampler._open))
+        self.assertLessEqual(peak, 3)
+        self.assertLessEqual(len(sampler.result()), 100)
+
+    def testDownsampleOverPages(self):
+        client = _FakeEventClient(_series(300))
+        points = aggregation.downsample(client, "d1", "temperature", 0, 299000, 20, pageSize=32)
+        self.assertLessEqual(len(points), 20)
+        self.assertEqual(0, points[0][0])
+        self.assertEqual(299000, points[-1][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
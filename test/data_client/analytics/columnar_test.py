@@ -0,0 +1,72 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import math
+import unittest
+
+from data_client.analytics import columnar
+from data_client.analytics.columnar import ColumnarView
+from data_client.analytics.columnar import ReadingColumnBuilder
+from data_client.domain.core import eventOrReadingFromPairs
+
+PAYLOAD = json.dumps([
+    {"id": "e1", "device": "d1", "readings": [
+        {"id": "r1", "origin": 10, "device": "d1", "name": "temperature", "value": "71.5"},
+        {"id": "r2", "origin": 11, "device": "d1", "name": "humidity", "value": "40"}]},
+    {"id": "e2", "device": "d2", "readings": [
+        {"id": "r3", "origin": 12, "device": "d2", "name": "temperature", "value": "on"}]}])
+
+
+class _FakeEventClient(object):
+
+    objectPairsHook = staticmethod(eventOrReadingFromPairs)
+
+    def readingsForDeviceAndValueDescriptor(self, deviceId, valuedescriptor, limit):
+        return json.loads(PAYLOAD, object_pairs_hook=self.objectPairsHook)
+
+
+class ColumnarTest(unittest.TestCase):
+
+    def testBuilderFillsTypedColumns(self):
+        builder = ReadingColumnBuilder()
+        json.loads(PAYLOAD, object_pairs_hook=builder.addPairs)
+        self.assertEqual([10, 11, 12], list(builder.origin))
+        self.assertEqual([71.5, 40.0], list(builder.value)[:2])
+        self.assertTrue(math.isnan(builder.value[2]))
+        self.assertEqual({"d1": 0, "d2": 1}, builder.devices)
+        self.assertEqual([0, 1, 0], list(builder.nameCodes))
+
+    @unittest.skipIf(columnar.numpy is None, "numpy is not installed")
+    def testViewReturnsNumpyColumns(self):
+        client = _FakeEventClient()
+        columns = ColumnarView(client).readingsForDeviceAndValueDescriptor("d1", "temp", 10)
+        self.assertEqual(3, len(columns))
+        self.assertEqual("int64", str(columns.origin.dtype))
+        self.assertEqual(["d1", "d1", "d2"], list(columns.device()))
+        self.assertEqual(["temperature", "humidity", "temperature"], list(columns.name()))
+        self.assertIs(eventOrReadingFromPairs, client.objectPairsHook)
+
+    @unittest.skipIf(columnar.numpy is not None, "numpy is installed")
+    def testBuildNeedsNumpy(self):
+        with self.assertRaises(ImportError):
+            ReadingColumnBuilder().build()
+
+
+if __name__ == "__main__":
+    unittest.main()
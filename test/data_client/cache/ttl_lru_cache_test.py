@@ -0,0 +1,80 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import unittest
+
+from data_client.cache.ttl_lru_cache import TtlLruCache
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TtlLruCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.cache = TtlLruCache(maxSize=2, ttl=10, clock=self.clock)
+
+    def testHitAndMiss(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", 1)
+        self.assertEqual(1, self.cache.get("a"))
+        stats = self.cache.stats()
+        self.assertEqual((1, 1), (stats.hits, stats.misses))
+        self.assertEqual(0.5, stats.hitRatio())
+
+    def testEntriesExpire(self):
+        self.cache.put("a", 1)
+        self.clock.now = 11
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(0, len(self.cache))
+
+    def testLeastRecentlyUsedIsEvicted(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(1, self.cache.get("a"))
+        self.assertEqual(1, self.cache.stats().evictions)
+
+    def testGetOrLoadCachesFalsyValues(self):
+        loads = []
+        for _ in range(3):
+            self.cache.getOrLoad("empty", lambda: loads.append(1) or [])
+        self.assertEqual(1, len(loads))
+
+    def testLoadRacingClearIsNotStored(self):
+        def staleLoad():
+            # a write lands and clears the cache while this load is in flight
+            self.cache.clear()
+            return "before-write"
+        self.assertEqual("before-write", self.cache.getOrLoad("a", staleLoad))
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual("after-write", self.cache.getOrLoad("a", lambda: "after-write"))
+        self.assertEqual("after-write", self.cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
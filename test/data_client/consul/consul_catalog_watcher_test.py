@@ -0,0 +1,175 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+from data_client.consul.consul_catalog_watcher import ConsulCatalogWatcher
+
+SERVICE = "edgex-core-data"
+
+
+def _entry(serviceId, port, status="passing"):
+    return {"Node": {"Address": "127.0.0.1"},
+            "Service": {"ID": serviceId, "Address": "", "Port": port},
+            "Checks": [{"Status": status}]}
+
+
+class _FakeConsulHandler(BaseHTTPRequestHandler):
+    """Answers /v1/health/service/{name} with blocking-query semantics."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        consul = self.server.consul
+        self.server.requests += 1
+        if not consul.up:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        index = int(query.get("index", ["0"])[0])
+        with consul.changed:
+            if index and index == consul.index:
+                consul.changed.wait(float(query.get("wait", ["1s"])[0].rstrip("s")))
+            body = json.dumps(consul.entries).encode()
+            currentIndex = consul.index
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if consul.sendIndex:
+            self.send_header("X-Consul-Index", str(currentIndex))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeConsul(object):
+
+    def __init__(self):
+        self.entries = []
+        self.index = 1
+        self.up = True
+        self.sendIndex = True
+        self.changed = threading.Condition()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeConsulHandler)
+        self.server.consul = self
+        self.server.requests = 0
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.url = "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def publish(self, entries):
+        with self.changed:
+            self.entries = entries
+            self.index += 1
+            self.changed.notify_all()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ConsulCatalogWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.consul = _FakeConsul()
+        self.consul.publish([_entry("core-data-1", 48080), _entry("core-data-2", 48081,
+                                                                  "critical")])
+        self.watcher = ConsulCatalogWatcher(self.consul.url, wait=2)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.consul.publish(self.consul.entries)
+        self.consul.close()
+
+    def testOnlyHealthyInstancesAreReturned(self):
+        instances = self.watcher.getInstances(SERVICE)
+        self.assertEqual(["http://127.0.0.1:48080"], [i.uri for i in instances])
+
+    def testLookupsAreServedFromMemory(self):
+        self.watcher.getInstances(SERVICE)
+        requests = self.consul.server.requests
+        for _ in range(100):
+            self.watcher.getInstances(SERVICE)
+        self.assertLessEqual(self.consul.server.requests - requests, 1)
+
+    def testChangesArriveThroughBlockingQuery(self):
+        self.watcher.getInstances(SERVICE)
+        self.consul.publish([_entry("core-data-3", 48082)])
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            uris = [i.uri for i in self.watcher.getInstances(SERVICE)]
+            if uris == ["http://127.0.0.1:48082"]:
+                return
+            time.sleep(0.01)
+        self.fail("watcher did not pick up the new instance")
+
+    def testLastKnownInstancesSurviveConsulOutage(self):
+        self.watcher.getInstances(SERVICE)
+        self.consul.close()
+        self.assertEqual(1, len(self.watcher.getInstances(SERVICE)))
+
+    def testMissingIndexFallsBackToPolling(self):
+        self.consul.sendIndex = False
+        watcher = ConsulCatalogWatcher(self.consul.url, wait=2, retryInterval=0.1)
+        try:
+            watcher.getInstances(SERVICE)
+            requests = self.consul.server.requests
+            time.sleep(0.35)
+            self.assertLessEqual(self.consul.server.requests - requests, 5)
+            self.consul.publish([_entry("core-data-3", 48082)])
+            time.sleep(0.3)
+            self.assertEqual(["http://127.0.0.1:48082"],
+                             [i.uri for i in watcher.getInstances(SERVICE)])
+        finally:
+            watcher.stop()
+
+    def testWatchRecoversWhenConsulStartsLate(self):
+        self.consul.up = False
+        watcher = ConsulCatalogWatcher(self.consul.url, wait=2, retryInterval=0.05)
+        try:
+            self.assertEqual([], watcher.getInstances(SERVICE))
+            time.sleep(0.2)
+            self.consul.up = True
+            time.sleep(0.2)
+            # the watch must still be alive to see changes after the first answer
+            self.consul.publish([_entry("core-data-3", 48082)])
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                uris = [i.uri for i in watcher.getInstances(SERVICE)]
+                if uris == ["http://127.0.0.1:48082"]:
+                    return
+                time.sleep(0.01)
+            self.fail("watcher did not recover once consul came up")
+        finally:
+            watcher.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
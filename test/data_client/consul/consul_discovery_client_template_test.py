@@ -0,0 +1,199 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import unittest
+from unittest import mock
+from urllib.parse import urlsplit
+
+from test import platform_stub
+
+# the client impls import domain.config and exception.controller when loaded
+platform_stub.install()
+
+from data_client.consul import consul_discovery_client_template
+from data_client.consul import load_balancer
+from data_client.consul.consul_catalog_watcher import ServiceInstance
+from data_client.consul.consul_discovery_client_template import ConsulDiscoveryClientTemplate
+from data_client.consul.consul_discovery_client_template import _Setting
+from data_client.controller.async_event_client_impl import AsyncEventClientImpl
+from data_client.controller.async_reading_client_impl import AsyncReadingClientImpl
+from data_client.controller.async_value_descriptor_client_impl import AsyncValueDescriptorClientImpl
+from data_client.controller.event_client_impl import EventClientImpl
+from data_client.controller.ping_core_data_client_impl import PingCoreDataClientImpl
+from data_client.controller.reading_client_impl import ReadingClientImpl
+from data_client.controller.value_descriptor_client_impl import ValueDescriptorClientImpl
+from data_client.domain.core import Event
+from data_client.transport import http_session_pool
+from test.fake_core_data import FakeCoreDataServer
+
+_SHARED = ("discoveryClient", "loadBalancer", "sessionPool", "asyncSessionSettings",
+           "resilience", "healthMonitor", "hedger", "responseCache")
+
+
+def _reset():
+    """Forgets every pool, breaker and setting the template shares between clients."""
+    template = ConsulDiscoveryClientTemplate
+    if template.healthMonitor is not None:
+        template.healthMonitor.stop()
+    if template.hedger is not None:
+        template.hedger.close()
+    if template.sessionPool is not None:
+        template.sessionPool.close()
+    for name in _SHARED:
+        setattr(template, name, None)
+    for setting in vars(template).values():
+        if isinstance(setting, _Setting):
+            setting._loaded = False
+    http_session_pool._shared_pool = None
+
+
+class _Discovery(object):
+
+    def __init__(self, instances):
+        self.instances = instances
+
+    def getInstances(self, appId):
+        return list(self.instances)
+
+
+class ConsulDiscoveryClientTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoreDataServer().start()
+        self.server.populate(6, readingsPerEvent=2, devices=2)
+        self.settings = {
+            "core.db.event.url": self.server.url("event"),
+            "core.db.reading.url": self.server.url("reading"),
+            "core.db.valuedescriptor.url": self.server.url("valuedescriptor"),
+            "core.db.ping.url": self.server.url("ping"),
+            "client.pool.max-per-host": 3,
+            "client.json-codec": "stdlib",
+            "client.health-check.interval": 0,
+        }
+        patcher = mock.patch.object(consul_discovery_client_template.config_reader,
+                                    "read_property", self._readProperty)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        _reset()
+
+    def tearDown(self):
+        _reset()
+        self.server.stop()
+
+    def _readProperty(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def testClientsShareOneConfiguredPool(self):
+        events = EventClientImpl()
+        readings = ReadingClientImpl()
+        self.assertEqual(6, len(events.events(0, 2 ** 62, 10)))
+        self.assertEqual(12, len(readings.readings()))
+        self.assertEqual(len(self.server.valueDescriptors),
+                         len(ValueDescriptorClientImpl().valueDescriptors()))
+        self.assertEqual("pong", PingCoreDataClientImpl().ping())
+        pool = ConsulDiscoveryClientTemplate.sessionPool
+        self.assertIs(pool, readings.getSessionPool())
+        self.assertEqual(3, pool.maxConnectionsPerHost)
+        self.assertEqual("stdlib", pool.codec.name)
+        self.assertIs(pool.codec, events.getCodec())
+        self.assertIs(ConsulDiscoveryClientTemplate.resilience, pool.resilience)
+        self.assertIsNotNone(pool.compression)
+        self.assertIsNone(pool.responseCache)
+        self.assertIsNone(pool.singleFlight)
+
+    def testOptionalLayersFollowTheConfiguration(self):
+        self.settings.update({"client.resilience.enabled": False,
+                              "client.compression.enabled": False,
+                              "client.response-cache.max-bytes": 1048576,
+                              "client.response-cache.max-age": 60.0,
+                              "client.single-flight.enabled": True})
+        client = EventClientImpl()
+        client.events(0, 2 ** 62, 10)
+        client.events(0, 2 ** 62, 10)
+        pool = client.getSessionPool()
+        self.assertIsNone(pool.resilience)
+        self.assertIsNone(pool.compression)
+        self.assertIsNotNone(pool.singleFlight)
+        self.assertEqual(1, pool.responseCache.hits)
+
+    def testHealthMonitorStartsWithThePool(self):
+        self.settings["client.health-check.interval"] = 60.0
+        EventClientImpl().getSessionPool()
+        monitor = ConsulDiscoveryClientTemplate.healthMonitor
+        self.assertIsNotNone(monitor)
+        self.assertIs(ConsulDiscoveryClientTemplate.resilience, monitor.resilience)
+
+    def testHealthMonitorPingsEachDiscoveredInstance(self):
+        self.settings["client.health-check.interval"] = 60.0
+        instance = ServiceInstance("core-data", "127.0.0.1", urlsplit(self.server.url("ping")).port)
+        ConsulDiscoveryClientTemplate.discoveryClient = _Discovery([instance])
+        ConsulDiscoveryClientTemplate.loadBalancer = load_balancer.create("round-robin")
+        EventClientImpl().getSessionPool()
+        monitor = ConsulDiscoveryClientTemplate.healthMonitor
+        self.assertEqual([instance.uri + "/api/v1/ping"],
+                         [target.url for target in monitor.targets()])
+        self.assertTrue(monitor.check())
+
+    def testAsyncClientsGetAPoolPerEventLoop(self):
+        self.settings["client.response-cache.max-bytes"] = 1048576
+        events = AsyncEventClientImpl()
+
+        async def fetch():
+            found = await events.events(0, 2 ** 62, 10)
+            readings = await AsyncReadingClientImpl().readingsByName("temperature", 100)
+            descriptors = await AsyncValueDescriptorClientImpl().valueDescriptors()
+            return len(found), len(readings), len(descriptors), events.getAsyncSessionPool()
+
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+        self.assertEqual((6, 12, len(self.server.valueDescriptors)), first[:3])
+        self.assertIsNot(first[3], second[3])
+        for pool in (first[3], second[3]):
+            self.assertEqual(3, pool.maxConnectionsPerHost)
+            self.assertIs(ConsulDiscoveryClientTemplate.resilience, pool.resilience)
+            self.assertIs(events.getSessionPool().responseCache, pool.responseCache)
+
+    def testHedgedCallsGoThroughTheHedger(self):
+        self.settings["client.hedging.enabled"] = True
+        client = EventClientImpl()
+        id = client.add(Event(device="device-9"))
+        self.assertEqual("device-9", client.event(id).device)
+        self.assertIsNotNone(ConsulDiscoveryClientTemplate.hedger)
+
+    def testHedgeTargetsUseTwoDiscoveredInstances(self):
+        client = EventClientImpl()
+        pool = client.getSessionPool()
+        self.assertEqual([self.server.url("event")],
+                         [target.url for target in client.hedgeTargets(pool, client.url)])
+        instances = [ServiceInstance("core-data-%d" % i, "10.0.0.%d" % i, 48080)
+                     for i in range(2)]
+        ConsulDiscoveryClientTemplate.discoveryClient = _Discovery(instances)
+        ConsulDiscoveryClientTemplate.loadBalancer = load_balancer.create("round-robin")
+        targets = client.hedgeTargets(pool, client.url)
+        self.assertEqual(sorted(instance.uri + "/api/v1/event" for instance in instances),
+                         sorted(target.url for target in targets))
+        self.assertTrue(all(target.tracker is not None for target in targets))
+
+    def testMalformedUrlIsRejected(self):
+        with self.assertRaises(platform_stub.DataValidationException):
+            EventClientImpl("not a url")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import unittest
+
+from data_client.consul import load_balancer
+from data_client.consul.consul_catalog_watcher import ServiceInstance
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class LoadBalancerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.instances = [ServiceInstance("core-data-%d" % i, "10.0.0.%d" % i, 48080)
+                          for i in range(3)]
+        self.clock = _Clock()
+
+    def testRoundRobinSpreadsEvenly(self):
+        balancer = load_balancer.create("round-robin")
+        chosen = [balancer.choose(self.instances) for _ in range(6)]
+        self.assertEqual(self.instances * 2, chosen)
+
+    def testLeastOutstandingAvoidsBusyInstances(self):
+        balancer = load_balancer.create("least-outstanding")
+        balancer.onStart(self.instances[0])
+        balancer.onStart(self.instances[1])
+        for _ in range(3):
+            self.assertEqual(self.instances[2], balancer.choose(self.instances))
+
+    def testEwmaPrefersFasterInstance(self):
+        balancer = load_balancer.create("ewma")
+        for instance, latency in zip(self.instances, (0.5, 0.01, 0.2)):
+            balancer.onStart(instance)
+            balancer.onComplete(instance, latency, False)
+        self.assertEqual(self.instances[1], balancer.choose(self.instances))
+
+    def testFailingInstanceIsEjectedForAWhile(self):
+        balancer = load_balancer.RoundRobinLoadBalancer(maxFailures=2, ejectionTime=10,
+                                                        clock=self.clock)
+        bad = self.instances[0]
+        for _ in range(2):
+            tracker = balancer.tracker(bad)
+            tracker.finished(tracker.started(), True)
+        self.assertTrue(balancer.isEjected(bad))
+        self.assertNotIn(bad, [balancer.choose(self.instances) for _ in range(6)])
+        self.clock.now += 11
+        self.assertIn(bad, [balancer.choose(self.instances) for _ in range(6)])
+
+    def testAllEjectedFallsBackToEveryInstance(self):
+        balancer = load_balancer.RoundRobinLoadBalancer(maxFailures=1, clock=self.clock)
+        for instance in self.instances:
+            balancer.onStart(instance)
+            balancer.onComplete(instance, 0.1, True)
+        self.assertIn(balancer.choose(self.instances), self.instances)
+
+    def testPairsSpreadPrimariesEvenly(self):
+        balancer = load_balancer.create("round-robin")
+        instances = self.instances[:2]
+        pairs = [balancer.choosePair(instances) for _ in range(10)]
+        primaries = [pair[0] for pair in pairs]
+        self.assertEqual(5, primaries.count(instances[0]))
+        self.assertEqual(5, primaries.count(instances[1]))
+        for primary, hedge in pairs:
+            self.assertNotEqual(primary, hedge)
+
+    def testPairHedgesOntoTheLeastLoadedOtherInstance(self):
+        balancer = load_balancer.create("least-outstanding")
+        balancer.onStart(self.instances[1])
+        primary, hedge = balancer.choosePair(self.instances)
+        self.assertEqual(self.instances[0], primary)
+        self.assertEqual(self.instances[2], hedge)
+
+    def testPairWithOneInstanceHasNoHedge(self):
+        balancer = load_balancer.create("round-robin")
+        self.assertEqual(self.instances[:1], balancer.choosePair(self.instances[:1]))
+        self.assertEqual([], balancer.choosePair([]))
+
+    def testUnknownStrategy(self):
+        with self.assertRaises(ValueError):
+            load_balancer.create("random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import threading
+import time
+import unittest
+
+from data_client.controller.batching_event_ingestor import BatchingEventIngestor
+from data_client.controller.batching_event_ingestor import IngestorFullException
+from data_client.domain.core import Event
+from data_client.transport import json_codec
+
+
+class _RecordingEventClient(object):
+
+    def __init__(self, gate=None):
+        self.added = []
+        self.gate = gate
+        self.lock = threading.Lock()
+
+    def add(self, event):
+        if self.gate is not None:
+            self.gate.wait()
+        if event.get("device") == "broken":
+            raise ValueError("rejected")
+        with self.lock:
+            self.added.append(event)
+            return "id-%s" % event["origin"]
+
+
+class _EncodingEventClient(object):
+    """Encodes like a client impl does, remembering the body and the sending thread."""
+
+    def __init__(self, concurrent=1):
+        self.codec = json_codec.create("stdlib")
+        self.sent = []
+        self.barrier = threading.Barrier(concurrent, timeout=5)
+
+    def getCodec(self):
+        return self.codec
+
+    def add(self, event):
+        self.sent.append((self.codec.encode(event), threading.current_thread().name))
+        # only passes once every event of the batch is being sent at the same time
+        self.barrier.wait()
+        return event.device
+
+
+class BatchingEventIngestorTest(unittest.TestCase):
+
+    def testFlushOnBatchSize(self):
+        client = _RecordingEventClient()
+        ingestor = BatchingEventIngestor(client, maxBatchSize=10, maxBatchAge=60)
+        futures = [ingestor.submit({"device": "d1", "origin": i}) for i in range(10)]
+        self.assertEqual(["id-%d" % i for i in range(10)],
+                         [f.result(timeout=5) for f in futures])
+        ingestor.close()
+
+    def testFlushOnAge(self):
+        client = _RecordingEventClient()
+        ingestor = BatchingEventIngestor(client, maxBatchSize=1000, maxBatchAge=0.01)
+        future = ingestor.submit({"device": "d1", "origin": 1})
+        self.assertEqual("id-1", future.result(timeout=5))
+        ingestor.close()
+
+    def testFlushOnBytes(self):
+        client = _RecordingEventClient()
+        ingestor = BatchingEventIngestor(client, maxBatchSize=1000, maxBatchBytes=10,
+                                         maxBatchAge=60)
+        future = ingestor.submit({"device": "a long device name", "origin": 2})
+        self.assertEqual("id-2", future.result(timeout=5))
+        ingestor.close()
+
+    def testFailureIsReportedPerEvent(self):
+        client = _RecordingEventClient()
+        ingestor = BatchingEventIngestor(client, maxBatchAge=60)
+        good = ingestor.submit({"device": "d1", "origin": 3})
+        bad = ingestor.submit({"device": "broken", "origin": 4})
+        ingestor.flush()
+        self.assertEqual("id-3", good.result())
+        self.assertIsInstance(bad.exception(), ValueError)
+        ingestor.close()
+
+    def testBackpressureWhenFull(self):
+        gate = threading.Event()
+        client = _RecordingEventClient(gate)
+        ingestor = BatchingEventIngestor(client, maxBatchSize=1, maxPending=2)
+        ingestor.submit({"device": "d1", "origin": 5})
+        ingestor.submit({"device": "d1", "origin": 6})
+        started = time.monotonic()
+        with self.assertRaises(IngestorFullException):
+            ingestor.submit({"device": "d1", "origin": 7}, timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        gate.set()
+        ingestor.close()
+        self.assertEqual(2, len(client.added))
+
+    def testEventsAreEncodedOnceAndSentConcurrently(self):
+        client = _EncodingEventClient(concurrent=5)
+        ingestor = BatchingEventIngestor(client, maxBatchSize=5, maxBatchAge=60)
+        events = [Event(device="d%d" % i, origin=i) for i in range(5)]
+        futures = [ingestor.submit(event) for event in events]
+        self.assertEqual(["d%d" % i for i in range(5)], [f.result(timeout=5) for f in futures])
+        ingestor.close()
+        self.assertEqual(5, client.codec.stats.encodeCount)
+        self.assertEqual(sorted(event.toJson().encode("utf-8") for event in events),
+                         sorted(body for body, _ in client.sent))
+        self.assertEqual(5, len(set(thread for _, thread in client.sent)))
+
+    def testGivenCodecIsUsedInsteadOfTheClients(self):
+        client = _EncodingEventClient()
+        submitCodec = json_codec.create("stdlib")
+        ingestor = BatchingEventIngestor(client, maxBatchAge=60, codec=submitCodec)
+        future = ingestor.submit(Event(device="d0"))
+        ingestor.close()
+        self.assertEqual("d0", future.result())
+        self.assertEqual(1, submitCodec.stats.encodeCount)
+        self.assertEqual(0, client.codec.stats.encodeCount)
+
+if __name__ == "__main__":
+    unittest.main()
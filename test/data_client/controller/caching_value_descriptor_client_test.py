@@ -0,0 +1,84 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import unittest
+
+from data_client.controller.caching_value_descriptor_client import CachingValueDescriptorClient
+
+TEST_NAME = "temperature"
+
+
+class _CountingValueDescriptorClient(object):
+
+    def __init__(self):
+        self.calls = 0
+        self.descriptors = {"vd1": {"id": "vd1", "name": TEST_NAME}}
+
+    def valueDescriptor(self, id):
+        self.calls += 1
+        return self.descriptors[id]
+
+    def valueDescriptors(self):
+        self.calls += 1
+        return list(self.descriptors.values())
+
+    def valueDescriptorByName(self, name):
+        self.calls += 1
+        return [vd for vd in self.descriptors.values() if vd["name"] == name][0]
+
+    def update(self, valueDescriptor):
+        self.descriptors[valueDescriptor["id"]] = valueDescriptor
+        return True
+
+    def deleteByName(self, name):
+        self.descriptors = {}
+        return True
+
+
+class CachingValueDescriptorClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.delegate = _CountingValueDescriptorClient()
+        self.client = CachingValueDescriptorClient(self.delegate)
+
+    def testRepeatedLookupsHitCache(self):
+        for _ in range(3):
+            self.assertEqual("vd1", self.client.valueDescriptorByName(TEST_NAME)["id"])
+            self.assertEqual(TEST_NAME, self.client.valueDescriptor("vd1")["name"])
+        self.assertEqual(2, self.delegate.calls)
+        self.assertEqual(4, self.client.stats().hits)
+
+    def testListingPopulatesIdAndNameEntries(self):
+        self.client.valueDescriptors()
+        self.client.valueDescriptor("vd1")
+        self.client.valueDescriptorByName(TEST_NAME)
+        self.assertEqual(1, self.delegate.calls)
+
+    def testUpdateInvalidates(self):
+        self.client.valueDescriptor("vd1")
+        self.client.update({"id": "vd1", "name": TEST_NAME, "max": 10})
+        self.assertEqual(10, self.client.valueDescriptor("vd1")["max"])
+
+    def testDeleteByNameInvalidates(self):
+        self.client.valueDescriptors()
+        self.client.deleteByName(TEST_NAME)
+        self.assertEqual([], self.client.valueDescriptors())
+
+
+if __name__ == "__main__":
+    unittest.main()
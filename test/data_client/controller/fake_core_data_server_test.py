@@ -0,0 +1,99 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import time
+import unittest
+
+from data_client.domain import core
+from data_client.domain.common import ValueDescriptor
+from data_client.transport.http_session_pool import HttpError
+from data_client.transport.http_session_pool import HttpSessionPool
+from data_client.transport.http_session_pool import NotFoundException
+from test.fake_core_data import FakeCoreDataServer
+
+
+class FakeCoreDataServerTest(unittest.TestCase):
+    """Drives the fake through the same RestTarget calls the client impls make."""
+
+    def setUp(self):
+        self.server = FakeCoreDataServer(seed=7).start()
+        self.server.populate(20, readingsPerEvent=2, devices=4)
+        self.pool = HttpSessionPool()
+        self.events = self.pool.target(self.server.url("event"), None,
+                                       core.eventOrReadingFromPairs)
+        self.readings = self.pool.target(self.server.url("reading"), None,
+                                         core.Reading.fromPairs)
+        self.descriptors = self.pool.target(self.server.url("valuedescriptor"), None,
+                                            ValueDescriptor.fromPairs)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def testPing(self):
+        self.assertEqual("pong", self.pool.target(self.server.url("ping")).get())
+
+    def testEventQueries(self):
+        events = self.events.get("device", "device-1", 100)
+        self.assertEqual(5, len(events))
+        self.assertTrue(all(e.device == "device-1" for e in events))
+        self.assertEqual(2, len(events[0].readings))
+        self.assertEqual(events[0], self.events.get(events[0].id))
+        ranged = self.events.get(events[0].created, events[-1].created, 3)
+        self.assertEqual(3, len(ranged))
+        self.assertEqual(events[0].created, ranged[0].created)
+
+    def testAddMarkPushedAndScrub(self):
+        id = self.events.post(core.Event(device="d9", readings=[
+            core.Reading(device="d9", name="temperature", value="1")]))
+        self.assertEqual(id, self.events.get(id).id)
+        self.assertTrue(self.events.put(None, "id", id))
+        self.assertTrue(self.events.get(id).pushed)
+        self.assertEqual(1, self.events.delete("scrub"))
+        with self.assertRaises(NotFoundException):
+            self.events.get(id)
+
+    def testReadingsJoinValueDescriptors(self):
+        self.assertEqual(10, len(self.readings.get("uomlabel", "C", 10)))
+        self.assertEqual([], self.readings.get("type", "S", 10))
+        self.assertEqual(2, len(self.readings.get("name", "temperature", "device", "device-0",
+                                                  2)))
+
+    def testValueDescriptors(self):
+        descriptor = self.descriptors.get("name", "temperature")
+        self.assertEqual("C", descriptor.uomLabel)
+        self.assertEqual([descriptor], self.descriptors.get("devicename", "device-2"))
+        self.assertTrue(self.descriptors.delete("name", "temperature"))
+        with self.assertRaises(NotFoundException):
+            self.descriptors.get(descriptor.id)
+
+    def testErrorInjection(self):
+        self.server.errorRate = 1.0
+        with self.assertRaises(HttpError) as raised:
+            self.readings.get()
+        self.assertEqual(503, raised.exception.status)
+
+    def testLatencyInjection(self):
+        self.server.latency = 0.05
+        started = time.perf_counter()
+        self.pool.target(self.server.url("ping")).get()
+        self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import threading
+import time
+import unittest
+
+from data_client.controller import fan_out_query
+from data_client.transport.http_session_pool import NotFoundException
+
+
+class _SlowReadingClient(object):
+
+    def __init__(self):
+        self.inFlight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def readings(self, deviceId, limit):
+        with self.lock:
+            self.inFlight += 1
+            self.peak = max(self.peak, self.inFlight)
+        try:
+            time.sleep(0.01)
+            if deviceId == "unknown":
+                raise NotFoundException(404, "Not Found")
+            return [{"device": deviceId}] * limit
+        finally:
+            with self.lock:
+                self.inFlight -= 1
+
+
+class FanOutQueryTest(unittest.TestCase):
+
+    def testAllDevicesAreQueriedWithinConcurrencyLimit(self):
+        client = _SlowReadingClient()
+        devices = ["device-%d" % i for i in range(40)]
+        results = list(fan_out_query.readingsForDevices(client, devices, 2, concurrency=8))
+        self.assertEqual(set(devices), set(r.key for r in results))
+        self.assertTrue(all(r.ok and len(r.value) == 2 for r in results))
+        self.assertLessEqual(client.peak, 8)
+        self.assertGreater(client.peak, 1)
+
+    def testPartialFailureIsReported(self):
+        client = _SlowReadingClient()
+        results = dict((r.key, r) for r in
+                       fan_out_query.readingsForDevices(client, ["a", "unknown", "b"], 1))
+        self.assertIsInstance(results["unknown"].error, NotFoundException)
+        self.assertTrue(results["a"].ok and results["b"].ok)
+
+    def testEventsForDevices(self):
+        class EventClient(object):
+            def eventsForDevice(self, deviceId, limit):
+                return [deviceId] * limit
+
+        results = list(fan_out_query.eventsForDevices(EventClient(), ["a"], 3))
+        self.assertEqual(["a", "a", "a"], results[0].value)
+
+    def testAsyncFanOut(self):
+        async def readings(deviceId):
+            await asyncio.sleep(0.001)
+            if deviceId == "unknown":
+                raise NotFoundException(404, "Not Found")
+            return [deviceId]
+
+        async def collect():
+            return [r async for r in fan_out_query.fanOutAsync(readings, ["a", "unknown", "b"],
+                                                               concurrency=2)]
+
+        results = asyncio.run(collect())
+        self.assertEqual(["a", "b"], sorted(r.key for r in results if r.ok))
+        self.assertEqual(["unknown"], [r.key for r in results if not r.ok])
+
+
+if __name__ == "__main__":
+    unittest.main()
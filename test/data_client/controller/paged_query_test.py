@@ -0,0 +1,85 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import unittest
+
+from data_client.controller import paged_query
+
+
+class _FakeEventClient(object):
+
+    def __init__(self, events):
+        self.store = events
+        self.calls = []
+
+    def events(self, start, end, limit):
+        self.calls.append((start, end, limit))
+        matching = [e for e in self.store
+                    if e["created"] is None or start <= e["created"] <= end]
+        return sorted(matching, key=lambda e: e["created"] or 0)[:limit]
+
+
+def _events(timestamps):
+    return [{"id": "e%d" % i, "created": ts, "readings": [{"id": "r%d" % i}]}
+            for i, ts in enumerate(timestamps)]
+
+
+class PagedQueryTest(unittest.TestCase):
+
+    def testWalksWholeRangeInPages(self):
+        client = _FakeEventClient(_events(range(1000, 1025)))
+        ids = [e["id"] for e in paged_query.iterEvents(client, 0, 5000, pageSize=10)]
+        self.assertEqual(["e%d" % i for i in range(25)], ids)
+        self.assertTrue(all(limit == 10 for _, _, limit in client.calls))
+
+    def testSharedTimestampsAcrossPageBoundary(self):
+        client = _FakeEventClient(_events([1, 2, 3, 3, 3, 3, 4, 5]))
+        ids = [e["id"] for e in paged_query.iterEvents(client, 0, 10, pageSize=4)]
+        self.assertEqual(["e%d" % i for i in range(8)], ids)
+
+    def testMoreRecordsAtOneInstantThanAPageHolds(self):
+        client = _FakeEventClient(_events([1] + [2] * 9 + list(range(3, 10))))
+        ids = [e["id"] for e in paged_query.iterEvents(client, 0, 10, pageSize=3)]
+        self.assertEqual(["e%d" % i for i in range(17)], ids)
+        self.assertEqual(3, client.calls[-1][2], "page size returns to normal after the instant")
+
+    def testRecordsWithoutTimestampAreSkipped(self):
+        client = _FakeEventClient(_events([None, 1, 2, 3, 4]))
+        ids = [e["id"] for e in paged_query.iterEvents(client, 0, 10, pageSize=2)]
+        self.assertEqual(["e1", "e2", "e3", "e4"], ids)
+
+    def testWithoutPrefetch(self):
+        client = _FakeEventClient(_events(range(7)))
+        events = list(paged_query.iterEvents(client, 0, 10, pageSize=2, prefetch=False))
+        self.assertEqual(7, len(events))
+
+    def testReadingsAreFlattened(self):
+        client = _FakeEventClient(_events(range(5)))
+        readings = list(paged_query.iterReadings(client, 0, 10, pageSize=2))
+        self.assertEqual(["r%d" % i for i in range(5)], [r["id"] for r in readings])
+
+    def testStopsEarlyWithoutFetchingEverything(self):
+        client = _FakeEventClient(_events(range(100)))
+        iterator = paged_query.iterEvents(client, 0, 1000, pageSize=10)
+        next(iterator)
+        iterator.close()
+        self.assertLessEqual(len(client.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
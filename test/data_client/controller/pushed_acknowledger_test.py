@@ -0,0 +1,112 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import threading
+import time
+import unittest
+
+from data_client.controller.pushed_acknowledger import PushedAcknowledger
+from data_client.transport.http_session_pool import HttpError
+from data_client.transport.http_session_pool import NotFoundException
+from data_client.transport.resilience import Resilience
+from data_client.transport.resilience import RetryBudget
+
+
+class _FakeEventClient(object):
+
+    def __init__(self):
+        self.pushed = set()
+        self.attempts = {}
+        self.inFlight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def markedPushed(self, id):
+        with self.lock:
+            self.inFlight += 1
+            self.peak = max(self.peak, self.inFlight)
+            self.attempts[id] = self.attempts.get(id, 0) + 1
+            attempts = self.attempts[id]
+        try:
+            time.sleep(0.002)
+            if id == "unknown":
+                raise NotFoundException(404, "Not Found")
+            if id.startswith("flaky") and attempts < 3:
+                raise HttpError(503, "Service Unavailable")
+            if id == "broken":
+                raise HttpError(500, "Internal Server Error")
+            with self.lock:
+                self.pushed.add(id)
+            return True
+        finally:
+            with self.lock:
+                self.inFlight -= 1
+
+
+class PushedAcknowledgerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = _FakeEventClient()
+        self.acknowledger = PushedAcknowledger(self.client, window=4, maxRetries=3,
+                                               retryDelay=0.001)
+
+    def tearDown(self):
+        self.acknowledger.close()
+
+    def testIdsAreAcknowledgedWithinWindow(self):
+        ids = ["event-%d" % i for i in range(100)]
+        self.acknowledger.acknowledgeAll(ids)
+        result = self.acknowledger.flush(timeout=10)
+        self.assertTrue(result.ok)
+        self.assertEqual(100, result.acknowledged)
+        self.assertEqual(set(ids), self.client.pushed)
+        self.assertLessEqual(self.client.peak, 4)
+
+    def testFailuresAreRetriedAndReported(self):
+        self.acknowledger.acknowledgeAll(["flaky-1", "unknown", "broken", "ok"])
+        result = self.acknowledger.flush(timeout=10)
+        self.assertEqual(2, result.acknowledged)
+        self.assertEqual(["broken", "unknown"], sorted(result.failed))
+        self.assertEqual(3, self.client.attempts["flaky-1"])
+        self.assertEqual(1, self.client.attempts["unknown"])
+        self.assertEqual(4, self.client.attempts["broken"])
+
+    def testRetriesSpendTheSharedBudget(self):
+        budget = RetryBudget(ratio=1.0, minPerSecond=0.0, capacity=1.0)
+        budget.deposit()
+        self.client.resilience = Resilience(retryBudget=budget)
+        self.acknowledger.acknowledgeAll(["broken"])
+        self.assertEqual(["broken"], self.acknowledger.flush(timeout=10).failed)
+        # one token: the first attempt plus a single retry
+        self.assertEqual(2, self.client.attempts["broken"])
+        self.assertFalse(budget.withdraw())
+
+    def testExplicitBudgetWins(self):
+        self.acknowledger.retryBudget = RetryBudget(ratio=0.0, minPerSecond=0.0, capacity=0.0)
+        self.acknowledger.acknowledge("broken")
+        self.acknowledger.flush(timeout=10)
+        self.assertEqual(1, self.client.attempts["broken"])
+
+    def testFlushResetsCounts(self):
+        self.acknowledger.acknowledge("a")
+        self.acknowledger.flush()
+        self.assertEqual(0, self.acknowledger.flush().acknowledged)
+
+
+if __name__ == "__main__":
+    unittest.main()
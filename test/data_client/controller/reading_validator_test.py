@@ -0,0 +1,138 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import unittest
+
+from data_client.controller.reading_validator import ReadingValidationException
+from data_client.controller.reading_validator import ReadingValidator
+from data_client.controller.reading_validator import ValidatingEventClient
+from data_client.controller.reading_validator import compileCheck
+from data_client.domain.common import ValueDescriptor
+from data_client.domain.core import Event
+from data_client.domain.core import Reading
+from data_client.transport.http_session_pool import NotFoundException
+
+
+class _CountingValueDescriptorClient(object):
+
+    def __init__(self):
+        self.listings = 0
+        self.lookups = 0
+        self.descriptors = {
+            "temperature": ValueDescriptor(name="temperature", type="F", min="-40", max="85",
+                                           uomLabel="C"),
+            "count": {"name": "count", "type": "I", "min": 0, "max": None, "uomLabel": ""},
+            "label": {"name": "label", "type": "S"},
+        }
+        self.hidden = {}
+
+    def valueDescriptors(self):
+        self.listings += 1
+        return list(self.descriptors.values())
+
+    def valueDescriptorByName(self, name):
+        self.lookups += 1
+        if name in self.hidden:
+            return self.hidden[name]
+        raise NotFoundException(404, "Not Found")
+
+
+class _RecordingEventClient(object):
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, event):
+        self.added.append(event)
+        return "id%d" % len(self.added)
+
+
+def _event(*pairs):
+    return Event(device="device1", readings=[Reading(name=n, value=v) for n, v in pairs])
+
+
+class ReadingValidatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.client = _CountingValueDescriptorClient()
+        self.validator = ReadingValidator(self.client, refreshInterval=60.0,
+                                          clock=lambda: self.now)
+
+    def testCompiledChecks(self):
+        check = compileCheck({"type": "Int64", "min": "0", "max": "10"})
+        self.assertIsNone(check("7"))
+        self.assertIn("below", check("-1"))
+        self.assertIn("above", check(11))
+        self.assertIn("integer", check("7.5"))
+        self.assertIsNone(compileCheck({"type": "B"})("true"))
+        self.assertIn("boolean", compileCheck({"type": "B"})("yes"))
+        self.assertIn("JSON", compileCheck({"type": "J"})("{"))
+        self.assertIn("float", compileCheck({"type": "F"})("nan"))
+        self.assertIsNone(compileCheck({"type": "S", "min": "5"})("anything"))
+        self.assertIn("unit", compileCheck({"type": "F", "uomLabel": "C"}, unit="F")("1"))
+
+    def testBatchReportsEveryViolation(self):
+        events = [_event(("temperature", "21.5"), ("count", "3")),
+                  _event(("temperature", "120"), ("label", "x")),
+                  _event(("count", "-1"), ("pressure", "1013"))]
+        violations = self.validator.validateEvents(events)
+        self.assertEqual([(1, 0, "temperature"), (2, 0, "count"), (2, 1, "pressure")],
+                         [(v.event, v.reading, v.name) for v in violations])
+        self.assertIn("no value descriptor", violations[2].message)
+        valid, _ = self.validator.partition(events)
+        self.assertEqual([events[0]], valid)
+        self.assertEqual(1, self.client.listings)
+        self.assertEqual(3, self.validator.compiled)
+
+    def testRefreshRecompilesOnlyChangedDescriptors(self):
+        self.assertEqual([], self.validator.validateEvents([_event(("count", "5"))]))
+        self.client.descriptors["count"] = dict(self.client.descriptors["count"], max="4")
+        self.now += 30
+        self.assertEqual([], self.validator.validateEvents([_event(("count", "5"))]))
+        self.now += 30
+        self.assertEqual(1, len(self.validator.validateEvents([_event(("count", "5"))])))
+        self.assertEqual(2, self.client.listings)
+        self.assertEqual(4, self.validator.compiled)
+
+    def testUnknownNamesAreLookedUpOncePerRefresh(self):
+        for _ in range(3):
+            self.assertEqual(1, len(self.validator.validateEvents([_event(("humidity", "1"))])))
+        self.assertEqual(1, self.client.lookups)
+        self.client.hidden["humidity"] = {"name": "humidity", "type": "F", "max": "100"}
+        self.now += 60
+        self.assertEqual([], self.validator.validateEvents([_event(("humidity", "55"))]))
+        self.assertEqual(2, self.client.lookups)
+
+    def testUnitsAreEnforced(self):
+        validator = ReadingValidator(self.client, units={"temperature": "F"})
+        violations = validator.validateEvents([_event(("temperature", "70"))])
+        self.assertIn("unit", violations[0].message)
+
+    def testInvalidEventIsNotSent(self):
+        delegate = _RecordingEventClient()
+        client = ValidatingEventClient(delegate, self.validator)
+        self.assertEqual("id1", client.add(_event(("temperature", "20"))))
+        with self.assertRaises(ReadingValidationException) as raised:
+            client.add(_event(("temperature", "hot")))
+        self.assertEqual(1, len(raised.exception.violations))
+        self.assertEqual(1, len(delegate.added))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from data_client.controller.retention_manager import DAY
+from data_client.controller.retention_manager import RetentionManager
+from data_client.controller.retention_manager import RetentionPolicy
+from data_client.domain.core import Event
+
+NOW = 1500000000.0
+
+
+class _FakeEventClient(object):
+
+    def __init__(self, origins, devices=None):
+        self.origins = list(origins)
+        self.devices = dict(devices or {})
+        self.calls = []
+
+    def events(self, start, end, limit):
+        return [Event(created=o) for o in sorted(self.origins) if start <= o <= end][:limit]
+
+    def scrubOldEvents(self, age):
+        self.calls.append(("scrubOldEvents", age))
+        cutoff = NOW * 1000 - age
+        kept = [o for o in self.origins if o >= cutoff]
+        deleted = len(self.origins) - len(kept)
+        self.origins = kept
+        return deleted
+
+    def deleteByDevice(self, deviceId):
+        self.calls.append(("deleteByDevice", deviceId))
+        return self.devices.pop(deviceId, 0)
+
+    def scrubPushedEvents(self):
+        self.calls.append(("scrubPushedEvents",))
+        return 0
+
+
+class RetentionManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stateFile = os.path.join(self.directory, "retention.json")
+        self.origins = [NOW * 1000 - d * DAY - 1 for d in range(10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _manager(self, client, **kwargs):
+        policy = RetentionPolicy(maxAge=3 * DAY, devices=["retired"], scrubPushed=True)
+        return RetentionManager(client, policy, opsPerSecond=0, clock=lambda: NOW, **kwargs)
+
+    def testPolicyIsSlicedAndApplied(self):
+        client = _FakeEventClient(self.origins, {"retired": 5})
+        progress = []
+        result = self._manager(client, onProgress=progress.append).run()
+        self.assertEqual(7 + 5, result.deleted)
+        self.assertTrue(result.done)
+        scrubAges = [call[1] for call in client.calls if call[0] == "scrubOldEvents"]
+        self.assertEqual(scrubAges, sorted(scrubAges, reverse=True))
+        self.assertEqual(3 * DAY, scrubAges[-1])
+        self.assertEqual(len(client.calls), len(progress))
+        self.assertEqual([p.completedSteps for p in progress], list(range(1, len(progress) + 1)))
+
+    def testHistoryOlderThanAnyHorizonIsScrubbedInSlices(self):
+        client = _FakeEventClient([NOW * 1000 - d * DAY - 1 for d in range(1000)])
+        deleted = []
+        result = self._manager(client, onProgress=lambda p: deleted.append(p.deleted)).run()
+        self.assertEqual(997, result.deleted)
+        perStep = [after - before for before, after in zip([0] + deleted, deleted)]
+        self.assertLessEqual(max(perStep), 1)
+
+    def testNothingOldMeansASingleScrub(self):
+        client = _FakeEventClient([NOW * 1000 - DAY])
+        self._manager(client).run()
+        self.assertEqual([("scrubOldEvents", 3 * DAY)],
+                         [call for call in client.calls if call[0] == "scrubOldEvents"])
+
+    def testInterruptedRunResumes(self):
+        client = _FakeEventClient(self.origins, {"retired": 5})
+        manager = self._manager(client, stateFile=self.stateFile)
+        manager.onProgress = lambda progress: progress.completedSteps == 3 and manager.stop()
+        partial = manager.run()
+        self.assertEqual(3, partial.completedSteps)
+        self.assertTrue(os.path.exists(self.stateFile))
+
+        resumed = self._manager(client, stateFile=self.stateFile).run()
+        self.assertTrue(resumed.done)
+        self.assertEqual(12, resumed.deleted)
+        self.assertEqual(resumed.totalSteps, len(client.calls))
+        self.assertFalse(os.path.exists(self.stateFile))
+
+
+if __name__ == "__main__":
+    unittest.main()
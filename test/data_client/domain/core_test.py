@@ -0,0 +1,83 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import unittest
+
+from data_client.domain import common
+from data_client.domain import core
+from data_client.domain.common import ValueDescriptor
+from data_client.domain.core import Event
+from data_client.domain.core import Reading
+
+
+class CoreDomainTest(unittest.TestCase):
+
+    def testEventRoundTrip(self):
+        event = Event(id="e1", device="thermostat", origin=123)
+        event.addReading(Reading(id="r1", name="temperature", value="72", origin=123))
+        decoded = core.decodeEvents(event.toJson())
+        self.assertEqual(event, decoded)
+        self.assertIsInstance(decoded.readings[0], Reading)
+
+    def testToJsonMatchesStdlibEncoding(self):
+        reading = Reading(id="r1", name="température", value="72", pushed=5)
+        self.assertEqual(json.loads(reading.toJson()),
+                         {"id": "r1", "created": 0, "modified": 0, "origin": 0, "pushed": 5,
+                          "name": "température", "value": "72"})
+
+    def testUnknownKeysAreIgnored(self):
+        readings = core.decodeReadings(b'[{"id": "r1", "_class": "x", "value": "1"}]')
+        self.assertEqual([Reading(id="r1", value="1")], readings)
+
+    def testEventListAndBareReadings(self):
+        events = core.decodeEvents('[{"id": "e1", "readings": null}, {"id": "e2", "readings":'
+                                   ' [{"id": "r1"}]}]')
+        self.assertEqual([], events[0].readings)
+        self.assertEqual("r1", events[1].readings[0].id)
+        self.assertIsInstance(core.decodeEvents('[{"id": "r2", "name": "t", "value": "1"}]')[0],
+                              Reading)
+
+    def testUnknownShapesStayDicts(self):
+        body = '{"status": 500, "message": "internal error", "name": "x"}'
+        self.assertEqual({"status": 500, "message": "internal error", "name": "x"},
+                         core.decodeEvents(body))
+        self.assertEqual([{"id": "r2"}], core.decodeEvents('[{"id": "r2"}]'))
+
+    def testNestedObjectsAreEncoded(self):
+        event = Event(id="e1", readings=[Reading(id="r1", value="1")])
+        self.assertEqual(json.loads(event.toJson()),
+                         {"id": "e1", "created": 0, "modified": 0, "origin": 0, "pushed": 0,
+                          "readings": [{"id": "r1", "created": 0, "modified": 0, "origin": 0,
+                                        "pushed": 0, "value": "1"}]})
+
+    def testSlotsPreventStrayAttributes(self):
+        with self.assertRaises(AttributeError):
+            Reading().unit = "F"
+        with self.assertRaises(TypeError):
+            Reading(unit="F")
+
+    def testValueDescriptorLabels(self):
+        vd = common.decodeValueDescriptors('{"name": "temperature", "labels": ["a", "b"],'
+                                           ' "min": "0", "max": "100"}')
+        self.assertEqual(ValueDescriptor(name="temperature", labels=["a", "b"], min="0",
+                                         max="100"), vd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import abc
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from data_client.instrumentation import metrics
+from data_client.instrumentation.exporters import OpenTelemetrySpanHook
+from data_client.instrumentation.exporters import PrometheusExporter
+from data_client.transport.http_session_pool import HttpSessionPool
+
+
+class _Client(object):
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    def reading(self, id):
+        """Reading for id"""
+
+    @abc.abstractmethod
+    def readingAsync(self, id):
+        """Reading for id, as a coroutine"""
+
+
+@metrics.instrumented
+class _ClientImpl(_Client):
+
+    def reading(self, id):
+        if id == "missing":
+            raise KeyError(id)
+        return id
+
+    async def readingAsync(self, id):
+        return id
+
+    def helper(self):
+        return "untouched"
+
+
+class _Span(object):
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.exceptions = []
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, error):
+        self.exceptions.append(error)
+
+    def end(self):
+        self.ended = True
+
+
+class _Tracer(object):
+
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None):
+        span = _Span(name, attributes or {})
+        self.spans.append(span)
+        return span
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = _Tracer()
+        self.inst = metrics.enable(metrics.Instrumentation(
+            spanHooks=[OpenTelemetrySpanHook(self.tracer)]))
+
+    def tearDown(self):
+        metrics.disable()
+
+    def testDisabledCallsStraightThrough(self):
+        metrics.disable()
+        self.assertEqual("r1", _ClientImpl().reading("r1"))
+        self.assertEqual(({}, {}), self.inst.registry.snapshot())
+
+    def testOnlyInterfaceMethodsAreWrapped(self):
+        self.assertIsNot(_ClientImpl.reading, vars(_Client)["reading"])
+        self.assertEqual("untouched", _ClientImpl().helper())
+        self.assertFalse(hasattr(_ClientImpl.helper, "__wrapped__"))
+
+    def testCallLatencyAndSpans(self):
+        _ClientImpl().reading("r1")
+        histograms, _ = self.inst.registry.snapshot()
+        histogram = histograms[("call_seconds", (("method", "_ClientImpl.reading"),))]
+        self.assertEqual(1, histogram.count)
+        self.assertEqual(1, len(self.tracer.spans))
+        self.assertEqual("_ClientImpl.reading", self.tracer.spans[0].name)
+        self.assertTrue(self.tracer.spans[0].ended)
+
+    def testErrorsAreCountedAndRecordedOnSpan(self):
+        with self.assertRaises(KeyError):
+            _ClientImpl().reading("missing")
+        _, counters = self.inst.registry.snapshot()
+        key = ("call_errors_total", (("method", "_ClientImpl.reading"), ("error", "KeyError")))
+        self.assertEqual(1, counters[key])
+        span = self.tracer.spans[0]
+        self.assertTrue(span.attributes["error"])
+        self.assertIsInstance(span.exceptions[0], KeyError)
+
+    def testCoroutineMethodsAreTimed(self):
+        self.assertEqual("r2", asyncio.run(_ClientImpl().readingAsync("r2")))
+        histograms, _ = self.inst.registry.snapshot()
+        self.assertIn(("call_seconds", (("method", "_ClientImpl.readingAsync"),)), histograms)
+
+    def testTransportRecordsBytesAndPoolWait(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        pool = HttpSessionPool()
+        try:
+            url = "http://127.0.0.1:%d/api/v1/event" % server.server_address[1]
+            entity = pool.target(url).get("abc")
+        finally:
+            pool.close()
+            server.shutdown()
+            server.server_close()
+        histograms, counters = self.inst.registry.snapshot()
+        self.assertEqual(0, counters[("request_bytes_total", ())])
+        self.assertEqual(len(json.dumps(entity)), counters[("response_bytes_total", ())])
+        self.assertEqual(1, histograms[("pool_wait_seconds", ())].count)
+
+    def testPrometheusRendering(self):
+        _ClientImpl().reading("r1")
+        self.inst.recordRetry("stale-connection")
+        text = PrometheusExporter(self.inst.registry).render()
+        self.assertIn("# TYPE core_data_client_call_seconds histogram", text)
+        bucket = 'core_data_client_call_seconds_bucket{method="_ClientImpl.reading",le="+Inf"} 1'
+        self.assertIn(bucket, text)
+        self.assertIn('core_data_client_call_seconds_count{method="_ClientImpl.reading"} 1', text)
+        self.assertIn('core_data_client_retries_total{reason="stale-connection"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import subprocess
+import sys
+import unittest
+
+from data_client.lazy_import import OptionalModule
+from data_client.lazy_import import moduleGetattr
+from data_client.transport import json_codec
+
+HEAVY = ("asyncio", "orjson", "numpy", "zstandard", "inspect")
+
+
+# the client impls import platform modules that are not dependencies of this package
+_STUB_PLATFORM = "from test import platform_stub; platform_stub.install(); "
+
+
+def _loadedBy(module, stubPlatform=False):
+    script = "import sys, %s; print(' '.join(sys.modules))" % module
+    output = subprocess.run(
+        [sys.executable, "-c", (_STUB_PLATFORM if stubPlatform else "") + script],
+        capture_output=True, text=True, check=True)
+    return set(output.stdout.split())
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def testOptionalModule(self):
+        self.assertIs(json_codec, OptionalModule("data_client.transport.json_codec")())
+        self.assertIsNone(OptionalModule("no_such_module_anywhere")())
+
+    def testModuleGetattr(self):
+        getattr_ = moduleGetattr("m", {"json": OptionalModule("json")})
+        self.assertEqual("json", getattr_("json").__name__)
+        with self.assertRaises(AttributeError):
+            getattr_("other")
+        self.assertIs(json_codec.orjson, json_codec._orjson())
+
+    def testTransportDoesNotLoadHeavyModules(self):
+        loaded = _loadedBy("data_client.transport.http_session_pool, "
+                           "data_client.transport.compression, data_client.analytics.columnar")
+        self.assertEqual([], [name for name in HEAVY if name in loaded])
+
+    def testClientImplsDoNotLoadHeavyModules(self):
+        loaded = _loadedBy("data_client.controller.ping_core_data_client_impl, "
+                           "data_client.controller.async_event_client_impl", stubPlatform=True)
+        self.assertEqual([], [name for name in HEAVY if name in loaded])
+        self.assertNotIn("data_client.consul.consul_catalog_watcher", loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
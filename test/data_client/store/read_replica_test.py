@@ -0,0 +1,186 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from data_client.domain import core
+from data_client.store.read_replica import ReadReplica
+from data_client.store.read_replica import ReplicaEventClient
+from data_client.store.read_replica import ReplicaReadingClient
+from data_client.transport.http_session_pool import HttpSessionPool
+from test.fake_core_data import FakeCoreDataServer
+
+
+class _EventClient(object):
+    """The slice of EventClientImpl a replica uses, over a plain RestTarget."""
+
+    def __init__(self, target):
+        self.target = target
+
+    def events(self, start=None, end=None, limit=None):
+        return self.target.get(start, end, limit)
+
+
+class _FailingAfter(object):
+
+    def __init__(self, eventClient, pages):
+        self.eventClient = eventClient
+        self.pages = pages
+
+    def events(self, start=None, end=None, limit=None):
+        if self.pages == 0:
+            raise ConnectionError("core data went away")
+        self.pages -= 1
+        return self.eventClient.events(start, end, limit)
+
+
+class _ReadingClient(object):
+
+    def __init__(self, server):
+        self.server = server
+
+    def add(self, reading):
+        return self.server.addReading(reading.toDict())
+
+
+class _CountingClient(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def readingsByName(self, name, limit):
+        self.calls.append("readingsByName")
+        return []
+
+    def events(self, start=None, end=None, limit=None):
+        self.calls.append("events")
+        return []
+
+
+class ReadReplicaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoreDataServer().start()
+        self.server.populate(30, readingsPerEvent=2, devices=3, names=("temperature", "humidity"))
+        self.pool = HttpSessionPool()
+        # the fake stamps records a millisecond apart, which can run ahead of the wall clock
+        self.now = time.time() + 60
+        self.replica = ReadReplica(
+            _EventClient(self.pool.target(self.server.url("event"), None,
+                                          core.eventOrReadingFromPairs)),
+            pageSize=7, maxStaleness=5.0, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.replica.close()
+        self.pool.close()
+        self.server.stop()
+
+    def testSyncMirrorsEventsAndReadings(self):
+        self.assertEqual(30, self.replica.sync())
+        expected = sorted((r for r in self.server.readings.values() if r["name"] == "humidity"),
+                          key=lambda r: r["created"])[:5]
+        local = self.replica.readingsByName("humidity", 5)
+        self.assertEqual([r["id"] for r in expected], [r.id for r in local])
+        self.assertEqual(expected[0]["value"], local[0].value)
+
+    def testNameAndDevice(self):
+        self.replica.sync()
+        local = self.replica.readingsByNameAndDevice("temperature", "device-1", 100)
+        self.assertEqual(10, len(local))
+        self.assertTrue(all(r.device == "device-1" and r.name == "temperature" for r in local))
+
+    def testEventsCarryTheirReadings(self):
+        self.replica.sync()
+        remote = self.pool.target(self.server.url("event"), None,
+                                  core.eventOrReadingFromPairs).get(0, 2 ** 62, 4)
+        self.assertEqual(remote, self.replica.events(0, 2 ** 62, 4))
+
+    def testIncrementalSyncOnlyFetchesNewEvents(self):
+        self.replica.sync()
+        requests = self.server.requests
+        self.server.populate(3, readingsPerEvent=1)
+        self.now += 1
+        self.replica.overlap = 0
+        self.replica.sync()
+        self.assertEqual(33, len(self.replica.events(0, 2 ** 62, None)))
+        self.assertEqual(1, self.server.requests - requests)
+
+    def testClientsFallBackWhenStale(self):
+        delegate = _CountingClient()
+        readings = ReplicaReadingClient(delegate, self.replica)
+        events = ReplicaEventClient(delegate, self.replica)
+        readings.readingsByName("temperature", 10)
+        self.assertEqual(["readingsByName"], delegate.calls)
+        self.replica.sync()
+        self.assertEqual(10, len(readings.readingsByName("temperature", 10)))
+        self.assertEqual(5, len(events.events(0, 2 ** 62, 5)))
+        self.assertEqual(1, len(delegate.calls))
+        events.events()
+        self.now += 6
+        readings.readingsByName("temperature", 10)
+        self.assertEqual(["readingsByName", "events", "readingsByName"], delegate.calls)
+
+    def testCursorSurvivesReopen(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "replica.db")
+            replica = ReadReplica(self.replica.eventClient, path, clock=lambda: self.now)
+            replica.sync()
+            cursor = replica.cursor()
+            replica.close()
+            reopened = ReadReplica(self.replica.eventClient, path)
+            self.assertEqual(cursor, reopened.cursor())
+            self.assertEqual(30, len(reopened.events(0, 2 ** 62, None)))
+            reopened.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def testEachPageIsCommittedAsItArrives(self):
+        eventClient = self.replica.eventClient
+        self.replica.eventClient = _FailingAfter(eventClient, 2)
+        with self.assertRaises(ConnectionError):
+            self.replica.sync()
+        self.assertEqual(7, len(self.replica.events(0, 2 ** 62, None)))
+        cursor = self.replica.cursor()
+        self.assertGreater(cursor, 0)
+        self.replica.eventClient = eventClient
+        self.replica.sync()
+        self.assertEqual(30, len(self.replica.events(0, 2 ** 62, None)))
+        self.assertGreaterEqual(self.replica.cursor(), cursor)
+
+    def testReadingsAddedWithoutAnEventAreMirrored(self):
+        self.replica.sync()
+        readings = ReplicaReadingClient(_ReadingClient(self.server), self.replica)
+        id = readings.add(core.Reading(name="pressure", device="device-1", value="1013"))
+        local = readings.readingsByName("pressure", 10)
+        self.assertEqual([id], [r.id for r in local])
+        self.assertEqual(["1013"], [r.value for r in local])
+
+    def testMaxAgePrunesOldRows(self):
+        self.replica.maxAge = 0.0
+        self.replica.sync()
+        self.assertEqual([], self.replica.events(0, 2 ** 62, None))
+        self.assertFalse(self.replica.covers(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from data_client.store.segment_queue import CorruptRecordException
+from data_client.store.segment_queue import QueueFullException
+from data_client.store.segment_queue import SegmentQueue
+
+
+class SegmentQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.queue = SegmentQueue(self.directory, segmentBytes=64, fsyncBatch=2)
+
+    def tearDown(self):
+        self.queue.close()
+        shutil.rmtree(self.directory)
+
+    def _segmentCount(self):
+        return len([name for name in os.listdir(self.directory) if name.startswith("segment-")])
+
+    def _payloads(self, records):
+        return [payload for _, payload in records]
+
+    def testFifoAcrossSegments(self):
+        for i in range(10):
+            self.queue.append(b"event-%d" % i)
+        self.assertGreater(self._segmentCount(), 1)
+        records = self.queue.peek(100)
+        self.assertEqual([b"event-%d" % i for i in range(10)], self._payloads(records))
+
+    def testCommitAdvancesAndDeletesConsumedSegments(self):
+        for i in range(10):
+            self.queue.append(b"event-%d" % i)
+        segments = self._segmentCount()
+        records = self.queue.peek(6)
+        self.queue.commit(records[-1][0])
+        self.assertEqual([b"event-6", b"event-7"], self._payloads(self.queue.peek(2)))
+        self.assertLess(self._segmentCount(), segments)
+        self.queue.commit(self.queue.peek(10)[-1][0])
+        self.assertTrue(self.queue.isEmpty())
+
+    def testBacklogSurvivesReopen(self):
+        for i in range(5):
+            self.queue.append(b"event-%d" % i)
+        self.queue.commit(self.queue.peek(2)[-1][0])
+        self.queue.close()
+        self.queue = SegmentQueue(self.directory, segmentBytes=64)
+        self.assertEqual([b"event-2", b"event-3", b"event-4"],
+                         self._payloads(self.queue.peek(10)))
+
+    def testTornTailIsDropped(self):
+        self.queue.append(b"complete")
+        self.queue.close()
+        segment = os.path.join(self.directory, sorted(os.listdir(self.directory))[0])
+        with open(segment, "ab") as out:
+            out.write(b"\x00\x00\x00\x09\x00")
+        self.queue = SegmentQueue(self.directory, segmentBytes=64)
+        self.queue.append(b"after")
+        self.assertEqual([b"complete", b"after"], self._payloads(self.queue.peek(10)))
+
+    def testDiskBudget(self):
+        self.queue.maxBytes = 40
+        self.queue.append(b"x" * 20)
+        with self.assertRaises(QueueFullException):
+            self.queue.append(b"y" * 20)
+
+    def testCorruptRecordIsReportedThenQuarantined(self):
+        for i in range(3):
+            self.queue.append(b"event-%d" % i)
+        segment = os.path.join(self.directory, sorted(
+            name for name in os.listdir(self.directory) if name.startswith("segment-"))[0])
+        with open(segment, "r+b") as data:
+            data.seek(15 + 8)
+            data.write(b"X")
+        self.assertEqual([b"event-0"], self._payloads(self.queue.peek(10)))
+        self.queue.commit(self.queue.peek(1)[0][0])
+        with self.assertRaises(CorruptRecordException) as raised:
+            self.queue.peek(10)
+        path = self.queue.quarantine(raised.exception.position, raised.exception.record)
+        with open(path, "rb") as quarantined:
+            self.assertTrue(quarantined.read().endswith(b"Xvent-1"))
+        self.assertEqual([b"event-2"], self._payloads(self.queue.peek(10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from data_client.domain.core import Event
+from data_client.store.segment_queue import SegmentQueue
+from data_client.store.store_and_forward_event_client import StoreAndForwardEventClient
+from data_client.transport.http_session_pool import HttpError
+
+
+class _FlakyCoreData(object):
+    """Plays both EventClient and PingCoreDataClient; refuses connections when down."""
+
+    def __init__(self):
+        self.up = True
+        self.failures = []
+        self.added = []
+        self.pings = 0
+        self.lock = threading.Lock()
+
+    def add(self, event):
+        if not self.up:
+            raise ConnectionRefusedError("core data is down")
+        if self.failures:
+            raise self.failures.pop(0)
+        with self.lock:
+            self.added.append(event.device if isinstance(event, Event) else event["device"])
+            return "id-%d" % len(self.added)
+
+    def ping(self):
+        self.pings += 1
+        if not self.up:
+            raise ConnectionRefusedError("core data is down")
+        return "pong"
+
+
+class StoreAndForwardEventClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.coreData = _FlakyCoreData()
+        self.client = StoreAndForwardEventClient(self.coreData, self.coreData,
+                                                 SegmentQueue(self.directory), drainRate=0,
+                                                 batchSize=3, pingInterval=0.01)
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.directory)
+
+    def _waitForDrain(self):
+        deadline = time.monotonic() + 5
+        while not self.client.queue.isEmpty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(self.client.queue.isEmpty(), "backlog was not drained")
+
+    def testAddPassesThroughWhenOnline(self):
+        self.assertEqual("id-1", self.client.add(Event(device="d0")))
+
+    def testEventsAreQueuedAndDrainedInOrder(self):
+        self.coreData.up = False
+        for i in range(10):
+            self.assertIsNone(self.client.add(Event(device="d%d" % i)))
+        self.assertFalse(self.client.isOnline())
+        self.coreData.up = True
+        self.client.add({"device": "d10"})
+        self._waitForDrain()
+        self.assertEqual(["d%d" % i for i in range(11)], self.coreData.added)
+        self.assertTrue(self.client.isOnline())
+
+    def testOtherErrorsAreNotQueued(self):
+        self.coreData.add = lambda event: 1 / 0
+        with self.assertRaises(ZeroDivisionError):
+            self.client.add(Event(device="d0"))
+        self.assertTrue(self.client.queue.isEmpty())
+
+    def _queueWhileDown(self, count):
+        self.coreData.up = False
+        for i in range(count):
+            self.client.add(Event(device="d%d" % i))
+        self.coreData.up = True
+
+    def testServerErrorsDuringDrainKeepTheEvent(self):
+        self.coreData.failures = [HttpError(500, "Internal Server Error"),
+                                  HttpError(429, "Too Many Requests"),
+                                  HttpError(408, "Request Timeout")]
+        self._queueWhileDown(3)
+        self._waitForDrain()
+        self.assertEqual(["d0", "d1", "d2"], self.coreData.added)
+
+    def testRejectedEventIsQuarantined(self):
+        self.coreData.failures = [HttpError(400, "Bad Request")]
+        self._queueWhileDown(3)
+        self._waitForDrain()
+        self.assertEqual(["d1", "d2"], self.coreData.added)
+        self.assertEqual(1, len(os.listdir(os.path.join(self.directory, "quarantine"))))
+
+    def testUndeliverableEventIsQuarantined(self):
+        self.coreData.failures = [TypeError("unexpected reading value")]
+        self._queueWhileDown(3)
+        self._waitForDrain()
+        self.assertEqual(["d1", "d2"], self.coreData.added)
+        self.assertEqual(1, len(os.listdir(os.path.join(self.directory, "quarantine"))))
+
+    def testAddsWhileOfflineDoNotTriggerPings(self):
+        self.client.close()
+        self.client = StoreAndForwardEventClient(self.coreData, self.coreData,
+                                                 SegmentQueue(self.directory), drainRate=0,
+                                                 pingInterval=0.2)
+        self._queueWhileDown(0)
+        self.coreData.up = False
+        for i in range(200):
+            self.client.add(Event(device="d%d" % i))
+        time.sleep(0.1)
+        self.assertLessEqual(self.coreData.pings, 2)
+        self.coreData.up = True
+        self._waitForDrain()
+        self.assertEqual(200, len(self.coreData.added))
+
+    def testUnknownKeysAreDroppedWhenQueueing(self):
+        self.coreData.up = False
+        self.client.add({"device": "d0", "location": "roof"})
+        self.coreData.up = True
+        self._waitForDrain()
+        self.assertEqual(["d0"], self.coreData.added)
+
+    def testCorruptRecordIsQuarantined(self):
+        self._queueWhileDown(0)
+        self.client.close()
+        # one record per segment, so the corrupt one sits in a sealed segment
+        queue = SegmentQueue(self.directory, segmentBytes=1)
+        for i in range(3):
+            queue.append(Event(device="d%d" % i).toJson().encode("utf-8"))
+        queue.close()
+        segment = os.path.join(self.directory, sorted(
+            name for name in os.listdir(self.directory) if name.startswith("segment-"))[0])
+        with open(segment, "r+b") as data:
+            data.seek(8)
+            data.write(b"X")
+        self.client = StoreAndForwardEventClient(self.coreData, self.coreData,
+                                                 SegmentQueue(self.directory, segmentBytes=1),
+                                                 drainRate=0, batchSize=3, pingInterval=0.01)
+        self._waitForDrain()
+        self.assertEqual(["d1", "d2"], self.coreData.added)
+        self.assertEqual(1, len(os.listdir(os.path.join(self.directory, "quarantine"))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+from data_client.consul import load_balancer
+from data_client.consul.consul_catalog_watcher import ServiceInstance
+from data_client.transport.async_http_session_pool import AsyncHttpSessionPool
+from data_client.transport.async_http_session_pool import getLoopPool
+from data_client.transport.http_session_pool import NotFoundException
+from test.data_client.transport.http_session_pool_test import _Handler
+
+
+class AsyncHttpSessionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.connections = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        self.url = "http://127.0.0.1:%d/api/v1/reading" % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _run(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def testManyConcurrentRequestsShareFewConnections(self):
+        async def scenario():
+            pool = AsyncHttpSessionPool(maxConnectionsPerHost=4)
+            target = pool.target(self.url)
+            results = await asyncio.gather(*[target.get("name", i, 10) for i in range(200)])
+            await pool.close()
+            return results
+
+        results = self._run(scenario())
+        self.assertEqual(200, len(results))
+        self.assertEqual("/api/v1/reading/name/7/10", results[7]["path"])
+        self.assertLessEqual(self.server.connections, 4, "Per-host connection cap exceeded")
+
+    def testEachEventLoopGetsItsOwnPool(self):
+        async def scenario():
+            pool = getLoopPool(maxConnectionsPerHost=2)
+            self.assertIs(pool, getLoopPool())
+            # leaves idle keep-alive connections behind, bound to this loop
+            result = await pool.target(self.url).get("name", "first", 1)
+            return pool, result
+
+        firstPool, first = self._run(scenario())
+        secondPool, second = self._run(scenario())
+        self.assertIsNot(firstPool, secondPool)
+        self.assertEqual("/api/v1/reading/name/first/1", first["path"])
+        self.assertEqual(first, second)
+
+    def testPostIsNotResentOnADroppedConnection(self):
+        async def scenario():
+            pool = AsyncHttpSessionPool()
+            target = pool.target(self.url)
+            try:
+                await target.get("abc")
+                with self.assertRaises((ConnectionError, asyncio.IncompleteReadError)):
+                    await target.post({"device": "d1"}, "drop")
+            finally:
+                await pool.close()
+
+        self._run(scenario())
+        self.assertEqual(1, self.server.drops)
+
+    def testCancelledRequestIsNotAFailure(self):
+        balancer = load_balancer.RoundRobinLoadBalancer(maxFailures=1)
+        instance = ServiceInstance("core-data", "127.0.0.1", self.server.server_address[1])
+
+        async def hang(method, uri, body, headers):
+            await asyncio.sleep(10)
+
+        async def scenario():
+            pool = AsyncHttpSessionPool()
+            pool.request = hang
+            request = asyncio.ensure_future(
+                pool.target(self.url, balancer.tracker(instance)).get("abc"))
+            await asyncio.sleep(0.01)
+            request.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await request
+            await pool.close()
+
+        self._run(scenario())
+        self.assertFalse(balancer.isEjected(instance))
+        self.assertEqual(0, balancer._statsFor(instance).outstanding)
+
+    def testPostAndText(self):
+        async def scenario():
+            pool = AsyncHttpSessionPool()
+            target = pool.target(self.url)
+            echoed = await target.post({"name": "temperature"})
+            pong = await target.get("ping")
+            await pool.close()
+            return echoed, pong
+
+        echoed, pong = self._run(scenario())
+        self.assertEqual({"name": "temperature"}, echoed)
+        self.assertEqual("pong", pong)
+
+    def testNotFound(self):
+        async def scenario():
+            pool = AsyncHttpSessionPool()
+            try:
+                await pool.target(self.url).get("missing")
+            finally:
+                await pool.close()
+
+        with self.assertRaises(NotFoundException):
+            self._run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import unittest
+import zlib
+
+from data_client.transport import compression
+from data_client.transport.async_http_session_pool import AsyncHttpSessionPool
+from data_client.transport.compression import Compression
+from data_client.transport.compression import StreamDecoder
+from data_client.transport.http_session_pool import HttpSessionPool
+from test.fake_core_data import FakeCoreDataServer
+
+
+def _decodeInPieces(decoder, data, size=7):
+    return b"".join(decoder.feed(data[i:i + size]) for i in range(0, len(data), size)) + \
+        decoder.finish()
+
+
+class CompressionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoreDataServer(gzipAbove=0).start()
+        self.server.populate(200, readingsPerEvent=3)
+        self.compression = Compression(requestThreshold=256)
+        self.pool = HttpSessionPool(compression=self.compression)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def testResponsesAreDecompressed(self):
+        plain = HttpSessionPool()
+        try:
+            expected = plain.target(self.server.url("reading")).get()
+        finally:
+            plain.close()
+        self.assertEqual(expected, self.pool.target(self.server.url("reading")).get())
+        stats = self.compression.stats
+        self.assertLess(stats.responseWireBytes * 3, stats.responseRawBytes)
+        self.assertEqual(stats.responseRawBytes - stats.responseWireBytes, stats.bytesSaved())
+
+    def testDecodedResponseHeaders(self):
+        response = self.pool.request("GET", self.server.url("event"))
+        self.assertIsNone(response.getHeader("content-encoding"))
+        self.assertEqual(str(len(response.body)), response.getHeader("content-length"))
+
+    def testLargeRequestBodiesAreCompressed(self):
+        event = {"device": "d1", "readings": [{"device": "d1", "name": "temperature",
+                                               "value": str(i)} for i in range(50)]}
+        id = self.pool.target(self.server.url("event")).post(event)
+        self.assertEqual(50, len(self.server.events[id]["readings"]))
+        stats = self.compression.stats
+        self.assertLess(stats.requestWireBytes, stats.requestRawBytes)
+
+    def testSmallRequestBodiesAreSentAsIs(self):
+        self.pool.target(self.server.url("valuedescriptor")).post({"name": "humidity"})
+        self.assertEqual(0, self.compression.stats.requestRawBytes)
+
+    def testAsyncResponsesAreDecompressed(self):
+        async def fetch():
+            pool = AsyncHttpSessionPool(compression=self.compression)
+            try:
+                return await pool.target(self.server.url("reading")).get()
+            finally:
+                await pool.close()
+
+        self.assertEqual(600, len(asyncio.run(fetch())))
+        self.assertGreater(self.compression.stats.bytesSaved(), 0)
+
+    def testDeflateWithAndWithoutZlibWrapper(self):
+        data = b"temperature " * 1000
+        wrapped = zlib.compress(data)
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw = raw.compress(data) + raw.flush()
+        self.assertEqual(data, _decodeInPieces(StreamDecoder("deflate"), wrapped))
+        self.assertEqual(data, _decodeInPieces(StreamDecoder("deflate"), raw))
+
+    def testUnknownEncodingIsLeftAlone(self):
+        self.assertIsNone(self.compression.decoder("br"))
+        self.assertIsNone(self.compression.decoder(None))
+
+    @unittest.skipIf(compression.zstandard is None, "zstandard is not installed")
+    def testZstd(self):
+        data = b"temperature " * 1000
+        self.assertIn("zstd", Compression().acceptEncoding)
+        compressed = compression.zstandard.ZstdCompressor().compress(data)
+        self.assertEqual(data, _decodeInPieces(StreamDecoder("zstd"), compressed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import threading
+import time
+import unittest
+
+from data_client.transport.hedging import Hedger
+from data_client.transport.hedging import LatencyTracker
+from data_client.transport.resilience import RetryBudget
+
+
+def _warm(hedger, key, seconds=0.001):
+    for _ in range(20):
+        hedger.trackerFor(key).record(seconds)
+
+
+class HedgingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hedger = Hedger(percentile=0.9, minDelay=0.01)
+
+    def tearDown(self):
+        self.hedger.close()
+
+    def testPercentileNeedsSamples(self):
+        tracker = LatencyTracker(minSamples=10, refreshEvery=1)
+        for i in range(9):
+            tracker.record(i)
+        self.assertIsNone(tracker.percentile(0.5))
+        tracker.record(9)
+        self.assertEqual(5, tracker.percentile(0.5))
+        self.assertEqual(9, tracker.percentile(0.99))
+
+    def testNoHedgeBeforeWarmUp(self):
+        calls = []
+        result = self.hedger.call("reading", [lambda: calls.append(1) or "first",
+                                              lambda: calls.append(2) or "second"])
+        self.assertEqual("first", result)
+        self.assertEqual([1], calls)
+        self.assertEqual(1, len(self.hedger.trackerFor("reading")._samples))
+
+    def testSlowPrimaryIsHedged(self):
+        _warm(self.hedger, "reading")
+        started = time.perf_counter()
+        result = self.hedger.call("reading", [lambda: time.sleep(0.5) or "slow",
+                                              lambda: "fast"])
+        self.assertEqual("fast", result)
+        self.assertLess(time.perf_counter() - started, 0.4)
+        self.assertEqual(1, self.hedger.hedged)
+
+    def testFastPrimaryIsNotHedged(self):
+        _warm(self.hedger, "reading", 0.05)
+        calls = []
+        self.hedger.call("reading", [lambda: "first", lambda: calls.append(2)])
+        self.assertEqual([], calls)
+        self.assertEqual(0, self.hedger.hedged)
+
+    def testBudgetCapsHedges(self):
+        self.hedger.budget = RetryBudget(ratio=0.0, minPerSecond=0.0, capacity=1.0)
+        self.hedger.budget.deposit()
+        _warm(self.hedger, "reading")
+        for _ in range(2):
+            self.hedger.call("reading", [lambda: time.sleep(0.05) or "slow", lambda: "fast"])
+        self.assertEqual(0, self.hedger.hedged)
+
+    def testFailedHedgeFallsBackToPrimary(self):
+        _warm(self.hedger, "reading")
+
+        def hedge():
+            raise ConnectionError("second instance down")
+
+        result = self.hedger.call("reading", [lambda: time.sleep(0.1) or "slow", hedge])
+        self.assertEqual("slow", result)
+
+    def testEveryAttemptFailing(self):
+        _warm(self.hedger, "reading")
+
+        def primary():
+            time.sleep(0.05)
+            raise KeyError("primary")
+
+        def hedge():
+            raise KeyError("hedge")
+
+        with self.assertRaises(KeyError):
+            self.hedger.call("reading", [primary, hedge])
+
+    def testBusyWorkersShedTheHedge(self):
+        self.hedger.close()
+        self.hedger = Hedger(percentile=0.9, minDelay=0.01, maxWorkers=1)
+        _warm(self.hedger, "reading")
+        busy = threading.Thread(target=self.hedger.call, args=(
+            "reading", [lambda: time.sleep(0.2), lambda: None]))
+        busy.start()
+        time.sleep(0.05)
+        ranOn = []
+        result = self.hedger.call("reading", [
+            lambda: ranOn.append(threading.current_thread()) or time.sleep(0.05) or "slow",
+            lambda: "fast"])
+        busy.join()
+        self.assertEqual("slow", result)
+        self.assertEqual([threading.current_thread()], ranOn)
+        self.assertEqual(0, self.hedger.hedged)
+
+    def testAsyncSlowPrimaryIsHedged(self):
+        _warm(self.hedger, "event")
+
+        async def slow():
+            await asyncio.sleep(0.5)
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        self.assertEqual("fast", asyncio.run(self.hedger.callAsync("event", [slow, fast])))
+        self.assertEqual(1, self.hedger.hedged)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import http.client
+import json
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from data_client.transport.http_session_pool import HttpSessionPool
+from data_client.transport.http_session_pool import NotFoundException
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        if self.path.endswith("/drop"):
+            self._drop()
+        elif self.path.endswith("/missing"):
+            self._reply(404, b"", "text/plain")
+        elif self.path.endswith("/ping"):
+            self._reply(200, b"pong", "text/plain")
+        else:
+            self._reply(200, json.dumps({"path": self.path}).encode(), "application/json")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path.endswith("/drop"):
+            self._drop()
+        else:
+            self._reply(200, body, "application/json")
+
+    def _drop(self):
+        # hang up without answering, as a server dropping a keep-alive connection does
+        self.server.drops = getattr(self.server, "drops", 0) + 1
+        self.close_connection = True
+
+    def _reply(self, status, body, contentType):
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpSessionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.connections = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        self.url = "http://127.0.0.1:%d/api/v1/event" % self.server.server_address[1]
+        self.pool = HttpSessionPool(maxPoolSize=4, maxConnectionsPerHost=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testConnectionIsReused(self):
+        target = self.pool.target(self.url)
+        for _ in range(5):
+            target.get("abc")
+        self.assertEqual(1, self.server.connections, "Keep-alive connection was not reused")
+        self.assertEqual(1, self.pool.idleConnectionCount())
+
+    def testSegmentsAreQuoted(self):
+        entity = self.pool.target(self.url).get("device", "a/b c", 10)
+        self.assertEqual("/api/v1/event/device/a%2Fb%20c/10", entity["path"])
+
+    def testPostSendsJson(self):
+        entity = self.pool.target(self.url).post({"device": "d1"})
+        self.assertEqual({"device": "d1"}, entity)
+
+    def testTextEntity(self):
+        self.assertEqual("pong", self.pool.target(self.url).get("ping"))
+
+    def testNotFound(self):
+        with self.assertRaises(NotFoundException):
+            self.pool.target(self.url).get("missing")
+
+    def testIdleConnectionsAreEvicted(self):
+        self.pool.idleTimeout = 0
+        self.pool.target(self.url).get("abc")
+        self.pool.evictIdleConnections()
+        self.assertEqual(0, self.pool.idleConnectionCount())
+
+    def testConcurrentRequestsRespectHostCap(self):
+        target = self.pool.target(self.url)
+        threads = [threading.Thread(target=target.get, args=("abc",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(self.server.connections, 2, "Per-host connection cap exceeded")
+
+    def _trackConnections(self):
+        opened = []
+        connect = self.pool._connect
+
+        def tracking(key):
+            conn = connect(key)
+            opened.append(conn)
+            return conn
+        self.pool._connect = tracking
+        return opened
+
+    def testFailedRetryClosesTheFreshConnection(self):
+        target = self.pool.target(self.url)
+        target.get("abc")
+        opened = self._trackConnections()
+        with self.assertRaises(http.client.RemoteDisconnected):
+            target.get("drop")
+        self.assertEqual(2, self.server.drops)
+        self.assertEqual(1, len(opened))
+        self.assertIsNone(opened[0].sock, "retry connection was left open")
+
+    def testPostIsNotResentOnADroppedConnection(self):
+        target = self.pool.target(self.url)
+        target.get("abc")
+        with self.assertRaises(http.client.RemoteDisconnected):
+            target.post({"device": "d1"}, "drop")
+        self.assertEqual(1, self.server.drops)
+
+    def testConnectionClosedByServerIsNotReused(self):
+        target = self.pool.target(self.url)
+        target.get("abc")
+        self.pool._hosts[next(iter(self.pool._hosts))].idle[0][0].sock.shutdown(socket.SHUT_RD)
+        self.assertEqual({"device": "d1"}, target.post({"device": "d1"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
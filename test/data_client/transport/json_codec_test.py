@@ -0,0 +1,88 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import unittest
+
+from data_client.domain.core import Event
+from data_client.domain.core import Reading
+from data_client.domain.core import eventOrReadingFromPairs
+from data_client.transport import json_codec
+
+BACKENDS = ["stdlib"] + (["orjson"] if json_codec.orjson is not None else [])
+
+
+class JsonCodecTest(unittest.TestCase):
+
+    def _event(self):
+        event = Event(id="e1", device="thermostat", origin=7)
+        event.addReading(Reading(id="r1", name="temperature", value="72"))
+        return event
+
+    def testDomainObjectsRoundTrip(self):
+        for name in BACKENDS:
+            codec = json_codec.create(name)
+            body = codec.encode(self._event())
+            self.assertIsInstance(body, bytes)
+            self.assertEqual(self._event(), codec.decode(body, eventOrReadingFromPairs), name)
+
+    def testBackendsAgreeOnPlainEntities(self):
+        entity = {"name": "temperature", "labels": ["a", "b"], "min": 1.5, "nested": {"x": None}}
+        for name in BACKENDS:
+            codec = json_codec.create(name)
+            self.assertEqual(entity, json.loads(codec.encode(entity)), name)
+            self.assertEqual(entity, codec.decode(memoryview(codec.encode(entity)).tobytes()))
+
+    def testHookSeesInnerObjectsFirst(self):
+        for name in BACKENDS:
+            seen = []
+            json_codec.create(name).decode(b'{"a": {"b": 1}, "c": [{"d": 2}]}',
+                                           lambda pairs: seen.append([k for k, _ in pairs]))
+            self.assertEqual([["b"], ["d"], ["a", "c"]], seen, name)
+
+    def testTimingsAreReported(self):
+        calls = []
+        codec = json_codec.create("stdlib", listener=lambda *args: calls.append(args))
+        body = codec.encode({"id": "x"})
+        codec.decode(body)
+        self.assertEqual(["encode", "decode"], [call[0] for call in calls])
+        self.assertEqual(len(body), calls[1][2])
+        self.assertEqual(1, codec.stats.encodeCount)
+        self.assertEqual(len(body), codec.stats.decodeBytes)
+
+    def testAutoPrefersFasterBackend(self):
+        codec = json_codec.create()
+        if json_codec.orjson is None:
+            self.assertEqual("stdlib", codec.name)
+            return
+        self.assertEqual("orjson", codec.backendFor(None).name)
+        self.assertEqual("stdlib", codec.backendFor(eventOrReadingFromPairs).name)
+        self.assertEqual(self._event(), codec.decode(codec.encode(self._event()),
+                                                     eventOrReadingFromPairs))
+
+    def testCodecIsAbstract(self):
+        with self.assertRaises(TypeError):
+            json_codec.JsonCodec()
+
+    def testUnknownCodec(self):
+        with self.assertRaises(ValueError):
+            json_codec.create("simplejson")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import time
+import unittest
+
+from data_client.transport import resilience
+from data_client.transport.async_http_session_pool import AsyncHttpSessionPool
+from data_client.transport.http_session_pool import HttpError
+from data_client.transport.http_session_pool import HttpResponse
+from data_client.transport.http_session_pool import HttpSessionPool
+from data_client.transport.resilience import CircuitBreaker
+from data_client.transport.resilience import CircuitOpenException
+from data_client.transport.resilience import DeadlineExceededException
+from data_client.transport.resilience import HealthMonitor
+from data_client.transport.resilience import Resilience
+from data_client.transport.resilience import RetryBudget
+from data_client.transport.resilience import RetryPolicy
+from test.fake_core_data import FakeCoreDataServer
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _PingClient(object):
+
+    def __init__(self, url):
+        self.url = url
+        self.healthy = True
+
+    def ping(self):
+        if not self.healthy:
+            raise HttpError(503, "Service Unavailable")
+        return "pong"
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def testOpensAfterThresholdAndProbesAfterReset(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(failureThreshold=2, resetTimeout=10.0, clock=clock)
+        breaker.recordFailure()
+        self.assertTrue(breaker.allow())
+        breaker.recordFailure()
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state())
+        self.assertFalse(breaker.allow())
+        clock.now = 10.0
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow(), "Only one probe may be in flight")
+        breaker.recordFailure()
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state())
+        clock.now = 20.0
+        self.assertTrue(breaker.allow())
+        breaker.recordSuccess()
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state())
+
+    def testRetryBudgetRefillsOverTime(self):
+        clock = _Clock()
+        budget = RetryBudget(ratio=0.5, minPerSecond=1.0, capacity=2.0, clock=clock)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+        clock.now = 5.0
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw(), "Balance is capped at capacity")
+
+    def testBackoffHonoursRetryAfter(self):
+        policy = RetryPolicy(baseDelay=0.1, maxDelay=5.0)
+        self.assertLessEqual(policy.delay(3), 0.4)
+        response = HttpResponse(503, "Service Unavailable", {"retry-after": "2"}, b"")
+        self.assertEqual(2.0, policy.delay(1, response))
+
+
+class ResilienceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoreDataServer(errorRate=1.0).start()
+        self.resilience = Resilience(RetryPolicy(maxAttempts=3, baseDelay=0.001),
+                                     failureThreshold=4, resetTimeout=60.0)
+        self.pool = HttpSessionPool(resilience=self.resilience)
+        self.target = self.pool.target(self.server.url("reading"))
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def testIdempotentRequestsAreRetried(self):
+        with self.assertRaises(HttpError):
+            self.target.get()
+        self.assertEqual(3, self.server.requests)
+        self.server.errorRate = 0.0
+        self.assertEqual([], self.target.get())
+
+    def testPostIsNotRetried(self):
+        with self.assertRaises(HttpError):
+            self.target.post({"name": "temperature"})
+        self.assertEqual(1, self.server.requests)
+
+    def testOpenBreakerFailsFast(self):
+        for _ in range(2):
+            with self.assertRaises(HttpError):
+                self.target.get()
+        self.assertEqual(4, self.server.requests)
+        with self.assertRaises(CircuitOpenException) as raised:
+            self.target.get()
+        self.assertEqual(503, raised.exception.status)
+        self.assertEqual(4, self.server.requests)
+
+    def testCancelledProbeReleasesTheBreaker(self):
+        clock = _Clock()
+        self.resilience = Resilience(RetryPolicy(maxAttempts=1), failureThreshold=1,
+                                     resetTimeout=10.0, clock=clock)
+        url = self.server.url("reading")
+        breaker = self.resilience.breakerFor(url)
+        breaker.recordFailure()
+        clock.now = 10.0
+
+        async def hang(timeout):
+            await asyncio.sleep(10)
+
+        async def cancelProbe():
+            probe = asyncio.ensure_future(self.resilience.callAsync("GET", url, hang))
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+        asyncio.run(cancelProbe())
+        self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state())
+        response = HttpResponse(200, "OK", {}, b"")
+        self.assertIs(response, self.resilience.call("GET", url, lambda timeout: response))
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state())
+
+    def testNonRetryableErrorInProbeReopensTheBreaker(self):
+        clock = _Clock()
+        self.resilience = Resilience(failureThreshold=1, resetTimeout=10.0, clock=clock)
+        url = self.server.url("reading")
+        self.resilience.breakerFor(url).recordFailure()
+        clock.now = 10.0
+
+        def broken(timeout):
+            raise ValueError("undecodable")
+        with self.assertRaises(ValueError):
+            self.resilience.call("GET", url, broken)
+        self.assertEqual(CircuitBreaker.OPEN, self.resilience.breakerFor(url).state())
+
+    def testRetryBudgetLimitsRetries(self):
+        self.resilience.retryBudget = RetryBudget(ratio=0.0, minPerSecond=0.0)
+        with self.assertRaises(HttpError):
+            self.target.get()
+        self.assertEqual(1, self.server.requests)
+
+    def testDeadlineBoundsAttempts(self):
+        self.server.errorRate = 0.0
+        self.server.latency = 0.5
+        started = time.monotonic()
+        with resilience.deadline(0.1):
+            with self.assertRaises(OSError):
+                self.target.get()
+            time.sleep(0.1)
+            with self.assertRaises(DeadlineExceededException):
+                self.target.get()
+        self.assertLess(time.monotonic() - started, 0.45)
+        self.assertIsNone(resilience.remaining())
+
+    def testNestedDeadlinesOnlyShrink(self):
+        with resilience.deadline(0.1):
+            with resilience.deadline(10.0):
+                self.assertLessEqual(resilience.remaining(), 0.1)
+
+    def testAsyncPoolRetries(self):
+        async def fetch():
+            pool = AsyncHttpSessionPool(resilience=self.resilience)
+            try:
+                return await pool.target(self.server.url("reading")).get()
+            finally:
+                await pool.close()
+
+        with self.assertRaises(HttpError):
+            asyncio.run(fetch())
+        self.assertEqual(3, self.server.requests)
+
+    def testHealthMonitorDrivesBreaker(self):
+        ping = _PingClient(self.server.url("ping"))
+        monitor = HealthMonitor(ping, self.resilience)
+        breaker = self.resilience.breakerFor(self.target.url)
+        ping.healthy = False
+        self.assertFalse(monitor.check())
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state())
+        with self.assertRaises(CircuitOpenException):
+            self.target.get()
+        ping.healthy = True
+        self.assertTrue(monitor.check())
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state())
+
+    def testHealthMonitorDrivesEachTargetsBreaker(self):
+        up = self.pool.target(self.server.url("ping"))
+        down = self.pool.target("http://127.0.0.1:1/api/v1/ping")
+        monitor = HealthMonitor(_PingClient(self.server.url("ping")), self.resilience,
+                                targets=lambda: [up, down])
+        self.server.errorRate = 0.0
+        self.resilience.breakerFor(up.url).trip()
+        self.assertFalse(monitor.check())
+        self.assertEqual(CircuitBreaker.CLOSED, self.resilience.breakerFor(up.url).state())
+        self.assertEqual(CircuitBreaker.OPEN, self.resilience.breakerFor(down.url).state())
+
+
+if __name__ == "__main__":
+    unittest.main()
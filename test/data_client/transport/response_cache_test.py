@@ -0,0 +1,172 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from data_client.domain.common import ValueDescriptor
+from data_client.transport.http_session_pool import HttpSessionPool
+from data_client.transport.response_cache import CachePolicy
+from data_client.transport.response_cache import ResponseCache
+from data_client.transport.response_cache import parsePolicies
+
+
+class _ETagHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests += 1
+        body = json.dumps(self.server.descriptors).encode()
+        etag = '"v%d"' % self.server.version
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if not self.path.endswith("/nocache"):
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.server.requests += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"id")
+
+    def log_message(self, *args):
+        pass
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ETagHandler)
+        self.server.requests = 0
+        self.server.version = 1
+        self.server.descriptors = [{"id": "vd1", "name": "temperature"}]
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.url = "http://127.0.0.1:%d/api/v1/valuedescriptor" % self.server.server_address[1]
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def _target(self, cache):
+        return HttpSessionPool(responseCache=cache).target(self.url,
+                                                          objectPairsHook=ValueDescriptor.fromPairs)
+
+    def testNotModifiedIsServedFromTheCache(self):
+        target = self._target(ResponseCache())
+        first = target.get()
+        second = target.get()
+        self.assertEqual(["temperature"], [descriptor.name for descriptor in second])
+        self.assertIsNot(first, second, "Each hit must get objects of its own")
+        self.assertEqual(2, self.server.requests)
+        self.assertEqual(1, target.pool.responseCache.revalidations)
+
+    def testChangedResourceIsRefetched(self):
+        target = self._target(ResponseCache())
+        target.get()
+        self.server.version = 2
+        self.server.descriptors = []
+        self.assertEqual([], target.get())
+
+    def testMaxAgePolicySkipsTheRequest(self):
+        cache = ResponseCache(policies=[("/valuedescriptor$", CachePolicy(maxAge=60))])
+        target = self._target(cache)
+        for _ in range(5):
+            target.get()
+        self.assertEqual(1, self.server.requests)
+        self.assertEqual(4, cache.hits)
+
+    def testUncacheablePolicyAndMissingValidators(self):
+        cache = ResponseCache(policies=[("/skip$", CachePolicy(cacheable=False))])
+        target = self._target(cache)
+        target.get("skip")
+        target.get("nocache")
+        self.assertEqual(0, cache.sizeInBytes())
+
+    def testConfiguredMaxAgeCachesResponsesWithoutValidators(self):
+        cache = ResponseCache(policies=parsePolicies("/nocache$=60; /skip$=off"))
+        target = self._target(cache)
+        for _ in range(3):
+            self.assertEqual("temperature", target.get("nocache")[0].name)
+        self.assertEqual(1, self.server.requests)
+        self.assertEqual(2, cache.hits)
+        target.get("skip")
+        target.get("skip")
+        self.assertEqual(3, self.server.requests)
+
+    def testParsePolicies(self):
+        policies = parsePolicies({"/valuedescriptor": 300, "/event/count": "off"})
+        self.assertEqual(300, policies[0][1].maxAge)
+        self.assertFalse(policies[1][1].cacheable)
+        self.assertEqual([], parsePolicies(""))
+        with self.assertRaises(ValueError):
+            parsePolicies("=5")
+
+    def testMemoryBoundAndDiskTier(self):
+        cache = ResponseCache(maxBytes=10, directory=self.directory)
+        target = self._target(cache)
+        target.get()
+        self.assertEqual(0, cache.sizeInBytes())
+        self.assertEqual("temperature", target.get()[0].name)
+        self.assertEqual(1, cache.revalidations)
+
+    def testWriteInvalidatesCachedReads(self):
+        cache = ResponseCache(policies=[("/valuedescriptor", CachePolicy(maxAge=60))],
+                              directory=self.directory)
+        target = self._target(cache)
+        target.get()
+        target.get("name", "temperature")
+        self.assertEqual(2, self.server.requests)
+        target.post({"name": "humidity"})
+        self.assertEqual(0, cache.sizeInBytes())
+        self.assertEqual(0, cache.diskSizeInBytes())
+        target.get()
+        self.assertEqual(4, self.server.requests)
+
+    def testDiskTierIsBounded(self):
+        cache = ResponseCache(maxBytes=10, directory=self.directory, maxDiskBytes=400)
+        target = self._target(cache)
+        for name in ("a", "b", "c", "d"):
+            target.get(name)
+        self.assertLessEqual(cache.diskSizeInBytes(), 400)
+        self.assertLess(len(os.listdir(self.directory)), 4)
+        reopened = ResponseCache(maxBytes=10, directory=self.directory, maxDiskBytes=400)
+        self.assertEqual(cache.diskSizeInBytes(), reopened.diskSizeInBytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
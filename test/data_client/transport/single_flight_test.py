@@ -0,0 +1,243 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from data_client.transport import resilience
+from data_client.transport.async_http_session_pool import AsyncHttpSessionPool
+from data_client.transport.http_session_pool import HttpSessionPool
+from data_client.transport.json_codec import isReusableHook
+from data_client.transport.single_flight import AsyncSingleFlight
+from data_client.transport.single_flight import SingleFlight
+from test.fake_core_data import FakeCoreDataServer
+
+CALLERS = 8
+
+
+class _Builder(object):
+
+    def hook(self, pairs):
+        return dict(pairs)
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeCoreDataServer(latency=0.2).start()
+        self.server.populate(20, readingsPerEvent=2)
+        self.pool = HttpSessionPool(singleFlight=True)
+        self.server.requests = 0
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def _burst(self, call):
+        barrier = threading.Barrier(CALLERS)
+
+        def caller(_):
+            barrier.wait()
+            return call()
+        with ThreadPoolExecutor(CALLERS) as executor:
+            return list(executor.map(caller, range(CALLERS)))
+
+    def testConcurrentCallersShareOneCall(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def load():
+            release.wait(5)
+            return ["shared"]
+
+        def caller(_):
+            return flight.do("key", load)
+        with ThreadPoolExecutor(CALLERS) as executor:
+            futures = [executor.submit(caller, i) for i in range(CALLERS)]
+            while flight.calls + flight.shared < CALLERS:
+                threading.Event().wait(0.01)
+            release.set()
+            results = [f.result() for f in futures]
+        self.assertEqual(1, flight.calls)
+        self.assertEqual(CALLERS - 1, flight.shared)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(["again"], flight.do("key", lambda: ["again"]))
+
+    def testErrorsReachEveryWaiter(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise ValueError("down")
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(flight.do, "key", fail)
+            started.wait(5)
+            waiter = executor.submit(flight.do, "key", lambda: "unused")
+            while flight.shared < 1:
+                threading.Event().wait(0.01)
+            release.set()
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, waiter.result)
+        self.assertEqual(1, flight.do("key", lambda: 1))
+
+    def testWaiterStopsAtItsOwnDeadline(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "late"
+        with ThreadPoolExecutor(1) as executor:
+            leader = executor.submit(flight.do, "key", slow)
+            started.wait(5)
+            startedAt = time.monotonic()
+            with resilience.deadline(0.2):
+                self.assertRaises(resilience.DeadlineExceededException,
+                                  flight.do, "key", lambda: "unused")
+            self.assertLess(time.monotonic() - startedAt, 0.5)
+            release.set()
+            self.assertEqual("late", leader.result())
+
+    def testWaiterRetriesWhenOnlyTheLeaderRanOutOfTime(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def expire():
+            started.set()
+            release.wait(5)
+            raise resilience.DeadlineExceededException("leader ran out of time")
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(flight.do, "key", expire)
+            started.wait(5)
+            waiter = executor.submit(flight.do, "key", lambda: "own")
+            while flight.shared < 1:
+                threading.Event().wait(0.01)
+            release.set()
+            self.assertRaises(resilience.DeadlineExceededException, leader.result)
+            self.assertEqual("own", waiter.result())
+        self.assertEqual(2, flight.calls)
+
+    def testAsyncWaiterStopsAtItsOwnDeadline(self):
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.6)
+            return "late"
+
+        async def waiter():
+            with resilience.deadline(0.2):
+                return await flight.do("key", lambda: None)
+
+        async def burst():
+            leader = asyncio.ensure_future(flight.do("key", slow))
+            await asyncio.sleep(0)
+            startedAt = time.monotonic()
+            with self.assertRaises(resilience.DeadlineExceededException):
+                await waiter()
+            self.assertLess(time.monotonic() - startedAt, 0.5)
+            return await leader
+        self.assertEqual("late", asyncio.run(burst()))
+
+    def testAsyncWaiterRetriesWhenOnlyTheLeaderRanOutOfTime(self):
+        flight = AsyncSingleFlight()
+
+        async def expire():
+            await asyncio.sleep(0.05)
+            raise resilience.DeadlineExceededException("leader ran out of time")
+
+        async def own():
+            return "own"
+
+        async def burst():
+            leader = asyncio.ensure_future(flight.do("key", expire))
+            await asyncio.sleep(0)
+            waiter = await flight.do("key", own)
+            with self.assertRaises(resilience.DeadlineExceededException):
+                await leader
+            return waiter
+        self.assertEqual("own", asyncio.run(burst()))
+        self.assertEqual(2, flight.calls)
+
+    def testIdenticalGetsShareOneRequest(self):
+        target = self.pool.target(self.server.url("reading"))
+        results = self._burst(lambda: target.get("type", "F", 10))
+        self.assertEqual(1, self.server.requests)
+        self.assertEqual(10, len(results[0]))
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def testDifferentArgumentsAreNotShared(self):
+        target = self.pool.target(self.server.url("reading"))
+        limits = iter(range(1, CALLERS + 1))
+        lock = threading.Lock()
+
+        def call():
+            with lock:
+                limit = next(limits)
+            return target.get("type", "F", limit)
+        results = self._burst(call)
+        self.assertEqual(CALLERS, self.server.requests)
+        self.assertEqual(list(range(1, CALLERS + 1)), sorted(len(r) for r in results))
+
+    def testWritesAndInstanceHooksAreNotShared(self):
+        self.assertFalse(isReusableHook(_Builder().hook))
+        self.assertTrue(isReusableHook(None))
+        self.assertTrue(isReusableHook(dict.fromkeys))
+        target = self.pool.target(self.server.url("reading"), objectPairsHook=_Builder().hook)
+        self._burst(lambda: target.get("type", "F", 10))
+        self.assertEqual(CALLERS, self.server.requests)
+
+    def testAsyncIdenticalGetsShareOneRequest(self):
+        async def burst():
+            pool = AsyncHttpSessionPool(singleFlight=True)
+            try:
+                target = pool.target(self.server.url("reading"))
+                return await asyncio.gather(
+                    *[target.get("type", "F", 10) for _ in range(CALLERS)])
+            finally:
+                await pool.close()
+        results = asyncio.run(burst())
+        self.assertEqual(1, self.server.requests)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def testAsyncCancelledWaiterLeavesCallRunning(self):
+        async def burst():
+            pool = AsyncHttpSessionPool(singleFlight=True)
+            try:
+                target = pool.target(self.server.url("reading"))
+                first = asyncio.ensure_future(target.get("type", "F", 10))
+                second = asyncio.ensure_future(target.get("type", "F", 10))
+                await asyncio.sleep(0.05)
+                first.cancel()
+                return await second
+            finally:
+                await pool.close()
+        self.assertEqual(10, len(asyncio.run(burst())))
+        self.assertEqual(1, self.server.requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
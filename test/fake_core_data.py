@@ -0,0 +1,353 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+
+"""In-process fake of the core data REST API for tests and benchmarks.
+
+Serves /api/v1/event, /api/v1/reading, /api/v1/valuedescriptor and
+/api/v1/ping from memory, with configurable response latency and error
+injection, so the clients can be exercised without core data and MongoDB.
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import unquote
+
+_PREFIX = "/api/v1/"
+
+
+class _NotFound(Exception):
+    pass
+
+
+class FakeCoreDataServer(object):
+    """Threaded HTTP server holding events, readings and value descriptors.
+
+    latency seconds (plus up to jitter seconds more) are slept before every
+    response; a request fails with errorStatus with probability errorRate.
+    All four may be changed while the server runs. JSON responses of at least
+    gzipAbove bytes are gzip-encoded for clients that accept it, and gzip
+    request bodies are accepted.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, errorRate=0.0, errorStatus=503, seed=None,
+                 gzipAbove=None):
+        self.gzipAbove = gzipAbove
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.errorStatus = errorStatus
+        self.requests = 0
+        self.events = {}
+        self.readings = {}
+        self.valueDescriptors = {}
+        self._random = random.Random(seed)
+        self._nextId = 0
+        self._lastStamp = 0
+        self._lock = threading.RLock()
+        self._server = None
+
+    def start(self, host="127.0.0.1", port=0):
+        fake = self
+
+        class Handler(_Handler):
+            server_fake = fake
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def url(self, service):
+        """Base URL of a service, e.g. url("event") for core.db.event.url."""
+        host, port = self._server.server_address[:2]
+        return "http://%s:%d%s%s" % (host, port, _PREFIX, service)
+
+    def populate(self, events, readingsPerEvent=3, devices=10, names=("temperature",)):
+        """Adds value descriptors for names and events spread over devices."""
+        for name in names:
+            if not self._byName(name):
+                self.addValueDescriptor({"name": name, "type": "F", "uomLabel": "C",
+                                         "min": "-100", "max": "100", "labels": [name]})
+        for i in range(events):
+            device = "device-%d" % (i % devices)
+            self.addEvent({"device": device, "origin": i, "readings": [
+                {"device": device, "name": names[(i + j) % len(names)], "value": str(i % 100)}
+                for j in range(readingsPerEvent)]})
+
+    def addEvent(self, event):
+        with self._lock:
+            event = self._stamp(dict(event, pushed=event.get("pushed", 0)))
+            event["readings"] = [self._stamp(dict(reading, pushed=reading.get("pushed", 0)),
+                                             event["created"])
+                                 for reading in event.get("readings") or []]
+            self.events[event["id"]] = event
+            for reading in event["readings"]:
+                self.readings[reading["id"]] = reading
+            return event["id"]
+
+    def addReading(self, reading):
+        with self._lock:
+            reading = self._stamp(dict(reading, pushed=reading.get("pushed", 0)))
+            self.readings[reading["id"]] = reading
+            return reading["id"]
+
+    def addValueDescriptor(self, valueDescriptor):
+        with self._lock:
+            valueDescriptor = self._stamp(dict(valueDescriptor))
+            self.valueDescriptors[valueDescriptor["id"]] = valueDescriptor
+            return valueDescriptor["id"]
+
+    def _stamp(self, record, created=None):
+        # ids look like MongoDB ObjectIds; timestamps are strictly increasing milliseconds
+        self._nextId += 1
+        if created is None:
+            created = self._lastStamp = max(int(time.time() * 1000), self._lastStamp + 1)
+        record["id"] = "%024x" % self._nextId
+        record.setdefault("created", created)
+        record["modified"] = created
+        record.setdefault("origin", created)
+        return record
+
+    def _byName(self, name):
+        return [vd for vd in self.valueDescriptors.values() if vd.get("name") == name]
+
+    def _injectFault(self):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0)
+            failed = self.errorRate and self._random.random() < self.errorRate
+        if delay:
+            time.sleep(delay)
+        return self.errorStatus if failed else None
+
+    # request dispatch; each handler returns the entity to send back as JSON
+
+    def handle(self, method, segments, body):
+        service, rest = segments[0], segments[1:]
+        if service == "ping" and method == "GET":
+            return "pong"
+        route = getattr(self, "_%s%s" % (method.lower(), service.capitalize()), None)
+        if route is None:
+            raise _NotFound(service)
+        with self._lock:
+            return route(rest, body)
+
+    @staticmethod
+    def _limited(records, limit):
+        return sorted(records, key=lambda r: r["created"])[:int(limit)]
+
+    @staticmethod
+    def _get(table, id):
+        if id not in table:
+            raise _NotFound(id)
+        return table[id]
+
+    def _getEvent(self, rest, body):
+        events = list(self.events.values())
+        if not rest:
+            return events
+        if len(rest) == 1:
+            return self._get(self.events, rest[0])
+        if rest[0] == "device" and len(rest) == 3:
+            return self._limited([e for e in events if e["device"] == rest[1]], rest[2])
+        if rest[0] == "device" and len(rest) == 5 and rest[2] == "valuedescriptor":
+            return self._limited([r for r in self.readings.values()
+                                  if r["device"] == rest[1] and r["name"] == rest[3]], rest[4])
+        if len(rest) == 3:
+            start, end = int(rest[0]), int(rest[1])
+            return self._limited([e for e in events if start <= e["created"] <= end], rest[2])
+        raise _NotFound("/".join(rest))
+
+    def _postEvent(self, rest, body):
+        return self.addEvent(body)
+
+    def _putEvent(self, rest, body):
+        if rest[:1] == ["id"]:
+            event = self._get(self.events, rest[1])
+            event["pushed"] = int(time.time() * 1000)
+            for reading in event["readings"]:
+                reading["pushed"] = event["pushed"]
+            return True
+        self._get(self.events, body.get("id")).update(body)
+        return True
+
+    def _deleteEvent(self, rest, body):
+        if rest[0] == "id":
+            doomed = [self._get(self.events, rest[1])]
+        elif rest[0] == "device":
+            doomed = [e for e in self.events.values() if e["device"] == rest[1]]
+        elif rest[0] == "scrub":
+            doomed = [e for e in self.events.values() if e["pushed"]]
+        elif rest[0] == "removeold":
+            cutoff = int(time.time() * 1000) - int(rest[2])
+            doomed = [e for e in self.events.values() if e["created"] < cutoff]
+        else:
+            raise _NotFound("/".join(rest))
+        for event in doomed:
+            del self.events[event["id"]]
+            for reading in event["readings"]:
+                self.readings.pop(reading["id"], None)
+        return True if rest[0] == "id" else len(doomed)
+
+    def _getReading(self, rest, body):
+        readings = list(self.readings.values())
+        if not rest:
+            return readings
+        if len(rest) == 1:
+            return self._get(self.readings, rest[0])
+        kind, value, limit = rest[0], rest[1], rest[-1]
+        if kind == "device":
+            matches = [r for r in readings if r["device"] == value]
+        elif kind == "name" and len(rest) == 5:
+            matches = [r for r in readings if r["name"] == value and r["device"] == rest[3]]
+        elif kind == "name":
+            matches = [r for r in readings if r["name"] == value]
+        elif kind in ("uomlabel", "label", "type"):
+            names = set(vd["name"] for vd in self._descriptorsWith(kind, value))
+            matches = [r for r in readings if r["name"] in names]
+        else:
+            raise _NotFound("/".join(rest))
+        return self._limited(matches, limit)
+
+    def _postReading(self, rest, body):
+        return self.addReading(body)
+
+    def _putReading(self, rest, body):
+        self._get(self.readings, body.get("id")).update(body)
+        return True
+
+    def _deleteReading(self, rest, body):
+        del self.readings[self._get(self.readings, rest[1])["id"]]
+        return True
+
+    def _descriptorsWith(self, kind, value):
+        if kind == "uomlabel":
+            return [vd for vd in self.valueDescriptors.values() if vd.get("uomLabel") == value]
+        if kind == "label":
+            return [vd for vd in self.valueDescriptors.values() if value in (vd.get("labels")
+                                                                            or [])]
+        return [vd for vd in self.valueDescriptors.values() if vd.get("type") == value]
+
+    def _getValuedescriptor(self, rest, body):
+        if not rest:
+            return list(self.valueDescriptors.values())
+        if len(rest) == 1:
+            return self._get(self.valueDescriptors, rest[0])
+        kind, value = rest
+        if kind == "name":
+            matches = self._byName(value)
+            if not matches:
+                raise _NotFound(value)
+            return matches[0]
+        if kind in ("uomlabel", "label"):
+            return self._descriptorsWith(kind, value)
+        if kind in ("devicename", "deviceid"):
+            # there is no metadata service; a device's descriptors are those it has read
+            names = set(r["name"] for r in self.readings.values() if r["device"] == value)
+            return [vd for vd in self.valueDescriptors.values() if vd["name"] in names]
+        raise _NotFound("/".join(rest))
+
+    def _postValuedescriptor(self, rest, body):
+        return self.addValueDescriptor(body)
+
+    def _putValuedescriptor(self, rest, body):
+        self._get(self.valueDescriptors, body.get("id")).update(body)
+        return True
+
+    def _deleteValuedescriptor(self, rest, body):
+        if rest[0] == "name":
+            doomed = self._byName(rest[1])
+            if not doomed:
+                raise _NotFound(rest[1])
+        else:
+            doomed = [self._get(self.valueDescriptors, rest[1])]
+        for vd in doomed:
+            del self.valueDescriptors[vd["id"]]
+        return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; with Nagle on, the body waits on a delayed ACK
+    disable_nagle_algorithm = True
+    server_fake = None
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        if body and self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        body = json.loads(body) if body else None
+        failure = self.server_fake._injectFault()
+        if failure is not None:
+            return self._reply(failure, b"injected failure", "text/plain")
+        path = self.path.split("?")[0]
+        if not path.startswith(_PREFIX):
+            return self._reply(404, b"", "text/plain")
+        segments = [unquote(s) for s in path[len(_PREFIX):].split("/") if s]
+        try:
+            entity = self.server_fake.handle(method, segments, body)
+        except _NotFound as e:
+            return self._reply(404, str(e).encode("utf-8"), "text/plain")
+        except (KeyError, IndexError, ValueError, TypeError, AttributeError) as e:
+            return self._reply(400, str(e).encode("utf-8"), "text/plain")
+        if isinstance(entity, str):
+            # core data answers ping and add with a plain text body
+            return self._reply(200, entity.encode("utf-8"), "text/plain")
+        body = json.dumps(entity).encode("utf-8")
+        gzipAbove = self.server_fake.gzipAbove
+        if gzipAbove is not None and len(body) >= gzipAbove and \
+                "gzip" in self.headers.get("Accept-Encoding", ""):
+            return self._reply(200, gzip.compress(body), "application/json", "gzip")
+        self._reply(200, body, "application/json")
+
+    def _reply(self, status, body, contentType, encoding=None):
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,55 @@
+# *******************************************************************************
+# Copyright 2017 Dell Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+#
+# @microservice: py-core-data-client library
+# @author: Tyler Cox, Dell
+# @version: 1.0.0
+# *******************************************************************************
+"""Stand-ins for the platform modules the client impls import.
+
+The *ClientImpl classes read their settings through domain.config and raise
+exception.controller errors, neither of which ships with this package.
+install() puts stubs for them in sys.modules when the real ones cannot be
+imported; the stub config reader answers every property with its default,
+and tests patch read_property to give settings of their own.
+"""
+
+import importlib.util
+import sys
+import types
+
+
+class DataValidationException(Exception):
+    pass
+
+
+def _readProperty(key, default=None):
+    return default
+
+
+def _stub(name, **attributes):
+    parent, _, child = name.rpartition(".")
+    module = sys.modules[name] = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    if parent:
+        setattr(sys.modules[parent], child, module)
+
+
+def install():
+    if importlib.util.find_spec("domain") is None:
+        _stub("domain")
+        _stub("domain.config")
+        _stub("domain.config.config_reader", read_property=_readProperty)
+    if importlib.util.find_spec("exception") is None:
+        _stub("exception")
+        _stub("exception.controller", DataValidationException=DataValidationException)